@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: compare.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 10:58:26 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import sys
+import json
+import argparse
+
+'''Comparison of the results of two benchmarks, eg. of two commits.'''
+
+KEY = ('points', 'stop_density', 'time_format', 'stage')
+
+
+def compare(old, new, threshold=0.1):
+    """
+    Return the rows (list of dictonary) of the results in both old and new (see benchmarks.run):
+        -> points, stop_density, time_format, stage
+        -> old, new (float)   -- seconds
+        -> ratio (float)      -- new / old seconds, eg. 0.5 is twice as fast
+        -> regression (bool)  -- new is slower than old by more than threshold (eg. 0.1 = 10%)
+    """
+    old_results = {tuple(result[key] for key in KEY): result for result in old['results']}
+    rows = []
+
+    for result in new['results']:
+        previous = old_results.get(tuple(result[key] for key in KEY))
+        if previous is None or not previous['seconds']:
+            continue
+        ratio = result['seconds'] / previous['seconds']
+        row = {key: result[key] for key in KEY}
+        row.update(old=previous['seconds'], new=result['seconds'], ratio=ratio, regression=ratio > 1 + threshold)
+        rows.append(row)
+
+    return rows
+
+
+if __name__ == '__main__':
+
+    argparse = argparse.ArgumentParser(prog='benchmarks.compare', description="Compare two benchmark results, exit with 1 if there is a regression")
+    argparse.add_argument('old', help="json file of the results, eg. of the previous commit")
+    argparse.add_argument('new', help="json file of the results to check")
+    argparse.add_argument('--threshold', metavar='', type=float, default=0.1, help="slowdown allowed before a regression (default 0.1 = 10%%)")
+
+    args = argparse.parse_args()
+
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    rows = compare(old, new, args.threshold)
+    for row in rows:
+        flag = 'REGRESSION' if row['regression'] else ''
+        print (f"{row['points']:>12} {row['time_format']:<8} {row['stage']:<8} {row['old']:>9.3f} s {row['new']:>9.3f} s {row['ratio']:>6.2f}x {flag}")
+
+    if any(row['regression'] for row in rows):
+        sys.exit(1)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: generate.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 10:07:48 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import math
+import random
+import argparse
+from datetime import datetime, timezone
+
+'''Synthetic gpx files shaped like sample.gpx, for the benchmarks.'''
+
+PROLOG = '''<?xml version="1.0" encoding="UTF-8" standalone="no"?>\t
+<gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1" 
+xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:schemaLocation="http://www.topografix.com/GPX/1/1 
+http://www.topografix.com/GPX/1/1/gpx.xsd">
+<trk>\t\t\t\t\t\t\t\t\t
+    <trkseg>\t\t\t\t\t
+'''
+
+EPILOG = '''\t  </trkseg>\t\t\t\t
+</trk>\t\t\t\t\t
+</gpx>\t\t\t\t\t
+'''
+
+SEGMENT = '\t  </trkseg>\t\t\t\t\n    <trkseg>\t\t\t\t\t\n'
+
+POINT = '''    <trkpt lat="{:.9f}" lon="{:.9f}">\t\t\t\t\t
+      <ele>{}</ele>\t\t\t\t\t
+      <time>{}</time>\t\t\t\t\t
+      <sat>{}</sat>\t\t\t\t\t
+      <speed>{}</speed>\t\t\t\t\t
+      <hdop>{}</hdop>\t\t\t\t\t
+    </trkpt>\t\t\t\t\t
+'''
+
+#fraction digits, zone designator and its offset in seconds
+TIME_FORMATS = {
+    'millis': (3, 'Z', 0),       #2013-02-08T00:12:03.000Z as sample.gpx
+    'seconds': (0, 'Z', 0),      #2013-02-08T00:12:03Z
+    'micros': (6, 'Z', 0),       #2013-02-08T00:12:03.000000Z
+    'offset': (3, '+01:00', 3600) #2013-02-08T01:12:03.000+01:00
+}
+
+START = int(datetime(2013, 2, 8, tzinfo=timezone.utc).timestamp())
+METERS_IN_DEGREE = 111320
+BLOCK = 10000 #points written together
+
+
+def generate(file, points, stop_density=0.05, time_format='millis', seed=0, segment_points=100000):
+    """
+    Write a gpx file of a vehicle moving with some stops, return the number of stops.
+
+    file (string)          -- gpx file to write.
+    points (int)           -- number of <trkpt>.
+    stop_density (float)   -- probability that a moving point begins a stop: the vehicle stays
+                              (speed 0, a few meters of noise) for 20 to 120 points, 10 to 60
+                              seconds apart, ie. from about 3 minutes to 2 hours.
+    time_format (string)   -- layout of <time>, see TIME_FORMATS.
+    seed (int)             -- same seed, same file.
+    segment_points (int)   -- points of each <trkseg>.
+    """
+    fraction_digits, zone, offset = TIME_FORMATS[time_format]
+    rng = random.Random(seed)
+
+    latitude, longitude, heading = 51.935367584, 15.550533295, 0.0
+    seconds, fraction = START, 0
+    stop = 0
+    stops = 0
+    block = []
+
+    with open(file, 'w', newline='\n') as f:
+        f.write(PROLOG)
+
+        for index in range(points):
+            if index and index % segment_points == 0:
+                block.append(SEGMENT)
+
+            if not stop and rng.random() < stop_density:
+                stop = rng.randint(20, 120)
+                stops += 1
+
+            if stop:
+                stop -= 1
+                speed = 0
+                seconds += rng.randint(10, 60)
+                latitude += rng.uniform(-1e-5, 1e-5)
+                longitude += rng.uniform(-1e-5, 1e-5)
+            else:
+                speed = rng.randint(6, 90)
+                step = rng.randint(1, 10)
+                seconds += step
+                heading += rng.uniform(-0.3, 0.3)
+                meters = speed / 3.6 * step
+                latitude += meters * math.cos(heading) / METERS_IN_DEGREE
+                longitude += meters * math.sin(heading) / (METERS_IN_DEGREE * math.cos(math.radians(latitude)))
+
+            if fraction_digits:
+                fraction = rng.randrange(10 ** fraction_digits)
+
+            block.append(POINT.format(
+                latitude, longitude, rng.randint(120, 180), _time(seconds, fraction, fraction_digits, zone, offset),
+                rng.randint(3, 9), speed, rng.choice((0, 0, 0, 0.9, 1.2))
+            ))
+
+            if len(block) >= BLOCK:
+                f.write(''.join(block))
+                block = []
+
+        f.write(''.join(block))
+        f.write(EPILOG)
+
+    return stops
+
+
+def _time(seconds, fraction, fraction_digits, zone, offset):
+    local = datetime.fromtimestamp(seconds + offset, timezone.utc)
+    text = f'{local:%Y-%m-%dT%H:%M:%S}'
+    if fraction_digits:
+        text += f'.{fraction:0{fraction_digits}d}'
+    return text + zone
+
+
+if __name__ == '__main__':
+
+    argparse = argparse.ArgumentParser(prog='generate', description="Write a synthetic gpx file shaped like sample.gpx")
+    argparse.add_argument('file', help="gpx file to write")
+    argparse.add_argument('--points', metavar='', type=int, default=10000, help="(integer) number of track points (default 10000)")
+    argparse.add_argument('--stop-density', metavar='', type=float, default=0.05, help="probability that a moving point begins a stop (default 0.05)")
+    argparse.add_argument('--time-format', metavar='', choices=list(TIME_FORMATS), default='millis', help=f"layout of the time: {', '.join(TIME_FORMATS)} (default millis)")
+    argparse.add_argument('--seed', metavar='', type=int, default=0, help="(integer) seed of the random values (default 0)")
+
+    args = argparse.parse_args()
+    stops = generate(args.file, args.points, args.stop_density, args.time_format, args.seed)
+    print (f"{args.file}: {args.points} points, {stops} stops")
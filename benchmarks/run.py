@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: run.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 10:31:15 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os
+import json
+import time
+import platform
+import tempfile
+import argparse
+import subprocess
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.generate import generate, TIME_FORMATS
+from parsers.parser import Parser
+from parsers import stopover
+from parsers.metrics import Metrics, peak_memory
+from outputs.output import Output
+from jobs.convert import convert
+
+'''Benchmarks of the stages of a conversion on synthetic gpx files.'''
+
+#stages measured, each one in a new process to measure its peak memory
+STAGES = {
+    'parse': 'xml to default rows (Parser without filter, rows consumed)',
+    'filter': 'stopover filter on the track read from the cache (Parser with filter), without hashing the file for the cache key',
+    'write': 'output of the default rows of the track read from the cache (Output.save)',
+    'convert': 'whole conversion with the filter (jobs.convert, no cache)'
+}
+
+
+def run_stage(stage, file, options, work_dir):
+    """Worker: run a stage and return (seconds, peak memory in MB or None, rows)."""
+    cache = dict(options, **{'cache-dir': os.path.join(work_dir, 'cache')})
+    filter_options = {key: options[key] for key in ('stopping-time', 'speed-range', 'distance-range') if key in options}
+    parse_options = {key: value for key, value in options.items() if key not in filter_options}
+    outputfile = os.path.join(work_dir, 'output')
+
+    start = time.perf_counter()
+    rows = 0
+
+    if stage == 'cache': #parse the file and save its track, for the filter and write stages
+        Parser(file, {key: value for key, value in cache.items() if key not in filter_options})
+    elif stage == 'parse':
+        rows = _consume(Parser(file, parse_options).get_result()['rows'])
+    elif stage == 'filter':
+        metrics = Metrics()
+        rows = _consume(Parser(file, dict(cache, metrics=metrics, **filter_options)).get_result()['rows'])
+        #the cache stage hashes the whole file for the key and maps the track, it isn't the filter
+        start += metrics.seconds.get('cache', 0.0)
+    elif stage == 'write':
+        result = Parser(file, {key: value for key, value in cache.items() if key not in filter_options}).get_result()
+        start = time.perf_counter() #the track is just mapped, the rows are built while they are written
+        Output(result, outputfile, parse_options).save()
+    else:
+        convert(file, outputfile, options)
+
+    return time.perf_counter() - start, peak_memory(), rows
+
+
+def benchmark(sizes, stop_density, time_format, options, stages, repeat, work_dir, progress=None):
+    """
+    Return the results (list of dictonary) of each stage for each size of the synthetic file:
+        -> points, stop_density, time_format, stage
+        -> seconds (float)            -- best of the repeated runs
+        -> runs (list)                -- seconds of all the runs
+        -> points_per_second (float)  -- points / seconds
+        -> peak_memory_mb (float)     -- peak resident memory of the process, None if unknown
+    """
+    results = []
+    context = multiprocessing.get_context('spawn')
+
+    for points in sizes:
+        file = os.path.join(work_dir, f'synthetic_{points}_{stop_density}_{time_format}.gpx')
+        if not os.path.isfile(file):
+            generate(file, points, stop_density, time_format)
+
+        run_stage_in_process(context, 'cache', file, options, work_dir)
+
+        for stage in stages:
+            runs = [run_stage_in_process(context, stage, file, options, work_dir) for index in range(repeat)]
+            seconds = min(run[0] for run in runs)
+            memory = [run[1] for run in runs if run[1] is not None]
+
+            result = {
+                'points': points, 'stop_density': stop_density, 'time_format': time_format, 'stage': stage,
+                'seconds': seconds, 'runs': [run[0] for run in runs],
+                'points_per_second': points / seconds if seconds else None,
+                'peak_memory_mb': max(memory) if memory else None
+            }
+            results.append(result)
+            if progress is not None:
+                progress(result)
+
+    return results
+
+
+def run_stage_in_process(context, stage, file, options, work_dir):
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(run_stage, stage, file, options, work_dir).result()
+
+
+def environment():
+    """Return the description of the machine and of the code benchmarked."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'commit': commit, 'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(), 'platform': platform.platform(),
+        'cpus': os.cpu_count(), 'numpy': stopover.available()
+    }
+
+
+def _consume(rows):
+    count = 0
+    for row in rows:
+        count += 1
+    return count
+
+
+
+if __name__ == '__main__':
+
+    argparse = argparse.ArgumentParser(prog='benchmarks.run', description="Benchmark the stages of a conversion on synthetic gpx files")
+    argparse.add_argument('--sizes', metavar='', type=int, nargs='+', default=[10000, 100000], help="(integer) points of the synthetic files (default 10000 100000)")
+    argparse.add_argument('--stop-density', metavar='', type=float, default=0.05, help="probability that a moving point begins a stop (default 0.05)")
+    argparse.add_argument('--time-format', metavar='', choices=list(TIME_FORMATS), default='millis', help=f"layout of the time: {', '.join(TIME_FORMATS)} (default millis)")
+    argparse.add_argument('--stopping-time', metavar='', type=int, default=600, help="(integer) seconds of the filter (default 600)")
+    argparse.add_argument('--speed-range', metavar='', type=int, nargs=2, default=[0, 5], help="min and max km/h of the filter (default 0 5)")
+    argparse.add_argument('--distance-range', metavar='', type=float, nargs=2, help="min and max km of the filter")
+    argparse.add_argument('--output-type', metavar='', default='csv', help="output of the write and convert stages (default csv)")
+    argparse.add_argument('--parse-workers', metavar='', type=int, help="(integer) processes parsing each file")
+    argparse.add_argument('--fast-scan', action='store_true', help="read the points with the byte scanner")
+    argparse.add_argument('--stages', metavar='', nargs='+', choices=list(STAGES), default=list(STAGES), help=f"stages to measure: {', '.join(STAGES)} (default all)")
+    argparse.add_argument('--repeat', metavar='', type=int, default=3, help="(integer) runs of each stage, the best one is kept (default 3)")
+    argparse.add_argument('--work-dir', metavar='', default=os.path.join(tempfile.gettempdir(), 'gpx2csv-benchmarks'),
+                          help="directory of the synthetic files, reused by the next runs")
+    argparse.add_argument('--results', metavar='', default='benchmark.json', help="json file of the results (default benchmark.json)")
+
+    args = argparse.parse_args()
+    os.makedirs(args.work_dir, exist_ok=True)
+
+    options = {'stopping-time': args.stopping_time, 'speed-range': tuple(args.speed_range), 'output-type': args.output_type}
+    if args.distance_range is not None:
+        options['distance-range'] = tuple(args.distance_range)
+    if args.parse_workers is not None:
+        options['parse-workers'] = args.parse_workers
+    if args.fast_scan:
+        options['fast-scan'] = True
+
+    def progress(result):
+        memory = f"{result['peak_memory_mb']:.0f} MB" if result['peak_memory_mb'] is not None else '-'
+        print (f"{result['points']:>12} {result['stage']:<8} {result['seconds']:>9.3f} s {result['points_per_second']:>12,.0f} points/s {memory:>8}")
+
+    results = benchmark(args.sizes, args.stop_density, args.time_format, options, args.stages, args.repeat, args.work_dir, progress)
+
+    with open(args.results, 'w') as f:
+        json.dump({'environment': environment(), 'options': options, 'stages': {stage: STAGES[stage] for stage in args.stages}, 'results': results}, f, indent=2)
@@ -53,10 +53,20 @@ filtered_header = [
     'stopping_duration (integer rounded minutes)'
 ]
 
+#stopovers of every parameter set of a sweep, see jobs/sweep.py
+sweep_header = [
+    'stopping_time','min_speed','max_speed','min_distance','max_distance' #parameters of the set
+] + filtered_header
+
 default_header = [
     'latitude','longitude', 'time (original)','date','hour',
     'time_zone','speed','ele','sat','hdop'
 ]
 
+#derived columns added to default_header, see parsers/derived.py
+derived_header = [
+    'distance (m)','total_distance (m)','computed_speed (km/h)','bearing (degrees)','time_delta (s)'
+]
+
 #header for gpx parsing result
-cvs_header['gpx'] = {'default': default_header, 'filtered': filtered_header}
\ No newline at end of file
+cvs_header['gpx'] = {'default': default_header, 'filtered': filtered_header, 'sweep': sweep_header}
\ No newline at end of file
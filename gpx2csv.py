@@ -36,13 +36,22 @@
 # ----------	---	----------------------------------------------------------
 ###### 
 
-import os, argparse, sys
+import argparse, sys, json, signal
 
 import config.global_settings as config
 from pathlib import Path
 
-from parsers.parser import Parser
-from outputs.output import Output
+from jobs.convert import convert, output_file
+from jobs.batch import Batch, expand
+from jobs.follow import Follow
+from jobs.merge import Merge, MEMORY_BUDGET
+from jobs.worker import Worker
+from jobs import sweep
+from parsers import compression
+from parsers.metrics import Metrics, summary as metrics_summary
+from parsers.gpx import COLUMNS
+from parsers.simplify import METHODS as SIMPLIFY_METHODS
+from parsers import timestamp
 
 '''gpx2csv parser, script entry point.'''
 
@@ -54,7 +63,10 @@ if __name__ == '__main__':
 
 
     argparse = argparse.ArgumentParser(prog='gpx2csv', description="Parse file and save the result in csv file with same name")
-    argparse.add_argument("filetoparse", help="If no path is specified the file will be searched in the current directory")
+    argparse.add_argument("filetoparse", nargs='*', help="If no path is specified the file will be searched in the current directory.\
+                                        Many files, directories (their .gpx files) or glob patterns (eg. 'tracks/*.gpx')\
+                                        are converted in batch mode, each one in its own csv file.\
+                                        Compressed files (.gpx.gz, .gpx.bz2, .gpx.xz) are decompressed while they are parsed")
     argparse.add_argument("--stopping-time", type=int, metavar='', 
                                     help="(integer) is the value (in seconds) of how long a \
                                         stopover should lasts for the vehicle or \
@@ -63,6 +75,7 @@ if __name__ == '__main__':
                                         (generally short) and therefore cannot \
                                         be considered parked.\
                                         *You must use it together with the speed-range\
+                                        and/or the distance-range\
                                         eg. --stopping-time 600 --speed-range 0 5"
                         )
     argparse.add_argument('--speed-range', metavar='', nargs=2, type=int,
@@ -71,35 +84,319 @@ if __name__ == '__main__':
                                         *You must use it together with the stopping-time\
                                         eg. --stopping-time 600 --speed-range 0 5"
                         )
+    argparse.add_argument('--distance-range', metavar='', nargs=2, type=float,
+                                help="Are min and max values (in km) of the distance from\
+                                        the first point of the stopover to consider the vehicle\
+                                        or the user unmoving, useful when the device doesn't\
+                                        report the speed correctly.\
+                                        *You must use it together with the stopping-time\
+                                        eg. --stopping-time 600 --distance-range 0 0.05"
+                        )
     argparse.add_argument('--output-path', metavar='', help="output directory, must exist. If no path is specified the file will be saved in the current directory")
+    argparse.add_argument('--jobs', metavar='', type=int, help="(integer) number of worker processes in batch mode (default number of cores)")
+    argparse.add_argument('--parse-workers', metavar='', type=int, help="(integer) number of processes parsing chunks of each file, useful for very big files (default 1)")
+    argparse.add_argument('--follow', action='store_true', help="follow mode for a file still growing: convert only the track points \
+                                        appended since the previous run and add them to the output (a checkpoint \
+                                        file is saved next to the output). With the filter the output is always \
+                                        the stopovers, just the header if there isn't any")
+    argparse.add_argument('--merge', metavar='', help="merge mode: the files (eg. overlapping tracks of one device) are converted \
+                                        as one track sorted by time and without duplicates, saved with this name \
+                                        eg. --merge day (day.csv). The stopover filter runs over the merged points")
+    argparse.add_argument('--memory-budget', metavar='', type=int, default=MEMORY_BUDGET, help="(integer) MB of the points kept \
+                                        in memory in merge mode, the others are sorted in temporary files (default %(default)s)")
+    argparse.add_argument('--fast-scan', action='store_true', help="read the track points with byte patterns instead of the xml parser, \
+                                        much faster on files like sample.gpx (automatically falls back to the xml parser), \
+                                        a plain conversion to csv copies the values from the file into the csv")
+    argparse.add_argument('--cache-dir', metavar='', help="directory of the parsed tracks: converting again a file (eg. with other \
+                                        filter parameters) reads the track from there instead of parsing the xml")
+    argparse.add_argument('--cache-size', metavar='', type=int, help="(integer) size of the cache in MB, the least recently used tracks \
+                                        are removed (default 1024)")
+    argparse.add_argument('--sweep', metavar='', help="json file with many parameter sets of the filter evaluated on the same \
+                                        track, a list eg. [{\"stopping-time\": 600, \"speed-range\": [0, 5]}, ...] or a \
+                                        grid eg. {\"stopping-time\": [300, 600], \"speed-range\": [[0, 5], [0, 10]]}")
+    argparse.add_argument('--sweep-output', metavar='', choices=['separate', 'combined'], default='separate',
+                                        help="separate (default) one csv for each parameter set, its parameters in the \
+                                        file name, or combined one csv with the stopovers of all the sets")
+    argparse.add_argument('--output-type', metavar='', choices=['csv', 'npz', 'arrow', 'sqlite'], default='csv',
+                                        help="csv (default), npz (NumPy), arrow (Arrow IPC file) or sqlite: they \
+                                        save typed columns, eg. floats and timestamps instead of text")
+    argparse.add_argument('--database', metavar='', help="sqlite database where all the tracks are saved (default a \
+                                        database for each file, eg. sample.sqlite), it implies --output-type sqlite")
+    argparse.add_argument('--profile', action='store_true', help="print the time of each stage (parse, filter, write...), \
+                                        the points, rows and stopovers and the peak memory")
+    argparse.add_argument('--metrics', metavar='', help="json file where the metrics of --profile are saved")
+    argparse.add_argument('--cprofile', metavar='', help="run parsing and output under cProfile and save the statistics in \
+                                        this file (python -m pstats file), not in batch mode")
+    argparse.add_argument('--from', metavar='', dest='time_from', help="convert just the points from this time, eg. 2013-02-08 \
+                                        or 2013-02-08T06:00:00+01:00 (UTC if there isn't the zone)")
+    argparse.add_argument('--to', metavar='', dest='time_to', help="convert just the points before this time, eg. --from 2013-02-08 \
+                                        --to 2013-02-09 is a day")
+    argparse.add_argument('--bbox', metavar='', nargs=4, type=float, help="convert just the points in a box: min latitude, \
+                                        min longitude, max latitude and max longitude eg. --bbox 51.9 15.5 52.0 15.6")
+    argparse.add_argument('--assume-sorted', action='store_true', help="the times of the points increase, with --to the file \
+                                        isn't read after the last time")
+    argparse.add_argument('--pipeline', action='store_true', help="read the file, parse the points and write the output \
+                                        at the same time in threads connected by bounded queues (the order of the rows is kept)")
+    argparse.add_argument('--columns', metavar='', nargs='+', choices=COLUMNS, help="columns of the csv of all the points, \
+                                        in this order eg. --columns latitude longitude time (default all: " + ' '.join(COLUMNS) + "), \
+                                        the tags of the other columns aren't read")
+    argparse.add_argument('--simplify', metavar='', nargs=2, help="simplify the track of the default output: method and tolerance, \
+                                        douglas-peucker or min-distance with meters, min-interval with seconds \
+                                        eg. --simplify douglas-peucker 5")
+    argparse.add_argument('--derived', action='store_true', help="add the derived columns to the output of all the points: \
+                                        distance (m) from the previous point, total distance (m), computed speed (km/h), \
+                                        bearing (degrees) and time delta (s). The filter uses the computed speed \
+                                        where <speed> is missing")
+    argparse.add_argument('--serve', action='store_true', help="worker mode: read the jobs as json lines from stdin, eg. \
+                                        {\"id\": 1, \"input\": \"track.gpx\", \"options\": {\"stopping-time\": 600, \"speed-range\": [0, 5]}}, \
+                                        convert them on --jobs processes started once and write a json line with the \
+                                        status and the time of each one. The other arguments are the default options")
+    argparse.add_argument('--socket', metavar='', help="worker mode listening on this unix socket instead of stdin, it implies --serve")
+    argparse.add_argument('--compress', metavar='', choices=['gzip', 'bz2', 'xz'], help="gzip, bz2 or xz, the csv is compressed \
+                                        while it's written (eg. sample.csv.gz)")
 
     args = argparse.parse_args()
 
-    required_together = ('stopping_time','speed_range')
+    if args.socket is not None:
+        args.serve = True
+
+    files, missing = expand(args.filetoparse)
+
+    if args.serve and args.filetoparse:
+        print (argparse.prog + f": error: argument serve: not allowed with filetoparse, the files are read from the jobs")
+        exit()
 
-    if not Path(args.filetoparse).is_file():
-        print (argparse.prog + f": error: argument filetoparse: file not exist: '{args.filetoparse}'")
+    if args.serve and (args.follow or args.cprofile is not None or args.sweep is not None):
+        print (argparse.prog + f": error: argument serve: not allowed with --follow, --cprofile or --sweep")
         exit()
 
-    if args.stopping_time is not None and args.speed_range is None or args.stopping_time is None and args.speed_range is not None :
-        print (argparse.prog + f": error: You must use --stopping-time and --speed-range together")
+    if not files and not args.serve:
+        print (argparse.prog + f": error: argument filetoparse: file not exist: '{', '.join(missing)}'")
+        exit()
+
+    ranges = args.speed_range is not None or args.distance_range is not None
+
+    if args.stopping_time is not None and not ranges or args.stopping_time is None and ranges :
+        print (argparse.prog + f": error: You must use --stopping-time together with --speed-range and/or --distance-range")
         exit()
 
     if args.output_path is not None and not Path(args.output_path).is_dir():
         print (argparse.prog + f": error: argument output-path: path not exist: '{args.output_path}'")
         exit()
 
+    if args.jobs is not None and args.jobs < 1:
+        print (argparse.prog + f": error: argument jobs: must be at least 1")
+        exit()
+
+    if args.parse_workers is not None and args.parse_workers < 1:
+        print (argparse.prog + f": error: argument parse-workers: must be at least 1")
+        exit()
 
-    inputfile = args.filetoparse
-    outputfile = os.path.splitext(os.path.basename(inputfile))[0]
-    options = {}
+    if args.database is not None:
+        args.output_type = 'sqlite'
+
+    if args.follow and args.output_type not in ('csv', 'sqlite'):
+        print (argparse.prog + f": error: argument follow: just the csv and sqlite outputs can be followed")
+        exit()
+
+    if args.cprofile is not None and args.merge is None and (len(files) != 1 or files != args.filetoparse):
+        print (argparse.prog + f": error: argument cprofile: just one file can be profiled")
+        exit()
+
+    if args.columns is not None and len(set(args.columns)) != len(args.columns):
+        print (argparse.prog + f": error: argument columns: a column is repeated")
+        exit()
+
+    if args.columns is not None and args.output_type != 'csv':
+        print (argparse.prog + f": error: argument columns: just the csv output can have a choice of columns")
+        exit()
+
+    if args.compress is not None and args.output_type != 'csv':
+        print (argparse.prog + f": error: argument compress: just the csv output can be compressed")
+        exit()
+
+    if args.follow and files and compression.is_compressed(args.filetoparse[0]):
+        print (argparse.prog + f": error: argument follow: compressed files can not be followed")
+        exit()
+
+    if args.sweep is not None and (args.stopping_time is not None or args.follow):
+        print (argparse.prog + f": error: argument sweep: not allowed with --stopping-time or --follow")
+        exit()
+
+    if args.merge is not None and (args.follow or args.serve or args.cache_dir is not None):
+        print (argparse.prog + f": error: argument merge: not allowed with --follow, --serve or --cache-dir")
+        exit()
+
+    if args.memory_budget < 1:
+        print (argparse.prog + f": error: argument memory-budget: must be at least 1")
+        exit()
+
+    time_window = None
+    if args.time_from is not None or args.time_to is not None:
+        try:
+            time_window = tuple(timestamp.decode(text)[0] if text is not None else None for text in (args.time_from, args.time_to))
+        except ValueError as e:
+            print (argparse.prog + f": error: argument from/to: invalid time: {e}")
+            exit()
+
+    if args.bbox is not None and (args.bbox[0] > args.bbox[2] or args.bbox[1] > args.bbox[3]):
+        print (argparse.prog + f": error: argument bbox: the min values must be lower than the max values")
+        exit()
+
+    simplify = None
+    if args.simplify is not None:
+        method, tolerance = args.simplify
+        try:
+            tolerance = float(tolerance)
+        except ValueError:
+            tolerance = -1
+        if method not in SIMPLIFY_METHODS or tolerance < 0:
+            print (argparse.prog + f": error: argument simplify: a method ({', '.join(SIMPLIFY_METHODS)}) and a tolerance of at least 0")
+            exit()
+        if args.follow or args.sweep is not None:
+            print (argparse.prog + f": error: argument simplify: not allowed with --follow or --sweep")
+            exit()
+        simplify = (method, tolerance)
+
+    if args.derived and (args.follow or simplify is not None):
+        print (argparse.prog + f": error: argument derived: not allowed with --follow or --simplify")
+        exit()
 
-    if args.output_path is not None:
-        outputfile = args.output_path + '/' + outputfile
+    if args.cache_size is not None and args.cache_size < 0:
+        print (argparse.prog + f": error: argument cache-size: must be at least 0")
+        exit()
+
+
+    options = {}
         
     if args.stopping_time is not None:
-        options = {'stopping-time': args.stopping_time, 'speed-range': args.speed_range}
+        options = {'stopping-time': args.stopping_time, 'speed-range': args.speed_range, 'distance-range': args.distance_range}
+
+    if args.parse_workers is not None:
+        options['parse-workers'] = args.parse_workers
+
+    if args.fast_scan:
+        options['fast-scan'] = True
+
+    if args.output_type != 'csv':
+        options['output-type'] = args.output_type
+
+    if args.compress is not None:
+        options['compression'] = args.compress
+
+    if args.database is not None:
+        options['database'] = args.database
+
+    if args.columns is not None:
+        options['columns'] = args.columns
+
+    if args.pipeline:
+        options['pipeline'] = True
+
+    if time_window is not None:
+        options['time-window'] = time_window
+
+    if args.bbox is not None:
+        options['bbox'] = tuple(args.bbox)
+
+    if args.assume_sorted:
+        options['assume-sorted'] = True
+
+    if simplify is not None:
+        options['simplify'] = simplify
+
+    if args.derived:
+        options['derived'] = True
+
+    if args.cache_dir is not None:
+        options['cache-dir'] = args.cache_dir
+        options['cache-size'] = args.cache_size
+
+    if args.serve: #worker mode, the options are the defaults of the jobs
+        if args.profile:
+            options['profile'] = True
+
+        signal.signal(signal.SIGTERM, lambda *args: sys.exit()) #stop cleanly, eg. removing the socket
+
+        with Worker(args.jobs, options, args.output_path) as worker:
+            try:
+                if args.socket is not None:
+                    worker.serve_socket(args.socket)
+                else:
+                    worker.serve(sys.stdin, lambda line: (sys.stdout.write(line), sys.stdout.flush()))
+            except KeyboardInterrupt:
+                pass
+            except OSError as e:
+                print (argparse.prog + f": error: argument socket: {e}")
+        exit()
+
+    if args.profile or args.metrics is not None or args.cprofile is not None:
+        options['metrics'] = Metrics(args.cprofile)
+
+    def report_metrics(reports):
+        """Print and/or save the metrics, reports is a dictonary of file and report."""
+        if args.profile:
+            for inputfile, report in reports.items():
+                print (f"{inputfile}:", file=sys.stderr)
+                print (metrics_summary(report), file=sys.stderr)
+        if args.metrics is not None:
+            with open(args.metrics, 'w') as f:
+                json.dump({'files': [dict(report, file=inputfile) for inputfile, report in reports.items()]}, f, indent=2)
+
+    if args.sweep is not None:
+        try:
+            options['sweep'] = sweep.load(args.sweep)
+        except (OSError, ValueError) as e:
+            print (argparse.prog + f": error: argument sweep: {e}")
+            exit()
+        options['sweep-output'] = args.sweep_output
+
+    if args.follow:
+        if len(files) != 1 or files != args.filetoparse:
+            print (argparse.prog + f": error: argument follow: just one file can be followed")
+            exit()
+
+        Follow(files[0], output_file(files[0], args.output_path), options).run()
+        if 'metrics' in options:
+            report_metrics({files[0]: options['metrics'].report()})
+        exit()
+
+    if args.merge is not None:
+        for input in missing:
+            print (argparse.prog + f": failed: '{input}': file not exist", file=sys.stderr)
+
+        summary = Merge(files, (args.output_path + '/' if args.output_path is not None else '') + args.merge, options, args.memory_budget).run()
+        print (f"{len(files)} merged: {summary['points']} points, {summary['duplicates']} duplicates "
+               f"and {summary['untimed']} without time dropped", file=sys.stderr)
+        if 'metrics' in options:
+            report_metrics({args.merge: options['metrics'].report()})
+        exit()
+
+    if len(args.filetoparse) == 1 and files == args.filetoparse:
+        inputfile = files[0]
+        result = convert(inputfile, output_file(inputfile, args.output_path), options)
+        if 'simplification' in result:
+            simplification = result['simplification']
+            print (f"{inputfile}: {simplification.kept} of {simplification.points} points kept, {simplification.ratio():.1%} removed", file=sys.stderr)
+        if 'metrics' in options:
+            report_metrics({inputfile: options['metrics'].report()})
+        exit()
+
+    #batch mode
+    def progress(inputfile, error, seconds):
+        if error is not None:
+            print (argparse.prog + f": failed: '{inputfile}': {error}", file=sys.stderr)
+
+    batch = Batch(files, args.output_path, options, args.jobs)
+    summary = batch.run(progress)
+
+    if 'metrics' in options:
+        report_metrics(batch.metrics)
+
+    for input in missing:
+        summary['failed'].append((input, 'file not exist'))
+        print (argparse.prog + f": failed: '{input}': file not exist", file=sys.stderr)
 
-    parser = Parser(inputfile, options)
-    output = Output(parser.get_result(), outputfile, options)
-    output.save()
\ No newline at end of file
+    print (f"{len(summary['converted'])} converted, {len(summary['failed'])} failed")
+    if summary['failed']:
+        exit(1)
\ No newline at end of file
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: batch.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 3:58:44 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os, glob, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .convert import convert, output_file
+from parsers import compression
+
+'''Convert many files across a pool of worker processes.'''
+
+
+def expand(inputs, extension='.gpx'):
+    """
+    Return (files, missing): the files found from a list of files,
+    directories (files with extension inside, compressed too eg. track.gpx.gz)
+    and glob patterns, and the inputs which don't match any file.
+    """
+    patterns = ['*' + extension] + ['*' + extension + suffix for suffix in compression.MODULES]
+    files = []
+    missing = []
+
+    for input in inputs:
+        if os.path.isdir(input):
+            found = sorted(path for pattern in patterns for path in glob.glob(os.path.join(glob.escape(input), pattern)))
+        elif os.path.isfile(input):
+            found = [input]
+        else:
+            found = sorted(path for path in glob.glob(input, recursive=True) if os.path.isfile(path))
+
+        if not found:
+            missing.append(input)
+
+        for file in found:
+            if file not in files:
+                files.append(file)
+
+    return files, missing
+
+
+def _convert(inputfile, output_path, options):
+    """
+    Worker: convert a file, return (inputfile, error, seconds, metrics), error is None
+    on success and metrics is the report of options['metrics'] (None without it).
+    """
+    start = time.perf_counter()
+    try:
+        convert(inputfile, output_file(inputfile, output_path), options)
+        error = None
+    except Exception as e: #a bad file must not abort the batch
+        error = f'{type(e).__name__}: {e}'
+
+    metrics = options['metrics'].report() if options.get('metrics') is not None else None
+    return inputfile, error, time.perf_counter() - start, metrics
+
+
+class Batch:
+    """Convert many files, each file writes its own output in output_path."""
+
+    def __init__(self, files, output_path, options, jobs=None):
+        """
+        files (list)         -- files to parse.
+        output_path (string) -- output directory, if None the current directory.
+        options (dictonary)  -- user choices, see Parser and Output.
+        jobs (int)           -- number of worker processes (default number of cores).
+        """
+        self.files = files
+        self.output_path = output_path
+        self.options = options
+        self.jobs = jobs or os.cpu_count() or 1
+        self.converted = []
+        self.failed = []
+        self.metrics = {} #report of the metrics of each file, with options['metrics']
+
+    def run(self, progress=None):
+        """
+        Convert every file and return the summary, see summary().
+        A file with the same output of a file before it (eg. a/track.gpx and b/track.gpx.gz
+        are both track.csv) fails instead of overwriting it.
+
+        progress (function) -- optional, called with (inputfile, error, seconds) when a file is done.
+        """
+        self.converted.clear()
+        self.failed.clear()
+        self.metrics.clear()
+        jobs = min(self.jobs, len(self.files)) or 1
+
+        outputs = {} #output of each file submitted
+        files = []
+        for file in self.files:
+            output = os.path.abspath(output_file(file, self.output_path))
+            if output in outputs:
+                self.__done(file, f"same output of '{outputs[output]}'", 0.0, progress)
+            else:
+                outputs[output] = file
+                files.append(file)
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = {executor.submit(_convert, file, self.output_path, self.options): file for file in files}
+
+            for future in as_completed(futures):
+                try:
+                    inputfile, error, seconds, metrics = future.result()
+                except Exception as e: #eg. a worker process killed, the pool is broken
+                    inputfile, error, seconds, metrics = futures[future], f'{type(e).__name__}: {e}', None, None
+
+                self.__done(inputfile, error, seconds, progress, metrics)
+
+        return self.summary()
+
+    def __done(self, inputfile, error, seconds, progress, metrics=None):
+        if metrics is not None:
+            self.metrics[inputfile] = metrics
+
+        if error is None:
+            self.converted.append(inputfile)
+        else:
+            self.failed.append((inputfile, error))
+
+        if progress is not None:
+            progress(inputfile, error, seconds)
+
+    def summary(self):
+        """Return a dictonary with converted (list of files) and failed (list of (file, error))."""
+        return {'converted': list(self.converted), 'failed': list(self.failed)}
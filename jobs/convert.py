@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: convert.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 3:42:05 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os
+import contextlib
+
+from parsers.parser import Parser
+from outputs.output import Output
+from parsers import compression
+from . import sweep
+
+'''Conversion of one file, shared by the script and the batch workers.'''
+
+
+def output_file(inputfile, output_path=None):
+    """
+    Return the output file (without extension) with same name of the input file,
+    without the compression extension too (eg. track.gpx.gz -> track).
+
+    inputfile (string)   -- file to parse.
+    output_path (string) -- output directory, if None the current directory.
+    """
+    outputfile = os.path.splitext(os.path.basename(compression.strip(inputfile)))[0]
+
+    if output_path is not None:
+        outputfile = output_path + '/' + outputfile
+
+    return outputfile
+
+
+def convert(inputfile, outputfile, options):
+    """
+    Parse inputfile and save the result in outputfile, see Parser and Output for options.
+    With options['metrics'] this is the hot path measured (see parsers/metrics.py).
+    Return the result of the parser, eg. to report its simplification.
+    """
+    metrics = options.get('metrics')
+
+    with metrics.hot_path() if metrics is not None else contextlib.nullcontext():
+        parser = Parser(inputfile, options)
+        result = parser.get_result()
+        save(result, outputfile, options)
+
+    return result
+
+
+def save(result, outputfile, options):
+    """Save the parser result in outputfile, with a sweep an output for each parameter set."""
+    if 'sweep' in result: #one output for each parameter set
+        for parameters, sweep_result in result['sweep']:
+            Output(sweep_result, outputfile + sweep.suffix(parameters), dict(options, **parameters)).save()
+    else:
+        output = Output(result, outputfile, options)
+        output.save()
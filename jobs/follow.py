@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: follow.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 7:22:48 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os, json, hashlib, contextlib
+
+from parsers.parser import Parser
+from outputs.output import Output
+
+'''Follow mode: convert just the track points appended to a growing file since the previous run.'''
+
+CHECKPOINT_EXTENSION = '.checkpoint.json'
+HEAD_SIZE = 4096 #bytes of the input used to check it's still the same file
+#options changing the output, the output is written again if one of them changes between two runs
+OUTPUT_OPTIONS = ('stopping-time', 'speed-range', 'distance-range', 'output-type', 'compression', 'database', 'columns',
+                  'time-window', 'bbox', 'assume-sorted', 'simplify', 'derived', 'keep-epoch')
+
+
+class Follow:
+    """
+    Keep a checkpoint next to the output (outputfile.checkpoint.json) with the
+    byte offset after the last parsed point, the last point and the stopover
+    still open. Every run parses only the points appended after the offset
+    and appends their rows to the output.
+    With a filter the output is always the stopovers: until a stopover is
+    found it has just the header, not all the points as a single run.
+    If the input was replaced or truncated, or an option changing the output
+    (filter, columns, output type, compression...) changed, the output is
+    written again from the beginning.
+    """
+
+    def __init__(self, inputfile, outputfile, options):
+        """
+        inputfile (string)  -- file to parse, it may be still growing.
+        outputfile (string) -- file to save output (without extension).
+        options (dictonary) -- user choices, see Parser and Output.
+        """
+        self.inputfile = inputfile
+        self.outputfile = outputfile
+        self.options = options
+        self.checkpoint_file = outputfile + CHECKPOINT_EXTENSION
+
+    def run(self):
+        """Convert the new points and return the checkpoint."""
+        checkpoint = self.__load()
+        resume = bool(checkpoint['gpx'])
+
+        options = dict(self.options, checkpoint=checkpoint['gpx'], append=resume)
+        metrics = options.get('metrics')
+
+        with metrics.hot_path() if metrics is not None else contextlib.nullcontext():
+            parser = Parser(self.inputfile, options)
+            output = Output(parser.get_result(), self.outputfile, options)
+            output.save()
+
+        checkpoint['head'] = self.__head(checkpoint['gpx'].get('offset', 0))
+        self.__save(checkpoint)
+        return checkpoint
+
+    def __load(self):
+        """Return the checkpoint of the previous run, a new one if it can't be used."""
+        new = {'file': os.path.abspath(self.inputfile), 'options': self.__output_options(), 'gpx': {}}
+
+        try:
+            with open(self.checkpoint_file) as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return new
+
+        offset = checkpoint.get('gpx', {}).get('offset', 0)
+        same_input = checkpoint.get('file') == new['file'] and offset <= os.path.getsize(self.inputfile)
+
+        if not same_input or checkpoint.get('options') != new['options'] or checkpoint.get('head') != self.__head(offset):
+            return new
+
+        return checkpoint
+
+    def __save(self, checkpoint):
+        temporary = self.checkpoint_file + '.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(temporary, self.checkpoint_file)
+
+    def __head(self, offset):
+        """Return the hash of the first bytes of the input (at most up to offset)."""
+        with open(self.inputfile, 'rb') as f:
+            return hashlib.sha1(f.read(min(offset, HEAD_SIZE))).hexdigest()
+
+    def __output_options(self):
+        return {name: list(value) if isinstance(value, (list, tuple)) else value
+                for name, value in self.options.items() if name in OUTPUT_OPTIONS and value is not None}
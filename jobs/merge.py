@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: merge.py
+# Project: gpx2cvs
+# Created Date: Monday, October 19th 2026, 2:03:17 am
+# Author: Fabio Zito
+# -----
+# Last Modified: Mon Oct 19 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os
+import mmap
+import heapq
+import tempfile
+import operator
+import contextlib
+
+from parsers.gpx import GPX
+from parsers.trackpoints import TrackPoints, EPOCH
+from .convert import save
+
+'''Merge mode: many gpx files of one device converted as a single track in time order.'''
+
+MEMORY_BUDGET = 256 #MB of the points kept in memory before they are spilled to disk
+CHECK_EVERY = 4096 #points read between two checks of the memory used
+#options used to parse every file, the others are used to convert the merged track
+PARSE_OPTIONS = ('parse-workers', 'fast-scan', 'pipeline', 'time-window', 'bbox', 'assume-sorted')
+
+
+class Merge:
+    """
+    Convert the points of many files (eg. overlapping tracks of a device restarted
+    or uploaded twice) as one track sorted by time, with the stopover filter run
+    over the merged points so a stopover across two files isn't split.
+
+    Every file is read into sorted runs of points (TrackPoints, a compact columnar
+    store): a run is saved in a temporary file when the points in memory are over
+    the memory budget. The runs are merged in time order (k-way merge), so
+    the points in memory are about the budget whatever the number of files.
+    A point with the same time and position of a point already merged is a
+    duplicate and it's dropped, the first file given wins. The points without
+    time can't be ordered and they're dropped too.
+    """
+
+    def __init__(self, files, outputfile, options, memory_budget=MEMORY_BUDGET):
+        """
+        files (list)         -- gpx files to merge.
+        outputfile (string)  -- file to save output (without extension).
+        options (dictonary)  -- user choices, see Parser and Output (not follow and cache-dir).
+        memory_budget (int)  -- MB of the points in memory (default 256).
+        """
+        self.files = files
+        self.outputfile = outputfile
+        self.options = options
+        self.memory_budget = memory_budget * (1 << 20)
+        self.points = 0
+        self.duplicates = 0
+        self.untimed = 0
+        self.runs = 0
+        self.spilled = 0
+
+    def run(self):
+        """Convert the merged points and return the summary, see summary()."""
+        metrics = self.options.get('metrics')
+        parse_options = {name: value for name, value in self.options.items() if name in PARSE_OPTIONS}
+        parse_options['keep-epoch'] = True
+        options = {name: value for name, value in self.options.items() if name not in PARSE_OPTIONS}
+
+        with metrics.hot_path() if metrics is not None else contextlib.nullcontext():
+            with tempfile.TemporaryDirectory(prefix='gpx2csv-merge-') as directory:
+                #the files are parsed and merged in the merge stage, the parse stage is the merged points
+                with metrics.stage('merge') if metrics is not None else contextlib.nullcontext():
+                    runs = self.__runs(parse_options, directory)
+                rows = heapq.merge(*(run.iter_rows(epoch=True) for run in runs), key=operator.itemgetter(EPOCH))
+                rows = self.__deduplicated(metrics.timed('merge', rows) if metrics is not None else rows)
+
+                parser = GPX(None, dict(options, rows=rows))
+                save(parser.get_result(), self.outputfile, options)
+
+        return self.summary()
+
+    def summary(self):
+        """
+        Return a dictonary with the counters of the last run:
+            -> points (int)     -- points converted
+            -> duplicates (int) -- points dropped with the time and position of another one
+            -> untimed (int)    -- points dropped without time
+            -> runs (int)       -- sorted runs merged
+            -> spilled (int)    -- runs saved in temporary files
+        """
+        return {'points': self.points, 'duplicates': self.duplicates, 'untimed': self.untimed, 'runs': self.runs, 'spilled': self.spilled}
+
+    def __runs(self, parse_options, directory):
+        """Return the sorted runs (TrackPoints) of all the files, the ones over the memory budget saved in directory."""
+        runs = []
+        in_memory = [] #runs not saved yet
+
+        for file in self.files:
+            track = TrackPoints()
+            for row in GPX(file, parse_options).get_result()['rows']:
+                if row[EPOCH] is None:
+                    self.untimed += 1
+                    continue
+
+                track.append(row)
+                if len(track) % CHECK_EVERY == 0 and sum(run.nbytes() for run in in_memory) + track.nbytes() > self.memory_budget:
+                    in_memory.append(track)
+                    runs += [self.__spill(run, directory) for run in in_memory]
+                    in_memory, track = [], TrackPoints()
+
+            if len(track):
+                in_memory.append(track)
+
+        runs += [_sorted(run) for run in in_memory]
+        self.runs = len(runs)
+        return runs
+
+    def __spill(self, track, directory):
+        """Save the run sorted in a temporary file and return it memory mapped."""
+        path = os.path.join(directory, f'run{self.spilled}')
+        self.spilled += 1
+
+        with open(path, 'wb') as f:
+            _sorted(track).save(f)
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return TrackPoints.load(buffer)
+
+    def __deduplicated(self, rows):
+        """Yield the merged rows without the duplicates, the rows with the same time are compared by position."""
+        epoch, positions = None, set()
+
+        for row in rows:
+            if row[EPOCH] != epoch:
+                epoch, positions = row[EPOCH], set()
+
+            position = (row[0], row[1])
+            if position in positions:
+                self.duplicates += 1
+                continue
+
+            positions.add(position)
+            self.points += 1
+            yield row
+
+
+def _sorted(track):
+    """Return the track with the points sorted by time, the same track if they already are (the order of equal times is kept)."""
+    epochs = track.column('epoch')
+    if all(epochs[index] <= epochs[index + 1] for index in range(len(epochs) - 1)):
+        return track
+    return TrackPoints(track.iter_rows(epoch=True, indexes=sorted(range(len(epochs)), key=epochs.__getitem__)))
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: sweep.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 5:03:41 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import json
+import math
+import itertools
+
+'''Parameter sets of the stopover filter evaluated in a single run (sweep mode).'''
+
+PARAMETERS = ('stopping-time', 'speed-range', 'distance-range')
+RANGES = ('speed-range', 'distance-range') #a pair of values, a list of pairs in a grid
+
+
+def load(file):
+    """
+    Return the parameter sets (list of dictonary) read from a json file, either:
+        -> a list of sets eg. [{"stopping-time": 600, "speed-range": [0, 5]}, ...]
+        -> a grid, every combination of the values eg.
+           {"stopping-time": [300, 600], "speed-range": [[0, 5], [0, 10]]},
+           a single value is a value of the grid eg. "stopping-time": 600 or "speed-range": [0, 5]
+
+    Raise ValueError if the file isn't valid.
+    """
+    with open(file) as f:
+        spec = json.load(f)
+
+    if isinstance(spec, dict):
+        unknown = set(spec) - set(PARAMETERS)
+        if unknown:
+            raise ValueError(f"unknown parameters {', '.join(sorted(unknown))}")
+        names = [name for name in PARAMETERS if name in spec]
+        values = [grid_values(name, spec[name]) for name in names]
+        spec = [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+    if not isinstance(spec, list) or not spec:
+        raise ValueError('expected a list of parameter sets or a grid of parameters')
+
+    return [parameter_set(parameters) for parameters in spec]
+
+
+def grid_values(name, value):
+    """Return the values of a parameter of a grid, a single value (eg. a pair of a range) is a list of one value."""
+    if name in RANGES:
+        several = isinstance(value, list) and bool(value) and isinstance(value[0], list)
+    else:
+        several = isinstance(value, list)
+    return value if several else [value]
+
+
+def parameter_set(parameters):
+    """Return the parameters checked and converted to the types of the options, see Parser."""
+    if not isinstance(parameters, dict) or set(parameters) - set(PARAMETERS):
+        raise ValueError(f'invalid parameter set {parameters}')
+
+    stopping_time = parameters.get('stopping-time')
+    speed_range = parameters.get('speed-range')
+    distance_range = parameters.get('distance-range')
+
+    if not isinstance(stopping_time, int) or speed_range is None and distance_range is None:
+        raise ValueError(f'stopping-time must be used together with speed-range and/or distance-range: {parameters}')
+
+    for name, value in (('speed-range', speed_range), ('distance-range', distance_range)):
+        if value is not None and (not isinstance(value, list) or len(value) != 2 or not all(map(_is_number, value))):
+            raise ValueError(f'{name} must be a pair of min and max numbers: {parameters}')
+
+    return {
+        'stopping-time': stopping_time,
+        'speed-range': tuple(int(value) for value in speed_range) if speed_range is not None else None,
+        'distance-range': tuple(float(value) for value in distance_range) if distance_range is not None else None
+    }
+
+
+def _is_number(value):
+    """Return True if value (from json) is a finite number, not null, a string or a boolean."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def suffix(parameters):
+    """Return the suffix of the output file of a parameter set, eg. '_t600_s0-5_d0.0-0.05'"""
+    text = f"_t{parameters['stopping-time']}"
+    if parameters.get('speed-range') is not None:
+        text += '_s{}-{}'.format(*parameters['speed-range'])
+    if parameters.get('distance-range') is not None:
+        text += '_d{}-{}'.format(*parameters['distance-range'])
+    return text
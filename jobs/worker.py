@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: worker.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 11:58:51 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os
+import json
+import time
+import threading
+import socketserver
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from .convert import convert, output_file
+from . import sweep
+from parsers.metrics import Metrics
+from parsers.gpx import COLUMNS
+from parsers.simplify import METHODS as SIMPLIFY_METHODS
+from parsers import timestamp
+
+'''Worker mode: a long running process converting the jobs received as json lines.'''
+
+def _choice(*choices):
+    def check(value):
+        if value not in choices:
+            raise ValueError(f"{value!r} not in {', '.join(choices)}")
+        return value
+    return check
+
+
+def _items(convert, size):
+    def check(value):
+        if len(value) != size:
+            raise ValueError(f'{size} values expected')
+        return tuple(convert(item) for item in value)
+    return check
+
+
+def _flag(value):
+    if not isinstance(value, bool): #eg. the string "false" would be true
+        raise ValueError(f'{value!r} is not true or false')
+    return value
+
+
+def _time(text):
+    return timestamp.decode(text)[0] if text is not None else None
+
+
+def _columns(value):
+    names = [_choice(*COLUMNS)(name) for name in value]
+    if len(set(names)) != len(names):
+        raise ValueError('a column is repeated')
+    return names
+
+
+def _simplify(value):
+    method, tolerance = _items(str, 2)(value)
+    tolerance = float(tolerance)
+    if tolerance < 0:
+        raise ValueError('the tolerance must be at least 0')
+    return _choice(*SIMPLIFY_METHODS)(method), tolerance
+
+
+#options of a job and function checking their values
+JOB_OPTIONS = {
+    'stopping-time': int,
+    'speed-range': _items(int, 2),
+    'distance-range': _items(float, 2),
+    'parse-workers': int,
+    'fast-scan': _flag,
+    'pipeline': _flag,
+    'output-type': _choice('csv', 'npz', 'arrow', 'sqlite'),
+    'compression': _choice('gzip', 'bz2', 'xz'),
+    'cache-dir': str,
+    'cache-size': int,
+    'database': str,
+    'sweep': lambda value: [sweep.parameter_set(parameters) for parameters in value],
+    'sweep-output': _choice('separate', 'combined'),
+    'time-window': _items(_time, 2),
+    'bbox': _items(float, 4),
+    'assume-sorted': _flag,
+    'columns': _columns,
+    'simplify': _simplify,
+    'derived': _flag,
+    'profile': _flag
+}
+
+
+def job_options(options, defaults=None):
+    """
+    Return the options of a job (dictonary, see Parser and Output) checked and
+    converted from json, on top of defaults. Raise ValueError if they aren't valid.
+    """
+    result = dict(defaults or {})
+    for name, value in options.items():
+        if name not in JOB_OPTIONS:
+            raise ValueError(f'unknown option {name}')
+        try:
+            result[name] = JOB_OPTIONS[name](value)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f'invalid option {name}: {e}')
+
+    ranges = result.get('speed-range') is not None or result.get('distance-range') is not None
+    if (result.get('stopping-time') is None) == ranges:
+        raise ValueError('stopping-time must be used together with speed-range and/or distance-range')
+    if result.get('sweep') is not None and result.get('stopping-time') is not None:
+        raise ValueError('sweep is not allowed with stopping-time')
+    if result.get('sweep') is not None and result.get('simplify') is not None:
+        raise ValueError('simplify is not allowed with sweep')
+    if result.get('derived') and result.get('simplify') is not None:
+        raise ValueError('derived is not allowed with simplify')
+    if result.get('compression') is not None and result.get('output-type', 'csv') != 'csv':
+        raise ValueError('just the csv output can be compressed')
+    if result.get('database') is not None:
+        result['output-type'] = 'sqlite'
+    if result.get('columns') is not None and result.get('output-type', 'csv') != 'csv':
+        raise ValueError('just the csv output can have a choice of columns')
+
+    return result
+
+
+def _run_job(inputfile, outputfile, options):
+    """Worker: convert a file, return (error, seconds, metrics), error is None on success."""
+    start = time.perf_counter()
+    if options.pop('profile', False):
+        options['metrics'] = Metrics()
+
+    try:
+        convert(inputfile, outputfile, options)
+        error = None
+    except Exception as e: #a bad file must not stop the worker
+        error = f'{type(e).__name__}: {e}'
+
+    metrics = options['metrics'].report() if 'metrics' in options else None
+    return error, time.perf_counter() - start, metrics
+
+
+def _ready():
+    return os.getpid()
+
+
+class Worker:
+    """
+    Convert the jobs received as json lines on a pool of processes started once,
+    so a job doesn't pay the start of the interpreter and the import of the modules.
+
+    A job is a json object:
+        {"id": 1, "input": "track.gpx", "output_path": "out", "options": {"stopping-time": 600, "speed-range": [0, 5]}}
+        -> id (any)             -- optional, returned in the reply
+        -> input (string)       -- file to parse
+        -> output (string)      -- optional, output file without extension
+        -> output_path (string) -- optional, output directory if there isn't output (default the one of the worker)
+        -> options (dictonary)  -- optional, see JOB_OPTIONS, "profile": true adds the metrics to the reply
+
+    The reply, a json line for each job in order of completion:
+        {"id": 1, "input": "track.gpx", "output": "out/track", "status": "ok", "error": null,
+         "seconds": 0.012, "total_seconds": 0.013, "metrics": null}
+        seconds is the conversion, total_seconds from the job received to the reply.
+    """
+
+    def __init__(self, jobs=None, options=None, output_path=None):
+        """
+        jobs (int)           -- number of worker processes (default number of cores), at most
+                                twice as many jobs are queued before reading the next ones.
+        options (dictonary)  -- default options of the jobs.
+        output_path (string) -- default output directory of the jobs.
+        """
+        self.jobs = jobs or os.cpu_count() or 1
+        self.options = options or {}
+        self.output_path = output_path
+        self.executor = None
+        self.slots = threading.BoundedSemaphore(2 * self.jobs)
+
+    def __enter__(self):
+        self.executor = ProcessPoolExecutor(max_workers=self.jobs)
+        #start all the processes now, not when the first jobs arrive
+        wait([self.executor.submit(_ready) for index in range(self.jobs)])
+        return self
+
+    def __exit__(self, *exc_info):
+        self.executor.shutdown()
+        self.executor = None
+
+    def submit(self, line, reply):
+        """
+        Start the job of a json line, reply (function) is called with the reply
+        (dictonary) when it's done. Return the future, None if the job isn't valid.
+        """
+        received = time.perf_counter()
+        job = {}
+        try:
+            job = json.loads(line)
+            if not isinstance(job, dict) or not isinstance(job.get('input'), str) or not isinstance(job.get('options', {}), dict):
+                raise ValueError('a job must be an object with the input file and the options object')
+            for name in ('output', 'output_path'):
+                if not isinstance(job.get(name, ''), (str, type(None))):
+                    raise ValueError(f'{name} must be a string')
+            options = job_options(job.get('options') or {}, self.options)
+            outputfile = job.get('output') or output_file(job['input'], job.get('output_path', self.output_path))
+        except (TypeError, ValueError) as e:
+            reply({'id': job.get('id') if isinstance(job, dict) else None, 'status': 'error', 'error': f'invalid job: {e}'})
+            return None
+
+        self.slots.acquire()
+        try:
+            future = self.executor.submit(_run_job, job['input'], outputfile, options)
+        except Exception as e: #eg. the pool is broken, the job fails but the worker goes on
+            self.slots.release()
+            reply({'id': job.get('id'), 'input': job['input'], 'output': outputfile, 'status': 'error', 'error': f'{type(e).__name__}: {e}'})
+            return None
+
+        def done(future):
+            self.slots.release()
+            try:
+                error, seconds, metrics = future.result()
+            except Exception as e: #eg. a worker process killed
+                error, seconds, metrics = f'{type(e).__name__}: {e}', None, None
+            reply({
+                'id': job.get('id'), 'input': job['input'], 'output': outputfile,
+                'status': 'ok' if error is None else 'error', 'error': error,
+                'seconds': seconds, 'total_seconds': time.perf_counter() - received, 'metrics': metrics
+            })
+
+        future.add_done_callback(done)
+        return future
+
+    def serve(self, lines, write):
+        """
+        Run the jobs of lines (iterable of json lines, eg. sys.stdin) and write the
+        replies with write (function of a line), return when all the jobs are done.
+        """
+        lock = threading.Condition()
+        pending = 0
+
+        def reply(message):
+            nonlocal pending
+            with lock:
+                try:
+                    write(json.dumps(message) + '\n')
+                finally: #eg. the client is gone, the job is done anyway
+                    pending -= 1
+                    lock.notify()
+
+        for line in lines:
+            if line.strip():
+                with lock:
+                    pending += 1
+                try:
+                    self.submit(line, reply)
+                except Exception as e: #a bad job must not stop the worker, its reply is an error
+                    reply({'id': None, 'status': 'error', 'error': f'{type(e).__name__}: {e}'})
+
+        #the replies are written by the callbacks after the futures are done
+        with lock:
+            lock.wait_for(lambda: pending == 0)
+
+    def serve_socket(self, path):
+        """Accept connections on a unix socket at path, each one sends jobs and receives replies as json lines."""
+        if not hasattr(socketserver, 'ThreadingUnixStreamServer'):
+            raise OSError('unix sockets are not supported on this system')
+
+        worker = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                def write(text):
+                    self.wfile.write(text.encode())
+                    self.wfile.flush()
+                worker.serve((line.decode() for line in self.rfile), write)
+
+        if os.path.exists(path):
+            os.remove(path)
+
+        with socketserver.ThreadingUnixStreamServer(path, Handler) as server:
+            try:
+                server.serve_forever()
+            finally:
+                os.remove(path)
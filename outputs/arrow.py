@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: arrow.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 7:15:44 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os
+from . import columns
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.compute
+except ImportError: #pyarrow is optional, just this output needs it
+    pyarrow = None
+
+'''Arrow IPC file output.'''
+
+
+class ARROW:
+    """
+    Save parser result in an Arrow IPC file (.arrow), the columns with their
+    native type (see outputs/columns.py), missing values are null:
+        -> float64, int16, int64
+        -> time as timestamp[us, UTC], start_time/end_time as timestamp[s] (as in the file)
+        -> text as dictionary<int32, string>
+
+    The file can be read zero-copy from a memory map, eg.
+    pyarrow.ipc.open_file(pyarrow.memory_map(file)).read_all()
+    """
+
+    def __init__(self, parser_result, file, options):
+        if pyarrow is None:
+            raise ModuleNotFoundError('The arrow output needs pyarrow (pip install pyarrow)\n\n')
+        if options.get('append'):
+            raise ValueError('The arrow output can not be appended, use csv in follow mode')
+
+        self.file = file
+        self.parser_result = parser_result
+
+    def save(self):
+        path = self.file + '.arrow'
+        built = columns.build(self.parser_result)
+        table = pyarrow.table([self.__array(column) for column in built], names=[column.name for column in built])
+
+        sink = pyarrow.OSFile(path, 'wb') #a file that can't be opened is left as it is
+        try:
+            with sink:
+                with pyarrow.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        except BaseException:
+            os.remove(path)
+            raise
+
+    def __array(self, column):
+        length = len(column.values)
+        nulls = _bitmap(column.valid) if column.valid is not None else None
+        data = pyarrow.py_buffer(column.values)
+
+        if column.kind == columns.TEXT:
+            indices = pyarrow.Array.from_buffers(pyarrow.int32(), length, [nulls, data])
+            return pyarrow.DictionaryArray.from_arrays(indices, pyarrow.array(column.dictionary, pyarrow.string()))
+
+        arrow_type = {
+            columns.FLOAT: pyarrow.float64(), columns.INT: pyarrow.int16(), columns.LONG: pyarrow.int64(),
+            columns.TIME: pyarrow.timestamp('us', tz='UTC'), columns.LOCAL: pyarrow.timestamp('s')
+        }[column.kind]
+        return pyarrow.Array.from_buffers(arrow_type, length, [nulls, data])
+
+
+def _bitmap(valid):
+    """Return the validity bitmap (buffer) of valid, a byte for each value."""
+    flags = pyarrow.Array.from_buffers(pyarrow.uint8(), len(valid), [None, pyarrow.py_buffer(valid)])
+    return pyarrow.compute.not_equal(flags, 0).buffers()[1]
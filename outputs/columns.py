@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: columns.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 6:20:37 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import math
+import datetime
+import itertools
+from array import array
+from parsers import timestamp, derived
+from parsers.trackpoints import EPOCH
+
+'''Typed columns of a parser result, shared by the binary outputs (npz, arrow).'''
+
+FLOAT = 'd'     #float64, missing values are NaN
+INT = 'h'       #int16, missing values are MISSING_INT (null in arrow)
+LONG = 'q'      #int64
+TIME = 'time'   #int64 microseconds since epoch (UTC)
+LOCAL = 'local' #int64 seconds since epoch of a date and hour as they are in the file (no time zone)
+TEXT = 'text'   #dictionary encoded: int32 codes and the list of the values
+
+MISSING_INT = -1
+BATCH_SIZE = 1 << 16 #rows converted together, column by column
+
+#name, kind and position of the columns in the rows of each output type
+FILTERED = [
+    ('start_latitude', FLOAT, 0), ('start_longitude', FLOAT, 1), ('start_time', LOCAL, (2, 3)),
+    ('end_latitude', FLOAT, 4), ('end_longitude', FLOAT, 5), ('end_time', LOCAL, (6, 7)),
+    ('stopping_duration', LONG, 8)
+]
+
+SCHEMAS = {
+    'default': [
+        ('latitude', FLOAT, 0), ('longitude', FLOAT, 1), ('time', TIME, 2), ('time_zone', TEXT, 5),
+        ('speed', INT, 6), ('ele', FLOAT, 7), ('sat', INT, 8), ('hdop', FLOAT, 9)
+    ],
+    'filtered': FILTERED,
+    'sweep': [
+        ('stopping_time', LONG, 0), ('min_speed', INT, 1), ('max_speed', INT, 2),
+        ('min_distance', FLOAT, 3), ('max_distance', FLOAT, 4)
+    ] + [
+        (name, kind, (position[0] + 5, position[1] + 5) if isinstance(position, tuple) else position + 5)
+        for name, kind, position in FILTERED
+    ]
+}
+
+#derived columns (see parsers/derived.py) after the default ones, taken from their arrays
+DERIVED = [(name, FLOAT, None) for name in derived.COLUMNS]
+
+
+class Column:
+    """
+    A typed column:
+        -> name (string)
+        -> kind (string)      -- FLOAT, INT, LONG, TIME, LOCAL or TEXT
+        -> values (buffer)    -- array.array (or a memoryview of a cached track), codes for TEXT
+        -> valid (array)      -- 1 for the values that aren't missing, None if none is missing
+        -> dictionary (list)  -- values of the codes of a TEXT column
+    """
+
+    __slots__ = ('name', 'kind', 'values', 'valid', 'dictionary')
+
+    def __init__(self, name, kind, values, valid=None, dictionary=None):
+        self.name = name
+        self.kind = kind
+        self.values = values
+        self.valid = valid
+        self.dictionary = dictionary
+
+
+def build(parser_result):
+    """
+    Return the typed columns (list of Column) of parser_result, see Parser.get_result().
+    The default rows of a track are taken from its columns, the others are converted
+    from the rows while they are consumed. The derived columns of the default
+    output (parser_result['derived']) follow the default ones.
+    """
+    output_type = parser_result['output_type']
+    derived_columns = []
+    if output_type == 'default' and parser_result.get('derived') is not None:
+        derived_columns = [Column(name, kind, parser_result['derived'][name]) for name, kind, position in DERIVED]
+
+    if output_type == 'default' and parser_result.get('track') is not None:
+        return _track_columns(parser_result['track']) + derived_columns
+
+    schema = SCHEMAS[output_type]
+    builders = [_builder(kind) for name, kind, position in schema]
+    getters = [_getter(kind, position) for name, kind, position in schema]
+    rows = iter(parser_result['rows'])
+
+    while True:
+        batch = list(itertools.islice(rows, BATCH_SIZE))
+        if not batch:
+            break
+        for builder, get in zip(builders, getters):
+            builder.extend(list(map(get, batch)))
+
+    return [builder.column(name) for builder, (name, kind, position) in zip(builders, schema)] + derived_columns
+
+
+def _track_columns(track):
+    columns = []
+    for name, kind, position in SCHEMAS['default']:
+        if kind == FLOAT:
+            columns.append(Column(name, kind, track.columns[name]))
+        elif kind == TIME:
+            values, valid = track.columns['epoch'], None
+            if track.exceptions['epoch']: #points without time
+                valid = array('B', [1]) * len(values)
+                for index in track.exceptions['epoch']:
+                    valid[index] = 0
+            columns.append(Column(name, kind, values, valid))
+        elif kind == INT:
+            #the values of the track are 0 where the text isn't a number or it's out of int16
+            missing = [index for index, text in track.exceptions[name].items() if _int16(text) is None]
+            values, valid = track.columns[name], None
+            if missing:
+                values, valid = array(INT, values), array('B', [1]) * len(values)
+                for index in missing:
+                    values[index], valid[index] = MISSING_INT, 0
+            columns.append(Column(name, kind, values, valid))
+        else:
+            builder = _builder(kind)
+            for index in range(len(track)):
+                time = track.time(index)
+                builder.add(timestamp.split(time)[2] if time is not None else None)
+            columns.append(builder.column(name))
+    return columns
+
+
+def _getter(kind, position):
+    if isinstance(position, tuple):
+        first, second = position
+        return lambda row: (row[first], row[second])
+    if kind == TIME:
+        return lambda row: row[EPOCH] if len(row) > EPOCH else row[position]
+    return lambda row: row[position]
+
+
+def _builder(kind):
+    if kind == TEXT:
+        return _TextBuilder()
+    return _NumberBuilder(kind)
+
+
+class _NumberBuilder:
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.values = array('q' if kind in (TIME, LOCAL) else kind)
+        self.valid = array('B')
+        self.missing = False
+        self.convert = {FLOAT: _float, INT: _int, LONG: _int, TIME: _time, LOCAL: _local}[kind]
+        #conversion of a whole batch, it fails on the first value that isn't valid
+        self.fast = {FLOAT: float, INT: int, LONG: int, TIME: int, LOCAL: _local}[kind]
+
+    def extend(self, values):
+        size = len(self.values)
+        try:
+            self.values.extend(map(self.fast, values))
+            self.valid.frombytes(b'\1' * len(values))
+        except (TypeError, ValueError, OverflowError):
+            del self.values[size:]
+            for value in values:
+                self.add(value)
+
+    def add(self, value):
+        value = self.convert(value)
+        if value is not None:
+            try:
+                self.values.append(value)
+                self.valid.append(1)
+                return
+            except OverflowError: #eg. a speed out of int16
+                pass
+
+        self.missing = True
+        self.values.append(MISSING_INT if self.kind != FLOAT else math.nan)
+        self.valid.append(0)
+
+    def column(self, name):
+        return Column(name, self.kind, self.values, self.valid if self.missing else None)
+
+
+class _TextBuilder:
+
+    def __init__(self):
+        self.codes = array('i')
+        self.valid = array('B')
+        self.missing = False
+        self.dictionary = {}
+
+    def extend(self, values):
+        for value in values:
+            self.add(value)
+
+    def add(self, value):
+        if value is None:
+            self.missing = True
+            self.codes.append(0)
+            self.valid.append(0)
+        else:
+            self.codes.append(self.dictionary.setdefault(value, len(self.dictionary)))
+            self.valid.append(1)
+
+    def column(self, name):
+        return Column(name, TEXT, self.codes, self.valid if self.missing else None, list(self.dictionary))
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _int16(value):
+    value = _int(value)
+    return value if value is not None and -0x8000 <= value < 0x8000 else None
+
+
+def _time(text):
+    if isinstance(text, int): #the epoch kept by the parser
+        return text
+    try:
+        return timestamp.decode(text)[0]
+    except (TypeError, ValueError):
+        return None
+
+
+def _local(date_hour):
+    try:
+        local = datetime.datetime.fromisoformat('T'.join(date_hour))
+    except (TypeError, ValueError):
+        return None
+    return (local - timestamp.NAIVE_EPOCH) // datetime.timedelta(seconds=1)
@@ -36,8 +36,23 @@
 # ----------	---	----------------------------------------------------------
 ###### 
 
+import io
+import os
 import csv
-from config.global_settings import cvs_header
+import bz2
+import gzip
+import lzma
+import locale
+from config.global_settings import cvs_header, derived_header
+
+BUFFER_SIZE = 1 << 20
+
+#compression of the output: extension and function opening the file
+COMPRESSION = {
+    'gzip': ('.gz', lambda path, mode: gzip.open(path, mode, compresslevel=6)),
+    'bz2': ('.bz2', bz2.open),
+    'xz': ('.xz', lzma.open)
+}
 
 class CSV:
     """Save parser result on csv file."""
@@ -45,13 +60,72 @@ class CSV:
         self.file = file
         #Get header from global settings
         self.header = cvs_header[parser_result['parser-type']][parser_result['output_type']]
+        if parser_result['output_type'] == 'default' and parser_result.get('columns') is not None:
+            #just the columns chosen by the user
+            self.header = [self.header[position] for position in parser_result['columns']]
+        if parser_result['output_type'] == 'default' and parser_result.get('derived') is not None:
+            #the derived columns follow the default ones
+            self.header = self.header + derived_header
         self.rows = parser_result['rows']
+        #csv lines copied from the input file (blocks of bytes) and rows, written instead of the rows
+        self.lines = parser_result.get('lines')
+        #rows are added to an existing file (follow mode)
+        self.append = bool(options.get('append'))
+        #gzip, bz2 or xz, the rows are compressed while they are written
+        self.compression = options.get('compression')
 
     def save(self):
-        with open(self.file + '.csv', 'w') as csvfile: 
-            # creating a csv writer object 
-            csvwriter = csv.writer(csvfile) 
-            # writing the fields 
-            csvwriter.writerow(self.header)
-            # writing the data rows 
-            csvwriter.writerows(self.rows) 
+        path = self.file + '.csv'
+        if self.compression is not None:
+            path += COMPRESSION[self.compression][0]
+        size = os.path.getsize(path) if self.append and os.path.isfile(path) else 0
+        copy_lines = self.lines is not None and not size
+
+        #a file that can't be opened is left as it is
+        csvfile = self.__open(path, 'a' if size else 'w', binary=copy_lines)
+
+        try:
+            with csvfile:
+                if copy_lines:
+                    self.__write_lines(csvfile)
+                else:
+                    # creating a csv writer object 
+                    csvwriter = csv.writer(csvfile) 
+                    # writing the fields 
+                    if not size:
+                        csvwriter.writerow(self.header)
+                    # writing the data rows while the parser produces them
+                    csvwriter.writerows(self.rows) 
+        except BaseException:
+            #rows are parsed while they are written, don't leave a truncated file if parsing fails
+            if size:
+                os.truncate(path, size)
+            else:
+                os.remove(path)
+            raise
+
+    def __write_lines(self, csvfile):
+        """Write the lines as they are in a binary file, the rows among them are formatted by csv.writer."""
+        encoding = locale.getpreferredencoding(False) #the encoding of the text file written by __open()
+        text = io.StringIO()
+        csvwriter = csv.writer(text)
+
+        def encoded(row):
+            text.seek(0)
+            text.truncate()
+            csvwriter.writerow(row)
+            return text.getvalue().encode(encoding)
+
+        csvfile.write(encoded(self.header))
+        for lines in self.lines:
+            csvfile.write(lines if isinstance(lines, bytes) else encoded(lines))
+
+    def __open(self, path, mode, binary=False):
+        """
+        Return the text (binary) file to write with large buffered writes,
+        a compressed stream is appended as a new member.
+        """
+        if self.compression is None:
+            return open(path, mode + ('b' if binary else ''), buffering=BUFFER_SIZE)
+        stream = io.BufferedWriter(COMPRESSION[self.compression][1](path, mode + 'b'), BUFFER_SIZE)
+        return stream if binary else io.TextIOWrapper(stream)
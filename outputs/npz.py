@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: npz.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 6:58:12 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os
+from . import columns
+
+try:
+    import numpy
+except ImportError: #numpy is optional, just this output needs it
+    numpy = None
+
+'''NumPy .npz output: one typed array for each column.'''
+
+
+class NPZ:
+    """
+    Save parser result in a NumPy .npz file (not compressed), one array for each
+    column with its native type (see outputs/columns.py):
+        -> float64 (NaN if missing), int16 (-1 if missing), int64
+        -> time as datetime64[us] (UTC), start_time/end_time as datetime64[s] (as in the file)
+        -> text as unicode strings
+
+    numpy.load(file) returns them without parsing any text.
+    """
+
+    def __init__(self, parser_result, file, options):
+        if numpy is None:
+            raise ModuleNotFoundError('The npz output needs numpy (pip install numpy)\n\n')
+        if options.get('append'):
+            raise ValueError('The npz output can not be appended, use csv in follow mode')
+
+        self.file = file
+        self.parser_result = parser_result
+
+    def save(self):
+        path = self.file + '.npz'
+        arrays = {column.name: self.__array(column) for column in columns.build(self.parser_result)}
+
+        f = open(path, 'wb') #a file that can't be opened is left as it is
+        try:
+            with f:
+                numpy.savez(f, **arrays)
+        except BaseException:
+            os.remove(path)
+            raise
+
+    def __array(self, column):
+        if column.kind == columns.TEXT:
+            values = numpy.array(column.dictionary + [''], dtype=str)[numpy.asarray(memoryview(column.values))]
+            if column.valid is not None:
+                values[numpy.asarray(memoryview(column.valid)) == 0] = ''
+            return values
+
+        values = numpy.asarray(memoryview(column.values))
+
+        if column.kind in (columns.TIME, columns.LOCAL):
+            values = values.view('datetime64[us]' if column.kind == columns.TIME else 'datetime64[s]')
+            if column.valid is not None:
+                values = values.copy()
+                values[numpy.asarray(memoryview(column.valid)) == 0] = numpy.datetime64('NaT')
+        return values
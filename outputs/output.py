@@ -36,7 +36,7 @@
 # ----------	---	----------------------------------------------------------
 ###### 
 
-from . import csv
+from . import csv, npz, arrow, sqlite
 from config.global_settings import DEBUG
 
 class Output:
@@ -44,24 +44,34 @@ class Output:
 
     def __init__(self, parser_result, file, options):
         """
-            parser_result (dictonary) -- parsing result.
+            parser_result (dictonary) -- parsing result, see Parser.get_result().
+                                         The rows are an iterator and are written while they are parsed.
             file (string) -- file to save ouput. Extention is set to output-type (default .csv).
 
             options (dictonary) -- is a list of user choices to parse element.
                 -> stopping-time (int)    -- possible value in seconds eg. 600
                 -> speed-range (tuple)    -- min and max value in km/h eg. (0, 5)
                 -> distance-range (tuple) -- min and max value in km eg. (0, 5)
-                -> output-type (string)   -- format that parsing results are saved (default csv)
+                -> output-type (string)   -- format that parsing results are saved (default csv),
+                                             npz, arrow and sqlite are typed columns (see outputs/columns.py)
+                -> append (bool)          -- add the rows to the existing file (follow mode)
+                -> compression (string)   -- gzip, bz2 or xz, compressed csv (eg. track.csv.gz)
+                -> database (string)      -- sqlite database of all the tracks (see outputs/sqlite.py)
+                -> metrics (Metrics)      -- optional, time of the rows and of the writing (see parsers/metrics.py)
         """
         self.output = None
+        self.metrics = options.get('metrics')
+
+        if self.metrics is not None: #rows produced for the output, counted while they are written
+            parser_result = dict(parser_result, rows=self.metrics.timed('rows', parser_result['rows'], 'rows'))
         module_name = 'csv'
 
         #check if type of output is a user choices
         if len(options) and options.get('output-type'):
-            module_name = self.options.get('output-type')
+            module_name = options.get('output-type')
         
         #if format are in list the output was developed
-        format = [ele for ele in ['csv'] if(ele in module_name)]
+        format = [ele for ele in ['csv', 'npz', 'arrow', 'sqlite'] if(ele in module_name)]
       
         if not bool(format):
             raise ModuleNotFoundError(f'The output module for this format {module_name} has not yet been developed\n\n')
@@ -71,4 +81,7 @@ class Output:
         self.output = class_(parser_result, file, options)
 
     def save(self):
+        if self.metrics is not None:
+            with self.metrics.stage('write'):
+                return self.output.save()
         return self.output.save()
\ No newline at end of file
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: sqlite.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 9:37:02 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os
+import sqlite3
+import itertools
+from . import columns
+
+'''SQLite output: points and stopovers of many tracks in one database.'''
+
+GRID_CELLS = 100 #cells for degree of the lat/lon grid, about 1 km
+
+#lat/lon grid key of a point, eg. SELECT * FROM points WHERE grid = (latitude + 90) * 100 ...
+GRID = f'CAST(({{0}} + 90) * {GRID_CELLS} AS INTEGER) * {360 * GRID_CELLS} + CAST(({{1}} + 180) * {GRID_CELLS} AS INTEGER)'
+
+PRAGMAS = [
+    'PRAGMA journal_mode = WAL',    #readers don't block the writer (eg. a batch appending to the same database)
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA temp_store = MEMORY',
+    'PRAGMA cache_size = -65536'    #64 MB
+]
+
+#sql types of the column kinds
+TYPES = {
+    columns.FLOAT: 'REAL', columns.INT: 'INTEGER', columns.LONG: 'INTEGER',
+    columns.TIME: 'INTEGER', columns.LOCAL: 'INTEGER', columns.TEXT: 'TEXT'
+}
+
+PARAMETERS = ['stopping_time', 'min_speed', 'max_speed', 'min_distance', 'max_distance']
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS tracks (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS points (track_id INTEGER NOT NULL REFERENCES tracks(id), {}, grid INTEGER GENERATED ALWAYS AS ({}) VIRTUAL)'.format(
+        ', '.join(f'{name} {TYPES[kind]}' for name, kind, position in columns.SCHEMAS['default'] + columns.DERIVED),
+        GRID.format('latitude', 'longitude')
+    ),
+    'CREATE TABLE IF NOT EXISTS stopovers (track_id INTEGER NOT NULL REFERENCES tracks(id), {}, grid INTEGER GENERATED ALWAYS AS ({}) VIRTUAL)'.format(
+        ', '.join(f'{name} {TYPES[kind]}' for name, kind, position in columns.SCHEMAS['sweep']),
+        GRID.format('start_latitude', 'start_longitude')
+    )
+]
+
+INDEXES = [
+    'CREATE INDEX IF NOT EXISTS points_track ON points (track_id)',
+    'CREATE INDEX IF NOT EXISTS points_time ON points (time)',
+    'CREATE INDEX IF NOT EXISTS points_grid ON points (grid)',
+    'CREATE INDEX IF NOT EXISTS stopovers_track ON stopovers (track_id)',
+    'CREATE INDEX IF NOT EXISTS stopovers_time ON stopovers (start_time)',
+    'CREATE INDEX IF NOT EXISTS stopovers_grid ON stopovers (grid)'
+]
+
+
+class SQLITE:
+    """
+    Save parser result in a SQLite database, the typed columns of outputs/columns.py in:
+        -> tracks (id, name)  -- name is the output file name, eg. sample
+        -> points             -- default columns, time is the epoch in microseconds (UTC), and
+                                 the derived ones (NULL if they aren't computed)
+        -> stopovers          -- filter columns, start_time/end_time in seconds (as in the file),
+                                 with the parameters of the filter (stopping_time, min_speed...)
+
+    points and stopovers have a lat/lon grid key (grid, GRID_CELLS cells for degree)
+    and they are indexed on time and grid.
+
+    All the rows of a track are written in one transaction. Many tracks can be
+    saved in the same database (option database), saving again a track replaces
+    its rows, unless they are appended (follow mode).
+    """
+
+    def __init__(self, parser_result, file, options):
+        """See Output, options:
+            -> database (string) -- database of all the tracks, default file.sqlite
+            -> append (bool)     -- add the rows to the track already in the database
+        """
+        self.parser_result = parser_result
+        self.name = os.path.basename(file)
+        self.path = options.get('database') or file + '.sqlite'
+        self.append = bool(options.get('append'))
+
+        #parameters of the filter of the stopovers
+        speed_range = options.get('speed-range') or (None, None)
+        distance_range = options.get('distance-range') or (None, None)
+        self.parameters = [options.get('stopping-time'), *speed_range, *distance_range]
+
+    def save(self):
+        new = not os.path.isfile(self.path)
+        #timeout, other processes (batch) may be writing the same database
+        connection = sqlite3.connect(self.path, timeout=600, isolation_level=None)
+
+        try:
+            for pragma in PRAGMAS:
+                connection.execute(pragma)
+            for statement in SCHEMA:
+                connection.execute(statement)
+            self.__add_derived(connection)
+
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                track_id = self.__track(connection)
+                self.__insert(connection, track_id)
+                connection.execute('COMMIT')
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+
+            #indexes are built after the first bulk insert, then they are updated
+            for statement in INDEXES:
+                connection.execute(statement)
+        except BaseException:
+            connection.close()
+            if new:
+                for suffix in ('', '-wal', '-shm'):
+                    if os.path.isfile(self.path + suffix):
+                        os.remove(self.path + suffix)
+            raise
+
+        connection.close()
+
+    def __add_derived(self, connection):
+        """Add the derived columns to the points of a database created before them, they are NULL in the old rows."""
+        existing = {row[1] for row in connection.execute('PRAGMA table_info(points)')}
+        for name, kind, position in columns.DERIVED:
+            if name not in existing:
+                try:
+                    connection.execute(f'ALTER TABLE points ADD COLUMN {name} {TYPES[kind]}')
+                except sqlite3.OperationalError as e:
+                    if 'duplicate column' not in str(e): #else added at the same time by another process
+                        raise
+
+    def __track(self, connection):
+        """Return the id of the track, its rows are removed if they aren't appended."""
+        connection.execute('INSERT OR IGNORE INTO tracks (name) VALUES (?)', (self.name,))
+        track_id = connection.execute('SELECT id FROM tracks WHERE name = ?', (self.name,)).fetchone()[0]
+
+        if not self.append:
+            connection.execute('DELETE FROM points WHERE track_id = ?', (track_id,))
+            connection.execute('DELETE FROM stopovers WHERE track_id = ?', (track_id,))
+
+        return track_id
+
+    def __insert(self, connection, track_id):
+        result = self.parser_result
+        output_type = result['output_type']
+
+        if output_type == 'default':
+            self.__insert_columns(connection, 'points', track_id, columns.build(result))
+            return
+
+        #the parameters of a single filter are the same for all the stopovers
+        constants = list(zip(PARAMETERS, self.parameters)) if output_type == 'filtered' else []
+        self.__insert_columns(connection, 'stopovers', track_id, columns.build(result), constants)
+
+        #the points of the track are saved together with its stopovers, after them
+        #because the track may be stored while the filter consumes the rows
+        if result.get('track') is not None:
+            points = {'parser-type': result['parser-type'], 'output_type': 'default', 'rows': iter(result['track']),
+                      'track': result['track'], 'derived': result.get('derived')}
+            self.__insert_columns(connection, 'points', track_id, columns.build(points))
+
+    def __insert_columns(self, connection, table, track_id, built, constants=()):
+        """Insert the typed columns (built by columns.build()) and the constants, list of (name, value)."""
+        names = ['track_id'] + [name for name, value in constants] + [column.name for column in built]
+        length = len(built[0].values)
+        values = [itertools.repeat(track_id, length)] + [itertools.repeat(value, length) for name, value in constants]
+        values += [_values(column) for column in built]
+
+        connection.executemany(
+            f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})", zip(*values)
+        )
+
+
+def _values(column):
+    """Return an iterable of the sql values of column, None for the missing ones (NaN floats are NULL too)."""
+    values = column.values
+
+    if column.kind == columns.TEXT:
+        dictionary = column.dictionary
+        values = (dictionary[code] for code in values)
+
+    if column.valid is not None:
+        values = (value if valid else None for value, valid in zip(values, column.valid))
+
+    return values
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: cache.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 4:12:08 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os
+import mmap
+import hashlib
+import tempfile
+from .trackpoints import TrackPoints
+
+'''Content addressed cache of the parsed tracks.'''
+
+EXTENSION = '.track'
+BLOCK_SIZE = 1 << 20
+DEFAULT_SIZE = 1024 #MB
+
+
+class TrackCache:
+    """
+    Parsed tracks saved in a directory by the hash of the file content, so
+    converting again the same file (eg. with other filter parameters) skips
+    the XML parsing. The least recently used tracks are removed when the
+    directory grows over max_size.
+    """
+
+    def __init__(self, directory, max_size=None):
+        """
+        directory (str) -- where the tracks are saved, created if it doesn't exist
+        max_size (int) -- size of the cache in MB
+        """
+        self.directory = directory
+        self.max_size = (DEFAULT_SIZE if max_size is None else max_size) * (1 << 20)
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, file, version):
+        """Return the key of the file: hash of its content and of the version of the parser."""
+        digest = hashlib.blake2b(version.encode(), digest_size=20)
+        with open(file, 'rb') as f:
+            for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the track saved with key (memory mapped, read only) or None."""
+        path = self.__path(key)
+        try:
+            with open(path, 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            track = TrackPoints.load(buffer)
+        except (OSError, ValueError):
+            return None
+
+        #a hit makes the track the most recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return track
+
+    def put(self, key, track):
+        """Save the track with key and remove the least recently used ones over the size of the cache."""
+        f = tempfile.NamedTemporaryFile(dir=self.directory, suffix='.tmp', delete=False)
+        try:
+            with f:
+                track.save(f)
+            os.replace(f.name, self.__path(key))
+        except BaseException:
+            os.remove(f.name)
+            raise
+        self.__evict(keep=self.__path(key))
+
+    def __path(self, key):
+        return os.path.join(self.directory, key + EXTENSION)
+
+    def __evict(self, keep):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(EXTENSION):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for mtime, size, path in entries)
+        for mtime, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: chunks.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 5:16:32 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import re
+import mmap
+
+'''Split a memory-mapped gpx file in byte ranges aligned on <trkpt> elements.'''
+
+CHUNK_SIZE = 8 * 1024 * 1024 #bytes of track points parsed by a worker at once
+
+TRKPT_OPEN = b'<trkpt'
+TRKPT_CLOSE = b'</trkpt>'
+TRKPT = re.compile(rb'<trkpt(?:(?:\s[^>]*?)?/>|[\s>].*?</trkpt>)', re.S) #self-closing or with a body
+SELF_CLOSING = re.compile(rb'<trkpt(?:\s[^>]*)?/>')
+NAMESPACE = re.compile(rb'''\sxmlns(?::[\w.-]+)?\s*=\s*(?:"[^"]*"|'[^']*')''')
+DECLARATION = re.compile(rb'<\?xml[^>]*\?>')
+GPX_CLOSE = re.compile(rb'</(?:[\w.-]+:)?gpx\s*>')
+
+
+def open_mmap(file):
+    """Return a read only memory map of the file."""
+    with open(file, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def track_range(buffer):
+    """
+    Return (prolog, start, end) of the track points in buffer, None if the file
+    has something the byte level readers can't handle (no <trkpt> without
+    prefix, comments or CDATA after the first point, see find_first()).
+
+    prolog (bytes) -- xml declaration and root element with the namespaces of
+                      the file, the track points can be parsed inside it.
+    start, end     -- the range begins with the first <trkpt and ends after
+                      the last point, see end_of_points().
+    """
+    first = find_first(buffer)
+    if first < 0:
+        return None
+    last = end_of_points(buffer, first)
+    if last < 0:
+        return None
+
+    if buffer.find(b'<!', first) >= 0: #comments or CDATA may hide or split points
+        return None
+
+    return prolog(buffer, first), first, last
+
+
+def prolog(buffer, first):
+    """Return xml declaration and root element with the namespaces found before the first point."""
+    header = buffer[:first]
+    declaration = DECLARATION.match(header.lstrip())
+    return (declaration.group() if declaration else b'') + b'<chunk' + b''.join(NAMESPACE.findall(header)) + b'>'
+
+
+def split(buffer, chunk_size=CHUNK_SIZE):
+    """
+    Return (prolog, ranges) to parse the track points of buffer in chunks,
+    None if the file can't be split, see track_range().
+
+    ranges (list) -- (start, end) byte ranges, each one begins with <trkpt and
+                     ends after a point, in the order of the file.
+    """
+    track = track_range(buffer)
+    if track is None:
+        return None
+
+    prolog, start, end = track
+    ranges = []
+
+    while start < end:
+        boundary = find_open(buffer, start + chunk_size) if start + chunk_size < end else -1
+        if boundary < 0 or boundary >= end:
+            ranges.append((start, end))
+            break
+        ranges.append((start, end_of_points(buffer, start, boundary)))
+        start = boundary
+
+    return prolog, ranges
+
+
+def points(buffer, start, end):
+    """Yield the bytes of every <trkpt> element in the range."""
+    for match in TRKPT.finditer(buffer, start, end):
+        yield match.group()
+
+
+def end_of_points(buffer, start, end=None):
+    """
+    Return position after the last complete point in buffer[start:end], that is
+    the last </trkpt> or a following self-closing <trkpt .../>, -1 if not found.
+    """
+    end = len(buffer) if end is None else end
+    close = buffer.rfind(TRKPT_CLOSE, start, end)
+    position = close + len(TRKPT_CLOSE) if close >= 0 else -1
+    for match in SELF_CLOSING.finditer(buffer, max(start, position), end):
+        position = match.end()
+    return position
+
+
+def is_closed(buffer, start):
+    """Return True if the root element is closed after start (</gpx>), that is the file is complete."""
+    return GPX_CLOSE.search(buffer, start) is not None
+
+
+def find_first(buffer):
+    """
+    Return position of the first <trkpt tag, -1 if not found. The comments, CDATA
+    and declarations (eg. <!DOCTYPE gpx>) before it are skipped, eg. a point
+    commented out in <metadata> isn't the first one. -1 also if one of them
+    isn't closed or is a declaration with an internal subset ([...]).
+    """
+    position = 0
+    while True:
+        point = find_open(buffer, position)
+        if point < 0:
+            return -1
+
+        markup = buffer.find(b'<!', position, point)
+        if markup < 0:
+            return point
+
+        if buffer[markup:markup + 4] == b'<!--':
+            close = b'-->'
+        elif buffer[markup:markup + 9] == b'<![CDATA[':
+            close = b']]>'
+        else:
+            close = b'>'
+        end = buffer.find(close, markup + 2)
+        if end < 0 or close == b'>' and buffer.find(b'[', markup, end) >= 0:
+            return -1
+        position = end + len(close)
+
+
+def find_open(buffer, start):
+    """Return position of the next <trkpt tag (not eg. <trkpts), -1 if not found."""
+    position = buffer.find(TRKPT_OPEN, start)
+    while position >= 0 and buffer[position + len(TRKPT_OPEN):position + len(TRKPT_OPEN) + 1] not in (b' ', b'\t', b'\r', b'\n', b'>', b'/'):
+        position = buffer.find(TRKPT_OPEN, position + 1)
+    return position
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: compression.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 8:41:19 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import io
+import os
+import bz2
+import gzip
+import lzma
+
+'''Compressed input files (eg. track.gpx.gz), decompressed while they are read.'''
+
+BUFFER_SIZE = 1 << 20
+
+#extension of the compressed files and module reading them
+MODULES = {'.gz': gzip, '.bz2': bz2, '.xz': lzma}
+
+
+def is_compressed(file):
+    """Return True if the extension of file is one of MODULES."""
+    return os.path.splitext(file)[1].lower() in MODULES
+
+
+def strip(file):
+    """Return file without the compression extension, eg. 'track.gpx.gz' -> 'track.gpx'"""
+    return os.path.splitext(file)[0] if is_compressed(file) else file
+
+
+def open_file(file):
+    """Return a binary file object of file with large buffered reads, decompressed if it's compressed."""
+    module = MODULES.get(os.path.splitext(file)[1].lower())
+    if module is None:
+        return open(file, 'rb', buffering=BUFFER_SIZE)
+    return io.BufferedReader(module.open(file, 'rb'), BUFFER_SIZE)
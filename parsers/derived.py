@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: derived.py
+# Project: gpx2cvs
+# Created Date: Monday, October 19th 2026, 1:12:45 am
+# Author: Fabio Zito
+# -----
+# Last Modified: Mon Oct 19 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+try:
+    import numpy
+except ImportError: #numpy is optional, without it the points are computed one by one
+    numpy = None
+
+import math
+from array import array
+from . import stopover, timestamp
+
+'''Metrics derived from the positions and times of a track: distance, speed and bearing.'''
+
+#names of the derived columns, each one from the previous point to a point
+COLUMNS = ['distance', 'total_distance', 'computed_speed', 'bearing', 'time_delta']
+SCALE = 1000 #values are rounded to 3 decimals in the same way (half to even of value * SCALE), numpy and the plain loop give the same text
+
+EARTH_RADIUS = stopover.EARTH_RADIUS * 1000 #meters
+KMH = 3.6 #m/s to km/h
+
+
+def compute(track):
+    """
+    Return the derived columns of a track, a dictonary of name and array of float64
+    (NaN where a value can't be computed):
+        -> distance (meters)       -- great-circle distance from the previous point
+        -> total_distance (meters) -- distance from the first point along the track
+        -> computed_speed (km/h)   -- distance / time_delta
+        -> bearing (degrees)       -- initial bearing from the previous point, 0 is north
+        -> time_delta (seconds)    -- time from the previous point
+    The first point has just total_distance (0), a point without position or time
+    has none of the values depending on it, total_distance goes on without it.
+
+    track (TrackPoints) -- parsed points.
+    """
+    size = len(track)
+    missing = track.exceptions['epoch'] #points without time
+
+    if numpy is not None:
+        latitude = numpy.radians(numpy.frombuffer(track.column('latitude'), dtype=numpy.float64)[:size])
+        longitude = numpy.radians(numpy.frombuffer(track.column('longitude'), dtype=numpy.float64)[:size])
+        seconds = numpy.frombuffer(track.column('epoch'), dtype=numpy.int64)[:size] / timestamp.MICROSECONDS_IN_SECOND
+        seconds[list(missing)] = numpy.nan
+
+        with numpy.errstate(invalid='ignore', divide='ignore'):
+            values = _arrays(latitude, longitude, seconds)
+        return {name: _array(values[name].tobytes()) for name in COLUMNS}
+
+    latitude = [math.radians(value) for value in track.column('latitude')]
+    longitude = [math.radians(value) for value in track.column('longitude')]
+    seconds = [timestamp.to_seconds(value) if index not in missing else math.nan for index, value in enumerate(track.column('epoch'))]
+    values = {name: array('d') for name in COLUMNS}
+
+    total = 0.0
+    for index in range(size):
+        if index == 0:
+            point = [math.nan, 0.0, math.nan, math.nan, math.nan]
+        else:
+            point = _segment(latitude[index - 1], longitude[index - 1], seconds[index - 1], latitude[index], longitude[index], seconds[index])
+            if not math.isnan(point[0]):
+                total += point[0]
+            point[1] = total
+        for name, value in zip(COLUMNS, point):
+            values[name].append(round(value * SCALE) / SCALE if not math.isnan(value) else value)
+    return values
+
+
+def _arrays(latitude, longitude, seconds):
+    """Return the derived columns (numpy arrays) of the points in radians and seconds, as _segment() for all the segments."""
+    latitude1, latitude2 = latitude[:-1], latitude[1:]
+    delta_latitude, delta_longitude = numpy.diff(latitude), numpy.diff(longitude)
+
+    a = numpy.sin(delta_latitude / 2) ** 2 + numpy.cos(latitude1) * numpy.cos(latitude2) * numpy.sin(delta_longitude / 2) ** 2
+    distance = 2 * EARTH_RADIUS * numpy.arcsin(numpy.sqrt(a))
+
+    y = numpy.sin(delta_longitude) * numpy.cos(latitude2)
+    x = numpy.cos(latitude1) * numpy.sin(latitude2) - numpy.sin(latitude1) * numpy.cos(latitude2) * numpy.cos(delta_longitude)
+    bearing = numpy.where(distance > 0, numpy.degrees(numpy.arctan2(y, x)) % 360, numpy.nan)
+
+    time_delta = numpy.diff(seconds)
+    computed_speed = numpy.where(time_delta > 0, distance / time_delta * KMH, numpy.nan)
+
+    total_distance = numpy.cumsum(numpy.where(numpy.isnan(distance), 0.0, distance))
+
+    first = numpy.array([numpy.nan]) if len(latitude) else numpy.array([])
+    values = {
+        'distance': distance, 'total_distance': total_distance, 'computed_speed': computed_speed,
+        'bearing': bearing, 'time_delta': time_delta
+    }
+    values = {name: numpy.concatenate((first, column)) for name, column in values.items()}
+    if len(latitude):
+        values['total_distance'][0] = 0.0
+    return {name: numpy.rint(column * SCALE) / SCALE for name, column in values.items()}
+
+
+def _segment(latitude1, longitude1, seconds1, latitude2, longitude2, seconds2):
+    """Return the derived values (list as COLUMNS, total_distance is NaN) of the segment between two points in radians and seconds."""
+    delta_latitude, delta_longitude = latitude2 - latitude1, longitude2 - longitude1
+
+    a = math.sin(delta_latitude / 2) ** 2 + math.cos(latitude1) * math.cos(latitude2) * math.sin(delta_longitude / 2) ** 2
+    distance = 2 * EARTH_RADIUS * math.asin(math.sqrt(a)) if not math.isnan(a) else math.nan
+
+    y = math.sin(delta_longitude) * math.cos(latitude2)
+    x = math.cos(latitude1) * math.sin(latitude2) - math.sin(latitude1) * math.cos(latitude2) * math.cos(delta_longitude)
+    bearing = math.degrees(math.atan2(y, x)) % 360 if distance > 0 else math.nan
+
+    time_delta = seconds2 - seconds1
+    computed_speed = distance / time_delta * KMH if time_delta > 0 else math.nan
+
+    return [distance, math.nan, computed_speed, bearing, time_delta]
+
+
+def _array(data):
+    values = array('d')
+    values.frombytes(data)
+    return values
@@ -36,11 +36,298 @@
 # ----------	---	----------------------------------------------------------
 ###### 
 
-import re
-import xml.dom.minidom
-from datetime import datetime
+import os
+import math
+import itertools
+import contextlib
+import collections
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ProcessPoolExecutor
+from . import timestamp, stopover, chunks, scanner, compression, pipeline
+from .simplify import Simplification
+from . import derived as derive
+from .trackpoints import TrackPoints, SPEED, EPOCH
+from .cache import TrackCache
 from config.global_settings import DEBUG
 
+CACHE_VERSION = 'gpx-1' #change it when the rows built from the points change
+
+#names of the default columns (see default_header in config/global_settings.py) and the tag each one is read from
+COLUMNS = ['latitude', 'longitude', 'time', 'date', 'hour', 'time_zone', 'speed', 'ele', 'sat', 'hdop']
+COLUMN_TAGS = {
+    'latitude': 'lat', 'longitude': 'lon', 'time': 'time', 'date': 'time', 'hour': 'time',
+    'time_zone': 'time', 'speed': 'speed', 'ele': 'ele', 'sat': 'sat', 'hdop': 'hdop'
+}
+SPLIT_COLUMNS = ('date', 'hour', 'time_zone') #parts of the time, see timestamp.split()
+EPOCH_KEY = '#epoch' #epoch of the time decoded by Selection.accept() in a point, not an xml name
+SELECT_TAGS = {'time'} #tags of the points read before the selection, with the lat/lon attributes
+
+
+def local_name(tag):
+    """Return tag name without namespace, eg. '{http://www.topografix.com/GPX/1/1}trkpt' -> 'trkpt'"""
+    return tag.rpartition('}')[2]
+
+
+def read_point(element, tags=None, point=None):
+    """
+    Return a dictionary with lat/lon attributes of a <trkpt> element and the
+    text of its tags, e.g. {'lat': ..., 'lon': ..., 'time': ..., 'speed': ...}.
+    Namespaces are ignored and, as in the DOM, the first tag with a name wins.
+
+    tags (set)         -- optional, just these tags are read.
+    point (dictonary)  -- optional, the point read before with other tags, the tags are added to it.
+    """
+    if point is None:
+        point = {'lat': element.get('lat'), 'lon': element.get('lon')}
+    for child in element.iter():
+        if child is not element:
+            name = local_name(child.tag)
+            if tags is None or name in tags:
+                point.setdefault(name, child.text)
+    return point
+
+
+def make_row(point):
+    """
+    Return the default row of a point followed by the epoch (microseconds) of its time.
+    The columns of missing tags are None (empty in the csv), for <time> the epoch too.
+    The epoch of a time that can't be decoded is None, as for a point without time.
+    The time of a point selected by Selection.accept() isn't decoded again.
+    """
+    latitude = point.get("lat")
+    longitude = point.get("lon")
+    time = point.get("time")
+    if time is None:
+        epoch, date, hour, time_zone = None, None, None, None
+    elif EPOCH_KEY in point:
+        epoch, (date, hour, time_zone) = point[EPOCH_KEY], timestamp.split(time)
+    else:
+        epoch, date, hour, time_zone = decode_time(time)
+    speed = _speed(point.get("speed"))
+    ele = point.get("ele")
+    sat = point.get("sat")
+    hdop = point.get("hdop")
+
+    #The standard output will be these rows which contain all fields
+    return [latitude, longitude, time, date, hour, time_zone, speed, ele, sat, hdop, epoch]
+
+
+def decode_time(time):
+    """Return timestamp.decode() of time, the epoch is None if it can't be decoded."""
+    try:
+        return timestamp.decode(time)
+    except ValueError:
+        return (None,) + timestamp.split(time)
+
+
+def position_vector(latitude, longitude):
+    """Return the unit vector of a position (text of lat/lon), None if it isn't a valid position."""
+    try:
+        latitude, longitude = float(latitude), float(longitude)
+    except (TypeError, ValueError):
+        return None
+    if not (math.isfinite(latitude) and math.isfinite(longitude)):
+        return None
+    return stopover.unit_vector(latitude, longitude)
+
+
+def point_tags(columns):
+    """Return the tags (set) read for columns (names of COLUMNS)."""
+    return {COLUMN_TAGS[name] for name in columns}
+
+
+def row_maker(columns):
+    """
+    Return a function making the row of a point with just columns (names of
+    COLUMNS) as make_row() does, without the epoch: the time is split only
+    for date, hour or time_zone and it's never decoded.
+    """
+    split = not set(columns).isdisjoint(SPLIT_COLUMNS)
+    getters = []
+
+    for name in columns:
+        if name in SPLIT_COLUMNS:
+            getters.append(lambda point, parts, index=SPLIT_COLUMNS.index(name): parts[index])
+        elif name == 'speed':
+            getters.append(lambda point, parts: _speed(point.get('speed')))
+        else:
+            getters.append(lambda point, parts, tag=COLUMN_TAGS[name]: point.get(tag))
+
+    def make(point):
+        time = point.get('time') if split else None
+        parts = timestamp.split(time) if time is not None else (None, None, None)
+        return [get(point, parts) for get in getters]
+
+    return make
+
+
+def _speed(text):
+    return int(text) if text is not None else None
+
+
+def parse_chunk(file, prolog, start, end, fast_scan=False, columns=None, selection=None):
+    """
+    Worker: return (rows, passed) of the <trkpt> elements in a byte range of the file, see chunks.split().
+    With columns (names of COLUMNS) the rows have just these columns, see row_maker().
+    With selection (Selection) just the selected points, passed is True if the points after the
+    time window have been reached (the next ranges have none to convert).
+    """
+    make = row_maker(columns) if columns is not None else make_row
+    tags = point_tags(columns) if columns is not None else None
+    if tags is not None and selection is not None:
+        tags |= selection.tags()
+    select = selection.accept if selection is not None else None
+
+    with chunks.open_mmap(file) as buffer:
+        if fast_scan:
+            points = scanner.points(buffer, prolog, start, end, tags, select)
+        else:
+            points = _pull_points(buffer, prolog, start, end, tags, select)
+
+        rows = [make(point) for point in points]
+
+    return rows, selection is not None and selection.passed
+
+
+def _pull_points(buffer, prolog, start, end, tags, select=None):
+    """Yield the points of a byte range parsed by the xml parser, see parse_chunk() and read_selected()."""
+    parser = ElementTree.XMLPullParser(events=('start', 'end'))
+    parser.feed(prolog)
+    root = next(parser.read_events())[1]
+
+    for point in chunks.points(buffer, start, end):
+        parser.feed(point)
+        for event, element in parser.read_events():
+            if event == 'end' and local_name(element.tag) == 'trkpt':
+                point = read_selected(element, tags, select)
+                del root[:]
+                if point is None:
+                    return
+                if point:
+                    yield point
+
+
+def read_selected(element, tags=None, select=None):
+    """
+    Return the point of a <trkpt> element as read_point(), with select (callable, see
+    Selection.accept()) the other tags are read just if lat/lon and <time> are selected:
+    an empty dictionary if the point isn't, None if the points after it aren't either.
+    """
+    if select is None:
+        return read_point(element, tags)
+
+    point = read_point(element, SELECT_TAGS)
+    selected = select(point)
+    if not selected:
+        return None if selected is None else {}
+    return read_point(element, tags, point)
+
+
+class Selection:
+    """
+    Time window and bounding box of the points to convert, a point out of them
+    is skipped after reading just its time and lat/lon, before reading its other
+    tags and making its row.
+    """
+
+    __slots__ = ('start', 'end', 'bbox', 'assume_sorted', 'passed')
+
+    def __init__(self, time_window=None, bbox=None, assume_sorted=False):
+        """
+        time_window (tuple)  -- epoch (microseconds) of the first and after the last time, a None is open
+        bbox (tuple)         -- min latitude, min longitude, max latitude and max longitude
+        assume_sorted (bool) -- the times of the points increase, the points after the
+                                window aren't read (self.passed is True when they're reached)
+        """
+        self.start, self.end = time_window or (None, None)
+        self.bbox = bbox
+        self.assume_sorted = assume_sorted
+        self.passed = False
+
+    def tags(self):
+        """Return the tags (set) read by accept()."""
+        return {'time'} if self.start is not None or self.end is not None else set()
+
+    def key(self):
+        """Return the text of the selection, eg. for the cache key of the selected points."""
+        return f'{self.start}-{self.end}-{self.bbox}-{self.assume_sorted}'
+
+    def accept(self, point):
+        """
+        Return True if the point (dictonary with lat/lon and time, see read_point()) is in the
+        window and in the box, False if it isn't (a point without time, with a time that can't
+        be decoded or without position isn't) and
+        None if the next points aren't either (sorted points after the window, self.passed is True).
+        The epoch of the time is kept in point[EPOCH_KEY], so make_row() doesn't decode it again.
+        """
+        if self.start is not None or self.end is not None:
+            time = point.get('time')
+            if time is None:
+                return False
+            epoch = point[EPOCH_KEY] = decode_time(time)[0]
+            if epoch is None:
+                return False
+
+            if self.end is not None and epoch >= self.end:
+                if self.assume_sorted:
+                    self.passed = True
+                    return None
+                return False
+
+            if self.start is not None and epoch < self.start:
+                return False
+
+        if self.bbox is not None:
+            try:
+                latitude, longitude = float(point['lat']), float(point['lon'])
+            except (TypeError, ValueError):
+                return False
+            min_latitude, min_longitude, max_latitude, max_longitude = self.bbox
+            if not (min_latitude <= latitude <= max_latitude and min_longitude <= longitude <= max_longitude):
+                return False
+
+        return True
+
+
+def hold_last(rows, state):
+    """
+    Yield every row except the last one, which is kept in state['pending']
+    and yielded first if the rows go on in a next call (eg. follow mode).
+    """
+    pending = state.get('pending')
+    for row in rows:
+        if pending is not None:
+            yield pending
+        pending = state['pending'] = row
+
+
+class StopoverFilter:
+    """State of the stopover filter for one parameter set, see GPX.__filter_rows_from_time_speed_distance()."""
+
+    __slots__ = ('stopping_time', 'speed_range', 'distance_range', 'min_speed', 'max_speed',
+                 'min_chord', 'max_chord', 'start_time', 'canditate_row', 'anchor')
+
+    def __init__(self, stopping_time, speed_range=None, distance_range=None, state=None):
+        """state (dictonary) -- optional, the filter goes on from a previous run (see state())."""
+        self.stopping_time = stopping_time
+        self.speed_range = speed_range
+        self.distance_range = distance_range
+
+        if speed_range is not None:
+            self.min_speed, self.max_speed = speed_range
+
+        if distance_range is not None:
+            self.min_chord, self.max_chord = stopover.chord_range(distance_range)
+
+        state = state or {}
+        self.start_time = state.get('start_time', 0)
+        self.canditate_row = state.get('canditate_row')
+        self.anchor = state.get('anchor')
+
+    def state(self):
+        """Return the stopover still open, to go on in a next run."""
+        return {'start_time': self.start_time, 'canditate_row': self.canditate_row, 'anchor': self.anchor}
+
 
 class GPX:
     """Parse gpx file."""
@@ -51,22 +338,94 @@ class GPX:
         The result is stored in self.result with the default columns:
         [latitude, longitude, time, date, hour, time_zone, speed, ele, sat, hdop]
 
-
-        doc (XML DOM) -- document parsed from xml.dom.minidom.
+        The file is read with an incremental parser (iterparse), each <trkpt>
+        is handled when it closes and then released, so memory doesn't grow
+        with the number of points.
+        self.result['rows'] is an iterator: rows are produced while the output
+        consumes them, they are never collected in a list.
+        When a filter is used the points are also stored in self.result['track']
+        (TrackPoints, a compact columnar store) while the filter consumes them:
+        the stopovers are found on chunks of the track (see stopover.stream()),
+        the parsing goes on while the output pulls the rows. The track is complete
+        when the rows end (eg. it's the output when there isn't any stopover).
+        A plain conversion to csv with fast-scan has self.result['lines'] too: the
+        csv lines copied from the file, see __csv_lines().
+
+        file (string) -- gpx file to parse, None with options['rows'].
 
         options (dictonary) -- is a list of user choices to parse element.
             -> stopping-time (int)    -- possible value in seconds eg. 600
             -> speed-range (tuple)    -- min and max value in km/h eg. (0, 5)
             -> distance-range (tuple) -- min and max value in km eg. (0, 5)
             -> output-type (string)   -- format that parsing results are saved (default csv) 
+            -> parse-workers (int)    -- number of processes parsing chunks of a big file (default 1)
+            -> fast-scan (bool)       -- read flat track points with byte patterns instead of
+                                         the xml parser (see parsers/scanner.py)
+            -> checkpoint (dictonary) -- follow mode, parse just the points appended after
+                                         the checkpoint of the previous run and update it
+                                         (see jobs/follow.py). With a filter the output is always
+                                         the stopovers, without any stopover it has just the header
+                                         instead of all the points: the rows already appended can't
+                                         be changed when the stopovers come
+            -> cache-dir (string)     -- directory of the parsed tracks, a file parsed before is
+                                         read from there (see parsers/cache.py)
+            -> cache-size (int)       -- size of the cache in MB (default 1024)
+            -> sweep (list)           -- parameter sets of the filter evaluated on the same track,
+                                         each one a dictonary with stopping-time, speed-range
+                                         and/or distance-range (see jobs/sweep.py)
+            -> sweep-output (string)  -- separate (default) a result for each parameter set in
+                                         self.result['sweep'], combined the stopovers of all the
+                                         sets tagged with their parameters
+            -> metrics (Metrics)      -- optional, time of the stages and counters of points and
+                                         stopovers (see parsers/metrics.py)
+            -> pipeline (bool)        -- the xml is read in a thread and the rows are produced
+                                         in another one while the output writes the previous
+                                         ones (see parsers/pipeline.py)
+            -> time-window (tuple)    -- epoch (microseconds) of the first time and after the last
+                                         one of the points converted, a None is open (see Selection)
+            -> bbox (tuple)           -- min latitude, min longitude, max latitude, max longitude
+                                         of the points converted
+            -> assume-sorted (bool)   -- the times increase, the file isn't read after the time window
+            -> columns (list)         -- names of the default columns of the result in their order
+                                         (see COLUMNS, each one once), the tags of the others aren't read when the points go
+                                         straight to the output. self.result['columns'] are their
+                                         positions in the default columns
+            -> simplify (tuple)       -- method and tolerance of the simplification of the default
+                                         output (see parsers/simplify.py), eg. ('min-distance', 10).
+                                         Not in follow mode nor with sweep. self.result['simplification']
+                                         (Simplification) counts the points kept, there isn't
+                                         self.result['track'] as it has all of them
+            -> derived (bool)         -- the default output has the derived columns too (distance,
+                                         speed, bearing... see parsers/derived.py), computed on the
+                                         track in self.result['derived']. The filter uses their
+                                         computed_speed for the points without <speed>. Not in
+                                         follow mode nor with simplify
+            -> keep-epoch (bool)      -- the default rows are followed by the epoch with the csv
+                                         output too, as for the typed outputs
+            -> rows (iterable)        -- default rows followed by the epoch, converted instead of
+                                         the points of file (eg. merged from many files, see
+                                         jobs/merge.py). Not in follow mode nor with cache-dir
         """
         self.result = {'parser-type':'gpx'}
+        self.parse_workers = options.get('parse-workers') or 1
+        self.fast_scan = bool(options.get('fast-scan'))
+        #the typed outputs read the epoch of the default rows instead of decoding the time again
+        self.keep_epoch = options.get('output-type', 'csv') != 'csv' or bool(options.get('keep-epoch'))
+        self.rows = options.get('rows')
+        self.metrics = options.get('metrics')
+        self.pipelined = bool(options.get('pipeline'))
+        self.selection = None
+        if options.get('time-window') is not None or options.get('bbox') is not None:
+            self.selection = Selection(options.get('time-window'), options.get('bbox'), bool(options.get('assume-sorted')))
+        columns = options.get('columns')
+        self.columns = list(columns) if columns else None
+        self.simplification = None
+        if options.get('simplify') and options.get('checkpoint') is None and not options.get('sweep'):
+            self.simplification = Simplification(*options['simplify'])
+        self.derived = bool(options.get('derived')) and options.get('checkpoint') is None and self.simplification is None
 
-        doc = xml.dom.minidom.parse(file)
-        points = doc.getElementsByTagName("trkpt")
-        
         output_type = 'default'
-        rows = []
+        rows = self.__iter_default_rows(file)
     
         stopping_time = None
         speed_range = None
@@ -84,127 +443,538 @@ class GPX:
             if options.get('distance-range'):
                 distance_range = options.get('distance-range')
 
-        for point in points:
-            row = None
-            latitude = point.getAttribute("lat")
-            longitude = point.getAttribute("lon")
-            time = point.getElementsByTagName("time")[0].firstChild.nodeValue
-            date = re.match(r'^(.*)T', time).group(1)
-            hour = re.match(r'.*T(.*)\.', time).group(1)
-            time_zone = re.match(r'.*\.(.*)$', time).group(1)
-            speed = int(point.getElementsByTagName("speed")[0].firstChild.nodeValue)
-            ele = point.getElementsByTagName("ele")[0].firstChild.nodeValue
-            sat = point.getElementsByTagName("sat")[0].firstChild.nodeValue
-            hdop = point.getElementsByTagName("hdop")[0].firstChild.nodeValue
-
-            #The standard output will be these rows which contain all fields
-            rows.append([latitude, longitude, time, date, hour, time_zone, speed, ele, sat, hdop]) 
-
-        if stopping_time is not None and speed_range is not None:
-
-            filter_rows = self.__filter_rows_from_time_speed_distance(rows, stopping_time, speed_range, distance_range)
-            if len(filter_rows) > 0: #The new output will be the filtered rows
-                rows.clear()
-                rows = filter_rows.copy()
-                filter_rows.clear()
+        checkpoint = options.get('checkpoint')
+        filtering = stopping_time is not None and (speed_range is not None or distance_range is not None)
+        cache = TrackCache(options['cache-dir'], options.get('cache-size')) if options.get('cache-dir') else None
+        sweep = options.get('sweep')
+
+        if checkpoint is not None: #follow mode, the rows are the new ones since the last run
+            projection = None if filtering else self.columns
+            if projection is None and not filtering and not self.keep_epoch:
+                projection = COLUMNS #the epoch isn't written, the time is just split
+            rows = self.__timed('parse', self.__iter_new_rows(file, checkpoint, projection), 'points')
+
+            if filtering:
+                rows = self.__filter_rows_from_time_speed_distance(rows, stopping_time, speed_range, distance_range, checkpoint.setdefault('stopover', {}),
+                                                                   closed=lambda: checkpoint.get('closed', False))
+                rows = self.__timed('filter', rows, 'stopovers')
                 output_type = 'filtered'
+
+        elif filtering or sweep or cache is not None or self.derived:
+
+            parsed_rows = None
+            if cache is not None: #the track is read from the cache, parsed and saved there on a miss
+                track = self.__cached_track(file, cache)
+                track_rows = track.iter_rows(epoch=True)
+            elif self.derived or sweep and stopover.available(): #the derived columns and the vectorized sweep need all the points
+                with self.__stage('track'):
+                    track = TrackPoints(self.__iter_rows(file))
+                track_rows = None
+            else: #the points are stored while the filter consumes them
+                track = TrackPoints()
+                parsed_rows = self.__iter_rows(file)
+                track_rows = track.collect(parsed_rows)
+
+            self.result['track'] = track
+            rows = iter(track)
+
+            speeds = None
+            if self.derived:
+                with self.__stage('derive'):
+                    derived_columns = self.result['derived'] = derive.compute(track)
+                #the filter reads the computed speed of the points without <speed>
+                speeds = derived_columns['computed_speed']
+                track_rows = self.__with_speeds(track.iter_rows(epoch=True), speeds)
+
+            if sweep:
+                with self.__stage('filter'):
+                    sweep_stopovers = self.__sweep(track, track_rows, sweep, speeds)
+                if self.metrics is not None:
+                    self.metrics.count('stopovers', sum(map(len, sweep_stopovers)))
+
+                if options.get('sweep-output') == 'combined':
+                    rows = self.__combined_rows(sweep, sweep_stopovers)
+                    output_type = 'sweep'
+                else:
+                    self.result['sweep'] = [
+                        (parameters, self.__sweep_result(track, stopovers, self.columns))
+                        for parameters, stopovers in zip(sweep, sweep_stopovers)
+                    ]
+
+            elif filtering:
+                if stopover.available() and parsed_rows is not None: #vectorized detection on chunks of the track while it's stored
+                    filter_rows = self.__stopover_rows(track, stopover.stream(track, parsed_rows, stopping_time, speed_range, distance_range))
+                elif stopover.available(): #vectorized detection on the columns of the track
+                    with self.__stage('filter'):
+                        stopovers = stopover.detect(track, stopping_time, speed_range, distance_range, speeds)
+                    filter_rows = self.__stopover_rows(track, stopovers)
+                else:
+                    filter_rows = self.__filter_rows_from_time_speed_distance(track_rows, stopping_time, speed_range, distance_range)
+
+                filter_rows = self.__timed('filter', filter_rows, 'stopovers')
+
+                first_row = next(filter_rows, None)
+
+                if first_row is not None: #The new output will be the filtered rows
+                    rows = itertools.chain([first_row], filter_rows)
+                    output_type = 'filtered'
+                else: #No stopover found, the output will be all rows stored in the track
+                    rows = iter(track)
+
+            if self.simplification is not None and output_type == 'default': #the outputs mustn't read all the points in the track
+                rows = self.__simplified(track.iter_rows(epoch=True), track)
+                del self.result['track']
+            elif self.columns is not None and output_type == 'default': #the track has all the columns
+                rows = self.__project(rows, self.columns)
+
+            if self.derived and output_type == 'default' and not self.keep_epoch:
+                #the typed outputs take the derived columns from self.result['derived']
+                rows = self.__derived_rows(rows, derived_columns)
+
+        elif self.fast_scan and self.parse_workers == 1 and not self.keep_epoch and len(self.columns or COLUMNS) > 1 \
+                and self.selection is None and self.simplification is None and self.rows is None:
+            #plain conversion to csv, the values are copied from the file to the csv lines
+            self.result['lines'] = self.__timed('parse', self.__csv_lines(file, self.columns or COLUMNS))
+
+        if self.columns is not None:
+            self.result['columns'] = [COLUMNS.index(name) for name in self.columns]
+
+        if self.simplification is not None and output_type == 'default':
+            self.result['simplification'] = self.simplification
+
+        if self.pipelined: #the rows are produced in a thread while the output writes them
+            rows = pipeline.prefetch(rows)
+            if 'lines' in self.result:
+                self.result['lines'] = pipeline.prefetch(self.result['lines'], batch_size=1)
         
         self.result['output_type'] = output_type
         self.result['rows'] = rows
 
-           
-    def __filter_rows_from_time_speed_distance(self, rows, stopping_time, speed_range, distance_range):
+
+    def __cached_track(self, file, cache):
+        """Return the track of file from the cache, parsing and saving it if it isn't there."""
+        with self.__stage('cache'):
+            #the track has just the points selected
+            key = cache.key(file, CACHE_VERSION + (self.selection.key() if self.selection is not None else ''))
+            track = cache.get(key)
+
+        if track is None:
+            with self.__stage('track'):
+                track = TrackPoints(self.__iter_rows(file))
+            with self.__stage('cache'):
+                cache.put(key, track)
+        return track
+
+    def __stage(self, name):
+        """Return the context manager measuring a stage, see parsers/metrics.py."""
+        return self.metrics.stage(name) if self.metrics is not None else contextlib.nullcontext()
+
+    def __timed(self, name, rows, counter=None):
+        """Return rows, measured as a stage if there are metrics."""
+        return self.metrics.timed(name, rows, counter) if self.metrics is not None else rows
+
+    def __csv_lines(self, file, columns):
+        """
+        Yield the csv lines of columns copied from the file as blocks of bytes (see
+        scanner.csv_lines()), the points that can't be copied are yielded as rows.
+        If the scanner can't read the file all the points are yielded as rows.
         """
-        In version 1.0 filtered just from stopping_time and speed_range. 
-        An algorithm has not yet been defined for the distance_range.
+        if not compression.is_compressed(file) and os.path.getsize(file):
+            with chunks.open_mmap(file) as buffer:
+                track = scanner.track_range(buffer)
+                if track is not None:
+                    make = row_maker(columns)
+                    fields = [SPLIT_COLUMNS.index(name) if name in SPLIT_COLUMNS else COLUMN_TAGS[name] for name in columns]
+                    for lines in scanner.csv_lines(buffer, *track, fields, {'speed'}):
+                        if not isinstance(lines, bytes):
+                            lines = make(lines)
+                        if self.metrics is not None: #the lines are the rows of the output too
+                            points = lines.count(b'\n') if isinstance(lines, bytes) else 1
+                            self.metrics.count('points', points)
+                            self.metrics.count('rows', points)
+                        yield lines
+                    return
+
+        for row in self.__iter_default_rows(file):
+            if self.metrics is not None:
+                self.metrics.count('rows')
+            yield row
+
+    def __tags(self, columns):
+        """Return the tags read for columns and the selection, None (all) without columns."""
+        if columns is None:
+            return None
+        return point_tags(columns) | (self.selection.tags() if self.selection is not None else set())
+
+    def __select(self):
+        """Return the function selecting the points (see Selection.accept()), None without selection."""
+        return self.selection.accept if self.selection is not None else None
+
+    def __project(self, rows, columns):
+        """Yield the default rows with just columns (names of COLUMNS)."""
+        positions = [COLUMNS.index(name) for name in columns]
+        for row in rows:
+            yield [row[position] for position in positions]
+
+    def __iter_default_rows(self, file):
+        """
+        Yield the default rows without the cached epoch (with it for the typed outputs),
+        with self.columns just these columns read from the points (see row_maker()).
+        Without the epoch the time is just split, it's never decoded.
+        """
+        if self.simplification is not None:
+            return self.__simplified(self.__iter_rows(file))
+        if self.columns is not None:
+            return self.__iter_rows(file, self.columns)
+        if self.keep_epoch:
+            return self.__iter_rows(file)
+        return self.__iter_rows(file, COLUMNS)
+
+    def __simplified(self, rows, track=None):
+        """
+        Yield the default rows (with the cached epoch) kept by the simplification,
+        as __iter_default_rows() yields them. track (TrackPoints) -- optional, of the rows.
+        """
+        rows = self.__timed('simplify', self.simplification.rows(rows, track), 'kept')
+        if not self.keep_epoch:
+            rows = self.__strip_epoch(rows)
+        if self.columns is not None:
+            rows = self.__project(rows, self.columns)
+        return rows
+
+    def __derived_rows(self, rows, derived_columns):
+        """Yield the rows of the track followed by their derived columns, None where they are NaN."""
+        values = [derived_columns[name] for name in derive.COLUMNS]
+        for row, *derived_values in zip(rows, *values):
+            row.extend(value if value == value else None for value in derived_values)
+            yield row
+
+    def __with_speeds(self, rows, speeds):
+        """Yield the rows of the track, the points without <speed> with their speed in speeds (None if NaN)."""
+        for row, speed in zip(rows, speeds):
+            if row[SPEED] is None and speed == speed:
+                row[SPEED] = speed
+            yield row
+
+    def __strip_epoch(self, rows):
+        for row in rows:
+            del row[EPOCH:]
+            yield row
+
+    def __iter_new_rows(self, file, checkpoint, columns=None):
+        """
+        Yield the rows of the <trkpt> elements after checkpoint['offset'] (the
+        first point if there isn't) and at the end move the offset after the last
+        complete point. The file is growing, so the closing tags may be missing:
+        checkpoint['closed'] is True when they have been written (the track ended).
+        With columns the rows have just these columns, see row_maker().
+        """
+        make = row_maker(columns) if columns is not None else make_row
+        tags = self.__tags(columns)
+        checkpoint['closed'] = False
 
-        The result is stored in self.rows with the filter columns:
+        if compression.is_compressed(file):
+            raise ValueError('compressed files can not be followed')
+
+        if not os.path.getsize(file):
+            return
+
+        with chunks.open_mmap(file) as buffer:
+            first = chunks.find_first(buffer)
+            if first < 0:
+                return
+
+            start = checkpoint.setdefault('offset', first)
+            end = chunks.end_of_points(buffer, start)
+            checkpoint['closed'] = chunks.is_closed(buffer, max(start, end))
+            if end < 0:
+                return
+
+            if buffer.find(b'<!', start, end) >= 0:
+                raise ValueError('comments or CDATA between track points are not supported in follow mode')
+
+            for point in scanner.points(buffer, chunks.prolog(buffer, first), start, end, tags, self.__select()):
+                yield make(point)
+
+            checkpoint['offset'] = end
+
+    def __iter_rows(self, file, columns=None):
+        """Return the rows of __parse_rows(), measured as the parse stage if there are metrics."""
+        return self.__timed('parse', self.__parse_rows(file, columns), 'points')
+
+    def __parse_rows(self, file, columns=None):
+        """
+        Yield the default rows, one for each <trkpt>, followed by the epoch
+        (microseconds) of its time so the next stages don't decode it again.
+        With columns the rows have just these columns, see row_maker().
+        A compressed file is parsed while it's decompressed, by a single process.
+        With self.rows these rows are yielded instead, with columns just these columns.
+        """
+        if self.rows is not None:
+            if columns is not None:
+                yield from self.__project(self.rows, columns)
+            else:
+                yield from self.rows
+            return
+
+        if self.parse_workers > 1 and not compression.is_compressed(file) and os.path.getsize(file):
+            with chunks.open_mmap(file) as buffer:
+                split = chunks.split(buffer) if not self.fast_scan or scanner.track_range(buffer) else None
+
+            if split is not None and len(split[1]) > 1:
+                yield from self.__iter_rows_parallel(file, *split, columns)
+                return
+
+        make = row_maker(columns) if columns is not None else make_row
+        for point in self.__iter_points(file, self.__tags(columns), self.__select()):
+            yield make(point)
+
+    def __iter_rows_parallel(self, file, prolog, ranges, columns=None):
+        """
+        Yield the rows of the byte ranges parsed by a pool of processes.
+        Chunks are yielded in the order of the file, so the next stages (eg. the
+        stopover filter) see the same sequence of rows of a serial parsing and
+        a stopover across two chunks isn't split.
+        At most two chunks for worker are parsed ahead of the consumer.
+        With a sorted selection the chunks after the time window aren't parsed.
+        """
+        with ProcessPoolExecutor(max_workers=self.parse_workers) as executor:
+            pending = collections.deque()
+            ranges = iter(ranges)
+
+            for start, end in itertools.islice(ranges, 2 * self.parse_workers):
+                pending.append(executor.submit(parse_chunk, file, prolog, start, end, self.fast_scan, columns, self.selection))
+
+            while pending:
+                rows, passed = pending.popleft().result()
+                if passed:
+                    for future in pending:
+                        future.cancel()
+                    yield from rows
+                    return
+
+                for start, end in itertools.islice(ranges, 1):
+                    pending.append(executor.submit(parse_chunk, file, prolog, start, end, self.fast_scan, columns, self.selection))
+                yield from rows
+
+    def __iter_points(self, file, tags=None, select=None):
+        """
+        Yield a dictionary for each <trkpt>, see read_point(), with tags just these tags.
+        With select (see Selection.accept()) just the points selected, see read_selected().
+        With fast-scan the points are read by the scanner if the file is suitable
+        (not compressed, the scanner needs the whole file mapped in memory).
+
+        Every <trkpt> is cleared and detached from its parent as soon as it has
+        been read, so the tree never holds more than one point.
+        """
+        if self.fast_scan and not compression.is_compressed(file) and os.path.getsize(file):
+            with chunks.open_mmap(file) as buffer:
+                track = scanner.track_range(buffer)
+                if track is not None:
+                    yield from scanner.points(buffer, *track, tags, select)
+                    return
+
+        parents = []
+
+        source = compression.open_file(file)
+        if self.pipelined: #the file is read (and decompressed) in a thread while the points are parsed
+            source = pipeline.ReadAhead(source)
+
+        with source:
+            for event, element in ElementTree.iterparse(source, events=('start', 'end')):
+                if event == 'start':
+                    parents.append(element)
+                    continue
+
+                parents.pop()
+
+                if local_name(element.tag) != 'trkpt':
+                    continue
+
+                point = read_selected(element, tags, select)
+
+                element.clear()
+                if len(parents):
+                    del parents[-1][:] #drop the closed points from <trkseg>
+
+                if point is None:
+                    return
+                if point:
+                    yield point
+
+    def __stopover_rows(self, track, stopovers):
+        """Yield the filter columns of stopovers found by stopover.detect()."""
+        for start, end, minutes in stopovers:
+            start_row, end_row = track.row(start), track.row(end)
+            yield [start_row[0], start_row[1], start_row[3], start_row[4],
+                   end_row[0], end_row[1], end_row[3], end_row[4], minutes]
+
+    def __sweep(self, track, track_rows, parameter_sets, speeds=None):
+        """
+        Return the stopovers (list of filter rows) found with each parameter set.
+        Without numpy all the sets are evaluated in a single traversal of the rows.
+        speeds -- optional, the speeds of the points without <speed>, see stopover.detect().
+        """
+        if stopover.available():
+            return [
+                list(self.__stopover_rows(track, stopover.detect(track, parameters['stopping-time'], parameters.get('speed-range'), parameters.get('distance-range'), speeds)))
+                for parameters in parameter_sets
+            ]
+
+        filters = [StopoverFilter(parameters['stopping-time'], parameters.get('speed-range'), parameters.get('distance-range')) for parameters in parameter_sets]
+        stopovers = [[] for parameters in parameter_sets]
+        for index, row in self.__sweep_rows(track_rows, filters):
+            stopovers[index].append(row)
+        return stopovers
+
+    def __sweep_result(self, track, stopovers, columns=None):
+        """Return the result of one parameter set, as for a single filter all the rows if there isn't any stopover."""
+        if stopovers:
+            return {'parser-type': 'gpx', 'output_type': 'filtered', 'rows': iter(stopovers)}
+        result = {'parser-type': 'gpx', 'output_type': 'default', 'rows': iter(track)}
+        if columns is not None:
+            result['rows'] = self.__project(track, columns)
+            result['columns'] = [COLUMNS.index(name) for name in columns]
+        if self.derived:
+            result['derived'] = self.result['derived']
+            if not self.keep_epoch:
+                result['rows'] = self.__derived_rows(result['rows'], result['derived'])
+        return result
+
+    def __combined_rows(self, parameter_sets, stopovers):
+        """Yield the stopovers of all the parameter sets, each one preceded by the parameters."""
+        for parameters, rows in zip(parameter_sets, stopovers):
+            speed_range = parameters.get('speed-range') or ('', '')
+            distance_range = parameters.get('distance-range') or ('', '')
+            tag = [parameters['stopping-time'], *speed_range, *distance_range]
+            for row in rows:
+                yield tag + row
+
+    def __filter_rows_from_time_speed_distance(self, rows, stopping_time, speed_range, distance_range, state=None, closed=None):
+        """
+        Filter from stopping_time and speed_range and/or distance_range.
+
+        This is a streaming stage: rows are consumed one by one and every
+        stopover is yielded as soon as it ends, with the filter columns:
         *       Start stopping info     *       End stopping info        *    
         *-------------------------------*--------------------------------*
         *                               *                                *
         [latitude, longitude, date, hour, latitude, longitude, date, hour, stopping_duration]
 
+        As in version 1.0 the last row of the track is never considered.
+        When numpy is installed stopover.detect() is used instead, this is the
+        reference implementation it must agree with.
+
+        rows (iterable)      -- default rows produced by the parser, with the cached epoch.
+
         stopping_time (int)  -- is the value (in seconds) of how long a 
                                 stopover should lasts for the vehicle or 
                                 the user to be considered unmoving, eg. 
                                 a car in the traffic makes many stops 
                                 (generally short) and therefore cannot 
                                 be considered parked.
-                                *You must use it together with the speed_range
+                                *You must use it together with the speed_range and/or distance_range
 
         speed_range (tuple)  -- is the value (in km/h) to consider the vehicle or the user
                                 unmoving. 
                                 *You must use it together with the stopping_time
         
-        distance_range (tuple) -- is the value (in km/h) to consider the vehicle or the user
-                               unmoving. 
-                               *#TO-DO an algorithm has not yet been defined for the distance_range
+        distance_range (tuple) -- is the value (in km) of the distance from the first point
+                                  of the stopover (anchor) to consider the vehicle or the user
+                                  unmoving, eg. (0, 0.05) the stopover lasts while the points
+                                  are within 50 meters from the anchor. The first point too
+                                  far from the anchor begins a new stopover.
+                                  Useful when the device doesn't report the speed correctly.
+                                  *You must use it together with the stopping_time
+
+        state (dictonary)    -- optional, the filter goes on from the state of a previous
+                                run (follow mode). At the end the last row and the stopover
+                                still open are kept in it instead of being yielded.
+
+        closed (callable)    -- optional with state, see __sweep_rows().
         """
 
-        find_it = False
-        start_time = 0
-        end_time = 0
-        canditate_row = None
-        seconds_in_minute = 60
-        filter_rows = []
+        stopover_filter = StopoverFilter(stopping_time, speed_range, distance_range, state)
 
-        min_speed, max_speed = speed_range
+        for index, row in self.__sweep_rows(rows, [stopover_filter], state, closed):
+            yield row
 
-        max_speed += 1 #Increment of 1 because range doesn't consider last value
+        if state is not None:
+            state.update(stopover_filter.state())
 
-        last_row = len(rows)
-        counter = 1
+    def __sweep_rows(self, rows, filters, state=None, closed=None):
+        """
+        Run the filters (StopoverFilter, one for each parameter set) in a single
+        traversal of the rows and yield (index of the filter, stopover) as soon
+        as each stopover ends. See __filter_rows_from_time_speed_distance().
+
+        state (dictonary) -- optional, the last row is kept in it and the stopovers
+                             still open aren't yielded (follow mode).
+        closed (callable) -- optional with state, called when the rows end: if it returns
+                             True the track is complete and the stopovers still open are
+                             yielded as without state (and not kept for a next run).
+        """
+        final = state is None
+        if final:
+            state = {}
 
-        for row in rows:
+        seconds_in_minute = 60
+
+        for row in hold_last(rows, state):
 
             latitude  = row[0]
             longitude = row[1]
-            time      = row[2]
             date      = row[3]
             hour      = row[4]
             speed     = row[6]
-            
-            format_date = datetime.strptime(time, '%Y-%m-%dT%H:%M:%S.%f%z')
-
-            if speed in range(min_speed, max_speed) and find_it == False:
-                find_it = True
-            elif speed not in range(min_speed, max_speed) and find_it == True:
-                find_it = False
-
-            if find_it == True:
-                if start_time == 0:
-                    start_time = format_date.timestamp() #Convert time in unix epoch
-                    canditate_row = [latitude, longitude, date, hour] #fields correspond to begin of stopover
-
-                end_time = format_date.timestamp()
-                seconds = end_time - start_time
-
-                if seconds >= stopping_time:
-                    minutes = seconds / seconds_in_minute
-                    seconds = seconds - (minutes * seconds_in_minute)
-                    stopping_duration = f"{minutes}:{seconds}"
-                    del canditate_row[4:] #remove all element affter the first four 
-                    canditate_row.extend([latitude, longitude, date, hour, round(minutes)]) #fields correspond to the end of stopover
-            else:
-                start_time = 0
-                end_time = 0
-
-                if len(canditate_row) > 4:
-                    filter_rows.append(canditate_row.copy())
-                    canditate_row.clear()
-
-            counter += 1
-
-            if last_row == counter:
-                if len(canditate_row) > 4:
-                    filter_rows.append(canditate_row.copy())
-                    canditate_row.clear()
-
-
-        if distance_range is not None:
-            pass #TO-DO Define how to implement the distance filter
-
-        return filter_rows
+            epoch     = None
+            position  = None
+            located   = None #the position is read just with a distance range
+            timed     = row[EPOCH] is not None #points without time are never unmoving
+
+            for index, f in enumerate(filters):
+
+                unmoving = timed and (f.speed_range is None or speed is not None and f.min_speed <= speed <= f.max_speed)
+                if unmoving and f.distance_range is not None:
+                    if located is None:
+                        position = position_vector(latitude, longitude)
+                        located = position is not None
+                    unmoving = located #points without position are never unmoving with a distance range
+
+                if unmoving:
+
+                    if f.distance_range is not None:
+                        #too far from anchor, a new stopover begins here
+                        if f.canditate_row is not None and not f.min_chord <= stopover.squared_chord(f.anchor, position) <= f.max_chord:
+                            if len(f.canditate_row) > 4:
+                                yield index, f.canditate_row
+                            f.canditate_row = None
+
+                    if epoch is None:
+                        epoch = timestamp.to_seconds(row[EPOCH])
+
+                    if f.canditate_row is None:
+                        f.start_time = epoch
+                        f.anchor = position
+                        f.canditate_row = [latitude, longitude, date, hour] #fields correspond to begin of stopover
+
+                    seconds = epoch - f.start_time
+
+                    if seconds >= f.stopping_time:
+                        minutes = seconds / seconds_in_minute
+                        del f.canditate_row[4:] #remove all element affter the first four 
+                        f.canditate_row.extend([latitude, longitude, date, hour, round(minutes)]) #fields correspond to the end of stopover
+
+                elif f.canditate_row is not None:
+                    if len(f.canditate_row) > 4:
+                        yield index, f.canditate_row
+                    f.canditate_row = None
+
+        if final or closed is not None and closed():
+            for index, f in enumerate(filters):
+                if f.canditate_row is not None and len(f.canditate_row) > 4:
+                    yield index, f.canditate_row
+                f.canditate_row = None
 
     def get_result(self):
-        return self.result
\ No newline at end of file
+        return self.result
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: metrics.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 11:46:09 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import sys
+import time
+import cProfile
+import threading
+import contextlib
+
+try:
+    import resource
+except ImportError: #not available on Windows, the peak memory isn't measured
+    resource = None
+
+'''Instrumentation of a conversion: wall time of the stages, counters and peak memory.'''
+
+#stages of a conversion, the rows flow through them lazily so each one gets its own time (without the nested stages)
+STAGES = {
+    'merge': 'files parsed into sorted runs and merged (see jobs/merge.py)',
+    'parse': 'xml to rows',
+    'cache': 'tracks read from and saved in the cache',
+    'track': 'rows stored in the columnar track',
+    'derive': 'derived columns of the track (see parsers/derived.py)',
+    'filter': 'stopover filter',
+    'simplify': 'simplification of the track (see parsers/simplify.py)',
+    'rows': 'rows produced for the output (eg. rebuilt from the track)',
+    'write': 'output written'
+}
+
+
+class Metrics:
+    """
+    Collect the wall time of the stages of a conversion (options['metrics']).
+    The stages are nested (eg. the output pulls the rows from the filter, which
+    pulls them from the xml parser), the time of each stage doesn't include
+    the time of the stages nested inside it. The stages running in other
+    threads at the same time (see parsers/pipeline.py) overlap, their sum
+    can be more than the total.
+
+    With profile_file the hot path (parsing and output, see hot_path()) runs
+    under cProfile and the statistics are saved in profile_file, eg. to read
+    them with python -m pstats profile_file.
+    """
+
+    def __init__(self, profile_file=None):
+        self.seconds = {}
+        self.counters = {}
+        self.total = 0.0
+        self.profile_file = profile_file
+        self.__stacks = {} #thread: [stage, start, time of the nested stages]
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Add the time spent in the with block to stage name."""
+        self.__enter(name)
+        try:
+            yield
+        finally:
+            self.__exit()
+
+    def timed(self, name, rows, counter=None):
+        """Yield rows, the time spent producing them is added to stage name and they are counted in counter."""
+        rows = iter(rows)
+        while True:
+            self.__enter(name)
+            try:
+                row = next(rows)
+            except StopIteration:
+                return
+            finally:
+                self.__exit()
+
+            if counter is not None:
+                self.counters[counter] = self.counters.get(counter, 0) + 1
+            yield row
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextlib.contextmanager
+    def hot_path(self):
+        """Measure the total time of the with block, under cProfile if there is a profile_file."""
+        profiler = cProfile.Profile() if self.profile_file else None
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(self.profile_file)
+            self.total += time.perf_counter() - start
+
+    def report(self):
+        """
+        Return the metrics (dictonary):
+            -> seconds (dictonary)       -- total, time of each stage and other (not in a stage)
+            -> counters (dictonary)      -- eg. points parsed, rows written, stopovers found
+            -> points_per_second (float) -- points / total
+            -> peak_memory_mb (float)    -- peak resident memory of the process, None if unknown
+        """
+        seconds = {'total': self.total}
+        seconds.update((stage, self.seconds[stage]) for stage in STAGES if stage in self.seconds)
+        seconds['other'] = max(self.total - sum(self.seconds.values()), 0.0)
+        points = self.counters.get('points', 0)
+
+        return {
+            'seconds': seconds, 'counters': dict(self.counters),
+            'points_per_second': points / self.total if self.total else None,
+            'peak_memory_mb': peak_memory()
+        }
+
+    def __enter(self, name):
+        self.__stacks.setdefault(threading.get_ident(), []).append([name, time.perf_counter(), 0.0])
+
+    def __exit(self):
+        stack = self.__stacks[threading.get_ident()]
+        name, start, nested = stack.pop()
+        elapsed = time.perf_counter() - start
+        self.seconds[name] = self.seconds.get(name, 0.0) + elapsed - nested
+        if stack:
+            stack[-1][2] += elapsed
+
+
+def summary(report):
+    """Return a report of Metrics.report() as text, a line for each stage and counter."""
+    total = report['seconds']['total'] or 1
+    lines = [f"{stage:<9} {seconds:>9.3f} s {100 * seconds / total:>5.1f}%" for stage, seconds in report['seconds'].items()]
+    lines += [f"{name:<9} {value:>9}" for name, value in report['counters'].items()]
+    if report['points_per_second'] is not None:
+        lines.append(f"{report['points_per_second']:,.0f} points/s")
+    if report['peak_memory_mb'] is not None:
+        lines.append(f"peak memory {report['peak_memory_mb']:.0f} MB")
+    return '\n'.join(lines)
+
+
+def peak_memory():
+    """Return the peak resident memory of the process in MB, None if it can't be measured."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    #kilobytes on Linux, bytes on macOS
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
@@ -46,7 +46,7 @@ class Parser:
 
    def __init__(self, file, options):
       """
-      file (string) -- file to parse.
+      file (string) -- file to parse, it can be compressed (eg. track.gpx.gz, see parsers/compression.py).
 
       options (dictonary) -- is a list of user choices to parse element.
          -> stopping-time (int)    -- possible value in seconds eg. 600
@@ -72,6 +72,16 @@ class Parser:
       
 
    def get_result(self):
+      """
+      Return the parsing result (dictonary):
+         -> parser-type (string) -- eg. gpx
+         -> output_type (string) -- default, filtered or sweep, used to choose the header
+         -> rows (iterator)      -- rows are produced lazily while they are consumed,
+                                    so they can be read just once. With the npz and arrow
+                                    output-type the default rows can be followed by the epoch
+         -> track (TrackPoints)  -- optional, points stored by column (see parsers/trackpoints.py)
+         -> sweep (list)         -- optional, (parameter set, result) for each set of the sweep
+      """
       return self.parser.get_result()
 
 
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: pipeline.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 11:59:40 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import io
+import queue
+import threading
+
+'''Pipelined execution: the stages of a conversion run in threads connected by bounded queues.'''
+
+QUEUE_DEPTH = 4     #blocks or batches waiting in a queue, the memory used by a stage ahead of the next one
+BLOCK_SIZE = 1 << 20 #bytes read at once by the reader
+BATCH_SIZE = 4096    #rows handed off at once
+
+_END = object() #the producer is done
+
+
+class ReadAhead(io.RawIOBase):
+    """
+    Binary file object reading blocks of source (a file object, eg. decompressed
+    while it's read) in a thread, so the reading waits for the disk while the
+    consumer parses the blocks read before.
+    """
+
+    def __init__(self, source, block_size=BLOCK_SIZE, depth=QUEUE_DEPTH):
+        self.source = source
+        self.block = memoryview(b'')
+        self.position = 0
+        self.producer = _Producer(iter(lambda: source.read(block_size), b''), depth)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self.position == len(self.block):
+            block = self.producer.get()
+            if block is _END:
+                return 0
+            self.block, self.position = memoryview(block), 0
+
+        size = min(len(buffer), len(self.block) - self.position)
+        buffer[:size] = self.block[self.position:self.position + size]
+        self.position += size
+        return size
+
+    def close(self):
+        if not self.closed:
+            self.producer.stop()
+            self.source.close()
+        super().close()
+
+
+def prefetch(items, batch_size=BATCH_SIZE, depth=QUEUE_DEPTH):
+    """
+    Yield items (eg. the rows of the parser) produced by a thread in batches, so
+    they are produced while the consumer (eg. the output) handles the previous
+    ones. The order is kept and at most depth batches are ahead of the consumer.
+    An exception of the producer is raised by the consumer.
+    """
+    def batches():
+        items_ = iter(items)
+        while True:
+            batch = []
+            for item in items_:
+                batch.append(item)
+                if len(batch) == batch_size:
+                    break
+            if not batch:
+                return
+            yield batch
+
+    producer = _Producer(batches(), depth)
+    try:
+        while True:
+            batch = producer.get()
+            if batch is _END:
+                return
+            yield from batch
+    finally:
+        producer.stop()
+
+
+class _Producer:
+    """Thread putting the values of an iterator in a bounded queue."""
+
+    def __init__(self, values, depth):
+        self.values = values
+        self.queue = queue.Queue(depth)
+        self.stopped = threading.Event()
+        self.last = None #_END or the error, returned again by the next calls of get()
+        self.thread = threading.Thread(target=self.__run, daemon=True)
+        self.thread.start()
+
+    def get(self):
+        """Return the next value, _END after the last one (eg. a file read again at its end)."""
+        if self.last is None:
+            kind, value = self.queue.get()
+            if kind == 'value' and value is not _END:
+                return value
+            self.last = kind, value
+
+        kind, value = self.last
+        if kind == 'error':
+            raise value
+        return value
+
+    def stop(self):
+        """Stop the thread, eg. the consumer doesn't need the next values."""
+        self.stopped.set()
+        while self.thread.is_alive():
+            try:
+                self.queue.get(timeout=0.1) #free a place for a producer waiting
+            except queue.Empty:
+                pass
+        self.thread.join()
+
+    def __run(self):
+        try:
+            for value in self.values:
+                if not self.__put(('value', value)):
+                    return
+            self.__put(('value', _END))
+        except BaseException as e: #raised by the consumer
+            self.__put(('error', e))
+
+    def __put(self, item):
+        """Put item in the queue, return False if the consumer stopped."""
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: scanner.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 6:07:12 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import re
+import xml.etree.ElementTree as ElementTree
+
+from . import chunks
+
+'''Fast path reader of well-formed gpx 1.1 track points, without building xml trees.'''
+
+TRKPT = rb'<trkpt(\s[^>]*?)?(?:/>|>((?s:.*?))</trkpt>)' #a self-closing point has no body
+ATTRIBUTE = re.compile(rb'''([\w:.-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')''')
+#body of a flat <trkpt>: only tags with text, eg. <ele>132</ele>
+FLAT_BODY = re.compile(rb'(?:\s*<([A-Za-z_][\w.-]*)>[^<&\r]*</\1>)*\s*')
+TAG = re.compile(rb'<([A-Za-z_][\w.-]*)>([^<&\r]*)</\1>')
+ENCODING = re.compile(rb'''encoding\s*=\s*["']([\w.-]+)["']''')
+#characters changed by xml normalization of attribute values
+ATTRIBUTE_SPECIALS = re.compile(rb'[&\t\r\n]')
+
+#a point with the same layout of the first one, eg. lat/lon followed by <ele>, <time>, <sat>, <speed>, <hdop>
+LAYOUT_POINT = rb'<trkpt\s+lat="([^"&\t\r\n]*)"\s+lon="([^"&\t\r\n]*)"\s*>'
+LAYOUT_TAG = rb'\s*<%s>([^<&\r]*)</%s>'
+LAYOUT_SKIP = rb'\s*<%s>[^<&\r]*</%s>' #a tag not read
+LAYOUT_END = rb'\s*</trkpt>'
+
+#values copied as they are to the csv (see csv_lines()): printable ascii without quotes and commas
+CSV_TEXT = rb'[^\x00-\x1f",<&\x7f-\xff]*'
+CSV_POINT = rb'()<trkpt\s+lat="(%s)"\s+lon="(%s)"\s*>' % (CSV_TEXT, CSV_TEXT) #the first group is always empty
+CSV_TIME = rb'((\d{4}-\d\d-\d\d)T(\d\d:\d\d:\d\d)\.?(\d*(?:Z|[+-]\d\d:\d\d)?))' #time, date, hour and time zone
+CSV_INTEGER = rb'0|-?[1-9][0-9]*' #the text of int()
+CSV_LINES = 8192 #lines joined in a block
+
+
+def track_range(buffer):
+    """
+    Return (prolog, start, end) of the track points if the file can be read
+    by the scanner, None otherwise (see chunks.track_range(), moreover the
+    encoding must be utf-8 or ascii).
+    """
+    track = chunks.track_range(buffer)
+    if track is None:
+        return None
+
+    encoding = ENCODING.search(track[0])
+    if encoding is not None and encoding.group(1).lower() not in (b'utf-8', b'utf8', b'us-ascii', b'ascii'):
+        return None
+
+    return track
+
+
+def points(buffer, prolog, start, end, tags=None, select=None):
+    """
+    Yield a dictionary for each <trkpt> in the byte range, the same of
+    gpx.read_point(): lat/lon attributes and text of the tags (None if empty).
+    With tags (set) the other tags of the layout are matched but not decoded.
+    With select (callable, see gpx.Selection.accept()) just the points selected
+    are yielded, the tags of the layout other than <time> are decoded just for
+    them. The scan stops when select returns None.
+
+    The tags of the first point give the layout of a precompiled pattern,
+    the points with that layout (most of the file) are read by one match.
+    The other flat points are read tag by tag, a point with something
+    unexpected (nested or prefixed tags, entities, ...) is parsed by the
+    xml parser.
+    """
+    names = _layout(buffer, start, end)
+    read = [tags is None or name.decode() in tags for name in names]
+    keys = ['lat', 'lon'] + [name.decode() for name, wanted in zip(names, read) if wanted]
+    generic = len(keys) + 1 #first group of generic trkpt in the pattern
+
+    layout = LAYOUT_POINT + b''.join((LAYOUT_TAG if wanted else LAYOUT_SKIP) % (name, name) for name, wanted in zip(names, read)) + LAYOUT_END
+    pattern = re.compile(layout + b'|' + TRKPT)
+
+    time = keys.index('time') + 1 if 'time' in keys else None #group of <time>
+
+    for match in pattern.finditer(buffer, start, end):
+        if match.group(1) is not None:
+            if select is None:
+                yield dict(zip(keys, [match.group(1).decode(), match.group(2).decode()] +
+                                     [value.decode() or None for value in match.groups()[2:generic - 1]]))
+                continue
+
+            point = {'lat': match.group(1).decode(), 'lon': match.group(2).decode()}
+            if time is not None:
+                point['time'] = match.group(time).decode() or None
+            selected = select(point)
+            if selected is None:
+                return
+            if selected:
+                for key, value in zip(keys[2:], match.groups()[2:generic - 1]):
+                    point.setdefault(key, value.decode() or None)
+                yield point
+            continue
+
+        attributes, body = match.group(generic) or b'', match.group(generic + 1) or b''
+
+        point = _flat_point(attributes, body)
+        if point is None:
+            point = _parse_point(prolog, match.group())
+
+        selected = select(point) if select is not None else True
+        if selected is None:
+            return
+        if selected:
+            yield point
+
+
+def _layout(buffer, start, end):
+    """Return the names of the tags of the first point, empty if it isn't a flat point with distinct tags."""
+    match = re.compile(TRKPT).search(buffer, start, end)
+    if match is None or match.group(2) is None or FLAT_BODY.fullmatch(match.group(2)) is None:
+        return []
+
+    names = [name for name, text in TAG.findall(match.group(2))]
+    return names if len(set(names)) == len(names) else []
+
+
+def _flat_point(attributes, body):
+    """Return the point read by patterns, None if it isn't a flat point."""
+    if FLAT_BODY.fullmatch(body) is None:
+        return None
+
+    point = {'lat': None, 'lon': None}
+    for name, double_quoted, single_quoted in ATTRIBUTE.findall(attributes):
+        value = double_quoted or single_quoted
+        if name in (b'lat', b'lon'):
+            if ATTRIBUTE_SPECIALS.search(value):
+                return None
+            point[name.decode()] = value.decode()
+
+    for name, text in TAG.findall(body):
+        point.setdefault(name.decode(), text.decode() or None) #as the text of an empty element
+
+    return point
+
+
+def _parse_point(prolog, element):
+    from .gpx import read_point #imported here, gpx imports this module
+
+    root = ElementTree.fromstring(prolog + element + b'</chunk>')
+    return read_point(root[0])
+
+
+def csv_lines(buffer, prolog, start, end, fields, integers=()):
+    """
+    Yield the csv lines of the track points in the byte range, copied from the
+    buffer without decoding the values: blocks (bytes) of lines ending with \\r\\n
+    as csv.writer does. A point that can't be copied (not in the layout of the
+    first point, a value that should be quoted, not ascii, ...) is yielded as
+    a dictionary as points() does, it has to be converted as a row.
+
+    fields (list)   -- values of the columns (at least two, csv.writer quotes a single
+                       empty value): the name of a tag ('lat' and 'lon' the
+                       attributes) or 0, 1 and 2 for date, hour and time zone of
+                       <time> as timestamp.split() (the time must have its layout).
+                       A tag missing in the layout is an empty value.
+    integers (set)  -- tags written as integers by the rows, they are copied only
+                       if they are written in the same way.
+    """
+    names = [name.decode() for name in _layout(buffer, start, end)]
+    needed = {field for field in fields if isinstance(field, str)}
+    if any(isinstance(field, int) for field in fields):
+        needed.add('time')
+
+    groups = {'lat': 2, 'lon': 3}
+    layout = CSV_POINT
+    count = 3 #groups of the pattern
+    for name in names:
+        tag = name.encode()
+        if name == 'time' and 'time' in needed:
+            layout += rb'\s*<time>%s</time>' % CSV_TIME
+            groups.update({'time': count + 1, 0: count + 2, 1: count + 3, 2: count + 4})
+            count += 4
+        elif name in needed:
+            layout += rb'\s*<%s>(%s)</%s>' % (tag, CSV_INTEGER if name in integers else CSV_TEXT, tag)
+            groups[name] = count + 1
+            count += 1
+        else:
+            layout += LAYOUT_SKIP % (tag, tag)
+
+    indexes = [groups.get(field, 1) for field in fields]
+    generic = count + 1
+    pattern = re.compile(layout + LAYOUT_END + b'|' + TRKPT)
+
+    lines = []
+    for match in pattern.finditer(buffer, start, end):
+        if match.group(2) is not None:
+            lines.append(b','.join(match.group(*indexes)))
+            if len(lines) == CSV_LINES:
+                yield b'\r\n'.join(lines) + b'\r\n'
+                lines = []
+            continue
+
+        if lines:
+            yield b'\r\n'.join(lines) + b'\r\n'
+            lines = []
+
+        attributes, body = match.group(generic) or b'', match.group(generic + 1) or b''
+        point = _flat_point(attributes, body)
+        if point is None:
+            point = _parse_point(prolog, match.group())
+        yield point
+
+    if lines:
+        yield b'\r\n'.join(lines) + b'\r\n'
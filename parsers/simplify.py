@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: simplify.py
+# Project: gpx2cvs
+# Created Date: Monday, October 19th 2026, 0:07:21 am
+# Author: Fabio Zito
+# -----
+# Last Modified: Mon Oct 19 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+try:
+    import numpy
+except ImportError: #numpy is optional, without it the points are compared one by one
+    numpy = None
+
+import math
+from . import stopover, timestamp
+from .trackpoints import TrackPoints, LATITUDE, LONGITUDE, EPOCH
+
+'''Simplification of a track: fewer points along the same path.'''
+
+METHODS = {
+    'douglas-peucker': 'points farther than the tolerance (meters) from the simplified path are kept',
+    'min-distance': 'a point is kept at least the tolerance (meters) away from the previous point kept',
+    'min-interval': 'a point is kept at least the tolerance (seconds) after the previous point kept'
+}
+
+EARTH_RADIUS = stopover.EARTH_RADIUS * 1000 #meters
+
+
+class Simplification:
+    """
+    Simplify the default rows (followed by the epoch) of a track, the first and
+    the last point are always kept and so are the points without position
+    (or without time for min-interval), they can't be compared.
+    After the rows are consumed self.points and self.kept are the points read
+    and kept, see ratio().
+    """
+
+    def __init__(self, method, tolerance):
+        """
+        method (string)   -- one of METHODS
+        tolerance (float) -- meters, seconds for min-interval
+        """
+        if method not in METHODS:
+            raise ValueError(f'unknown simplification {method}')
+        self.method = method
+        self.tolerance = tolerance
+        self.points = 0
+        self.kept = 0
+        self.__anchor = None #position or epoch of the last point kept
+        self.__min_chord = stopover.chord_range((tolerance / 1000,))[0]
+
+    def ratio(self):
+        """Return the reduction ratio, the fraction of the points removed."""
+        return 1 - self.kept / self.points if self.points else 0.0
+
+    def rows(self, rows, track=None):
+        """
+        Yield the rows kept, rows are the default rows followed by the epoch.
+        Douglas-Peucker needs all the points, they are stored in a TrackPoints
+        if track (the TrackPoints of the rows) isn't given.
+        """
+        if self.method == 'douglas-peucker':
+            if track is None:
+                track = TrackPoints(rows)
+            kept = douglas_peucker(track.column('latitude'), track.column('longitude'), self.tolerance)
+            self.points, self.kept = len(track), len(kept)
+            yield from track.iter_rows(epoch=True, indexes=kept)
+            return
+
+        keep = self.__far if self.method == 'min-distance' else self.__later
+        last = None #last row read and not kept yet
+
+        for row in rows:
+            self.points += 1
+            if keep(row): #the first point too, there is no anchor yet
+                self.kept += 1
+                last = None
+                yield row
+            else:
+                last = row
+
+        if last is not None: #the last point of the track
+            self.kept += 1
+            yield last
+
+    def __far(self, row):
+        position = _unit_vector(row)
+        if position is None:
+            return True
+        if self.__anchor is None or stopover.squared_chord(self.__anchor, position) >= self.__min_chord:
+            self.__anchor = position
+            return True
+        return False
+
+    def __later(self, row):
+        epoch = row[EPOCH]
+        if epoch is None:
+            return True
+        if self.__anchor is None or timestamp.to_seconds(epoch - self.__anchor) >= self.tolerance:
+            self.__anchor = epoch
+            return True
+        return False
+
+
+def douglas_peucker(latitude, longitude, tolerance):
+    """
+    Return the indexes (sorted list) of the points kept by Douglas-Peucker: a
+    point is kept if it's farther than tolerance (meters) from the great circle
+    between the points kept before and after it. The points without position
+    (NaN) are kept and don't take part in the simplification.
+
+    latitude, longitude (buffer) -- degrees, eg. the columns of a TrackPoints
+    """
+    size = len(latitude)
+    threshold = math.sin(min(tolerance / EARTH_RADIUS, math.pi / 2)) #of the distance from a great circle, as its angle
+
+    if numpy is not None:
+        latitude = numpy.frombuffer(latitude, dtype=numpy.float64)[:size]
+        longitude = numpy.frombuffer(longitude, dtype=numpy.float64)[:size]
+        valid = numpy.flatnonzero(~(numpy.isnan(latitude) | numpy.isnan(longitude)))
+        radians_latitude, radians_longitude = numpy.radians(latitude[valid]), numpy.radians(longitude[valid])
+        vectors = numpy.column_stack((
+            numpy.cos(radians_latitude) * numpy.cos(radians_longitude),
+            numpy.cos(radians_latitude) * numpy.sin(radians_longitude),
+            numpy.sin(radians_latitude)
+        ))
+        kept = _douglas_peucker_arrays(vectors, threshold)
+        missing = numpy.setdiff1d(numpy.arange(size), valid, assume_unique=True)
+        return numpy.union1d(valid[kept], missing).tolist()
+
+    valid = [index for index in range(size) if not (math.isnan(latitude[index]) or math.isnan(longitude[index]))]
+    vectors = [stopover.unit_vector(latitude[index], longitude[index]) for index in valid]
+    kept = set(valid[index] for index in _douglas_peucker_lists(vectors, threshold))
+    return sorted(kept.union(set(range(size)).difference(valid)))
+
+
+def _douglas_peucker_arrays(vectors, threshold):
+    """
+    Return the indexes of the kept vectors (numpy array of unit vectors, one for each row).
+    All the segments still to split are handled together, a level of the recursion at a time:
+    each inner point is compared with the great circle of its segment in one pass.
+    """
+    size = len(vectors)
+    keep = numpy.zeros(size, dtype=bool)
+    if size:
+        keep[[0, -1]] = True
+    firsts, lasts = numpy.array([0]), numpy.array([size - 1])
+
+    while True:
+        splittable = lasts - firsts >= 2
+        firsts, lasts = firsts[splittable], lasts[splittable]
+        if not firsts.size:
+            break
+
+        lengths = lasts - firsts - 1 #inner points of each segment
+        offsets = numpy.concatenate(([0], numpy.cumsum(lengths)[:-1]))
+        segment = numpy.repeat(numpy.arange(firsts.size), lengths)
+        inner = numpy.arange(lengths.sum()) - offsets[segment] + firsts[segment] + 1
+
+        normals = numpy.cross(vectors[firsts], vectors[lasts])
+        norms = numpy.linalg.norm(normals, axis=1)
+        degenerate = norms <= 1e-15 #same point (or antipodal), the distance from it
+        normals /= numpy.where(degenerate, 1.0, norms)[:, None]
+
+        distances = numpy.abs(numpy.einsum('ij,ij->i', vectors[inner], normals[segment]))
+        if degenerate.any():
+            points = numpy.flatnonzero(degenerate[segment])
+            distances[points] = numpy.linalg.norm(numpy.cross(vectors[inner[points]], vectors[firsts[segment[points]]]), axis=1)
+
+        maxima = numpy.maximum.reduceat(distances, offsets)
+        hits = numpy.flatnonzero(distances == maxima[segment])
+        farthest = inner[hits[numpy.unique(segment[hits], return_index=True)[1]]] #the first farthest point of each segment
+
+        split = maxima > threshold
+        farthest = farthest[split]
+        keep[farthest] = True
+        firsts, lasts = numpy.concatenate((firsts[split], farthest)), numpy.concatenate((farthest, lasts[split]))
+
+    return numpy.flatnonzero(keep)
+
+
+def _douglas_peucker_lists(vectors, threshold):
+    """Return the indexes of the kept vectors (list of unit vectors), as _douglas_peucker_arrays()."""
+    size = len(vectors)
+    keep = [index in (0, size - 1) for index in range(size)]
+    stack = [(0, size - 1)]
+
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+
+        normal = _cross(vectors[first], vectors[last])
+        norm = math.sqrt(sum(value * value for value in normal))
+        farthest, distance = None, -1.0
+
+        if norm > 1e-15:
+            nx, ny, nz = (value / norm for value in normal)
+            for index in range(first + 1, last):
+                x, y, z = vectors[index]
+                value = abs(x * nx + y * ny + z * nz)
+                if value > distance:
+                    farthest, distance = index, value
+        else: #same point (or antipodal), the distance from it
+            for index in range(first + 1, last):
+                value = math.sqrt(sum(value * value for value in _cross(vectors[index], vectors[first])))
+                if value > distance:
+                    farthest, distance = index, value
+
+        if distance > threshold:
+            keep[farthest] = True
+            stack.append((farthest, last))
+            stack.append((first, farthest))
+
+    return [index for index in range(size) if keep[index]]
+
+
+def _cross(a, b):
+    return a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0]
+
+
+def _unit_vector(row):
+    try:
+        return stopover.unit_vector(float(row[LATITUDE]), float(row[LONGITUDE]))
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: stopover.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 2:37:09 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+try:
+    import numpy
+except ImportError: #numpy is optional, without it GPX uses its row by row filter
+    numpy = None
+
+import math
+import itertools
+from . import timestamp
+
+'''Vectorized stopover detection on the columns of a TrackPoints.'''
+
+SECONDS_IN_MINUTE = 60
+EARTH_RADIUS = 6371.0088 #mean earth radius in km
+ANCHOR_STEPS = 8 #following points compared with every point in one batch
+ANCHOR_WINDOW = 64 #points compared with an anchor in the first batch, doubled at each batch
+CHUNK_POINTS = 65536 #points stored in the track before stream() looks for the stopovers
+
+
+def available():
+    return numpy is not None
+
+
+def unit_vector(latitude, longitude):
+    """Return the point (degrees) on the unit sphere as (x, y, z)."""
+    latitude, longitude = math.radians(latitude), math.radians(longitude)
+    return math.cos(latitude) * math.cos(longitude), math.cos(latitude) * math.sin(longitude), math.sin(latitude)
+
+
+def squared_chord(vector1, vector2):
+    """Return the squared chord between two unit vectors."""
+    return (vector1[0] - vector2[0]) ** 2 + (vector1[1] - vector2[1]) ** 2 + (vector1[2] - vector2[2]) ** 2
+
+
+def chord_range(distance_range):
+    """
+    Return (min, max) squared chords of a distance range in km.
+    The chord grows with the great-circle distance, so comparing squared chords
+    of unit vectors is the same as comparing distances, without trigonometry
+    for every couple of points.
+    """
+    return tuple((2 * math.sin(min(distance / (2 * EARTH_RADIUS), math.pi / 2))) ** 2 for distance in distance_range)
+
+
+def detect(track, stopping_time, speed_range=None, distance_range=None, speeds=None):
+    """
+    Return the stopovers of the track as a list of (start, end, minutes):
+    start and end are the indexes of the first and last point of the stopover
+    and minutes its rounded duration.
+    The result is the same of GPX.__filter_rows_from_time_speed_distance:
+        -> points with speed in range make a run of unmoving points
+        -> with distance_range a run is also split at the first point too far
+           from the first point of the run (anchor), that point is a new anchor
+        -> a run is a stopover if it lasts at least stopping_time seconds,
+           it ends at its last point reached after stopping_time
+        -> the last point of the track is never considered
+        -> points without time are never unmoving, with distance_range points
+           without position (lat/lon) too
+
+    track (TrackPoints)    -- parsed points.
+    stopping_time (int)    -- value in seconds eg. 600
+    speed_range (tuple)    -- min and max value in km/h eg. (0, 5)
+    distance_range (tuple) -- min and max distance in km from the anchor eg. (0, 0.05)
+    speeds (buffer)        -- optional, speeds (km/h) of the points without <speed>, eg. the
+                              computed_speed of parsers/derived.py (NaN is never in range)
+    """
+    #the last point is excluded as in version 1.0
+    return _detect(track, 0, len(track) - 1, stopping_time, speed_range, distance_range, speeds)[0]
+
+
+def stream(track, rows, stopping_time, speed_range=None, distance_range=None, chunk_size=CHUNK_POINTS):
+    """
+    Yield the stopovers of detect() while the rows are stored in track (TrackPoints),
+    so they are found without waiting for the whole track: the rows are stored in
+    chunks and each chunk is searched from the run still open at the end of the
+    previous one. A stopover is yielded when its run ends, the one still open at the
+    end of the rows as by detect(). A chunk is at least as long as the open run, so
+    a long run isn't searched again and again.
+
+    rows (iterable) -- rows produced by the parser, default columns followed by the epoch.
+    """
+    rows = iter(rows)
+    begin = 0 #first point of the run still open
+
+    while True:
+        size = len(track)
+        track.extend(itertools.islice(rows, max(chunk_size, size - begin)))
+        if len(track) == size:
+            break
+
+        stopovers, begin = _detect(track, begin, len(track), stopping_time, speed_range, distance_range)
+        for stopover in stopovers:
+            if stopover[0] < begin:
+                yield stopover
+
+    yield from _detect(track, begin, len(track) - 1, stopping_time, speed_range, distance_range)[0]
+
+
+def _detect(track, begin, end, stopping_time, speed_range=None, distance_range=None, speeds=None):
+    """
+    Return (stopovers, open) of the points of track in [begin, end), see detect().
+    open is the index of the first point of the run of the last point, end if
+    the last point isn't unmoving: the points from there may continue that run.
+    """
+    size = end - begin
+    if size <= 0:
+        return [], max(begin, end)
+
+    seconds = numpy.frombuffer(track.column('epoch'), dtype=numpy.int64)[begin:end] / timestamp.MICROSECONDS_IN_SECOND
+
+    if speed_range is not None:
+        min_speed, max_speed = speed_range
+        speed = numpy.frombuffer(track.column('speed'), dtype=numpy.int16)[begin:end]
+        unmoving = (speed >= min_speed) & (speed <= max_speed)
+        #missing speeds and speeds out of int16 are stored as 0, their values are in the exceptions
+        for index, value in track.exceptions['speed'].items():
+            if begin <= index < end:
+                if value is None and speeds is not None:
+                    value = speeds[index]
+                unmoving[index - begin] = isinstance(value, (int, float)) and min_speed <= value <= max_speed
+    else:
+        unmoving = numpy.ones(size, dtype=bool)
+
+    for index in track.exceptions['epoch']: #points without time are never unmoving
+        if begin <= index < end:
+            unmoving[index - begin] = False
+
+    if distance_range is not None:
+        latitude = numpy.frombuffer(track.column('latitude'), dtype=numpy.float64)[begin:end]
+        longitude = numpy.frombuffer(track.column('longitude'), dtype=numpy.float64)[begin:end]
+        unmoving &= numpy.isfinite(latitude) & numpy.isfinite(longitude) #missing positions are NaN
+        run_begins = _anchors(unmoving, latitude, longitude, distance_range)
+    else:
+        run_begins = unmoving.copy()
+        run_begins[1:] &= ~unmoving[:-1]
+
+    #index of the first point of the run every point belongs to
+    index = numpy.arange(size)
+    run_start = numpy.maximum.accumulate(numpy.where(run_begins, index, 0))
+    open_run = begin + int(run_start[-1]) if unmoving[-1] else end
+
+    elapsed = seconds - seconds[run_start]
+    reached = numpy.flatnonzero(unmoving & (elapsed >= stopping_time))
+    if not len(reached):
+        return [], open_run
+
+    #the end of every stopover is its last point that reached the stopping time
+    starts = run_start[reached]
+    last = numpy.ones(len(reached), dtype=bool)
+    last[:-1] = starts[1:] != starts[:-1]
+
+    starts, ends = starts[last], reached[last]
+    minutes = numpy.rint(elapsed[ends] / SECONDS_IN_MINUTE).astype(numpy.int64) #rint rounds half to even as round()
+
+    return list(zip((starts + begin).tolist(), (ends + begin).tolist(), minutes.tolist())), open_run
+
+
+def _anchors(unmoving, latitude, longitude, distance_range):
+    """
+    Return a boolean array, True at the anchor of every run of unmoving points.
+    The chords between every point and its next ANCHOR_STEPS points are
+    computed in one batch, so most anchors are found by following those steps;
+    longer stopovers are searched in batches of growing size.
+    """
+    min_chord, max_chord = chord_range(distance_range)
+    size = len(unmoving)
+
+    radians_latitude, radians_longitude = numpy.radians(latitude), numpy.radians(longitude)
+    vectors = numpy.cos(radians_latitude) * numpy.cos(radians_longitude), \
+              numpy.cos(radians_latitude) * numpy.sin(radians_longitude), numpy.sin(radians_latitude)
+
+    #steps to the first following point too far from each point (0 if not within ANCHOR_STEPS)
+    away = numpy.zeros(size, dtype=numpy.int64)
+    for step in range(ANCHOR_STEPS, 0, -1): #the smallest step is written last
+        chord = sum((axis[step:] - axis[:-step]) ** 2 for axis in vectors)
+        away[:-step][(chord < min_chord) | (chord > max_chord)] = step
+
+    #index of the next moving point (end of run) and of the next unmoving point
+    position = numpy.arange(size + 1)
+    next_moving = numpy.minimum.accumulate(numpy.where(numpy.append(~unmoving, True), position, size)[::-1])[::-1]
+    next_unmoving = numpy.minimum.accumulate(numpy.where(numpy.append(unmoving, True), position, size)[::-1])[::-1]
+
+    away, next_moving, next_unmoving = away.tolist(), next_moving.tolist(), next_unmoving.tolist()
+
+    anchors = []
+    anchor = next_unmoving[0]
+
+    while anchor < size:
+        anchors.append(anchor)
+        run_end = next_moving[anchor]
+        step = away[anchor]
+
+        if not step and anchor + ANCHOR_STEPS + 1 < run_end:
+            step = _search_away(vectors, anchor, anchor + ANCHOR_STEPS + 1, run_end, min_chord, max_chord)
+
+        if step and anchor + step < run_end:
+            anchor += step
+        else:
+            anchor = next_unmoving[run_end]
+
+    run_begins = numpy.zeros(size, dtype=bool)
+    run_begins[anchors] = True
+    return run_begins
+
+
+def _search_away(vectors, anchor, begin, run_end, min_chord, max_chord):
+    """Return steps from anchor to the first point too far in [begin, run_end), 0 if there isn't."""
+    window = ANCHOR_WINDOW
+
+    while begin < run_end:
+        end = min(begin + window, run_end)
+        chord = sum((axis[begin:end] - axis[anchor]) ** 2 for axis in vectors)
+        away = numpy.flatnonzero((chord < min_chord) | (chord > max_chord))
+        if len(away):
+            return begin + int(away[0]) - anchor
+        begin = end
+        window *= 2
+
+    return 0
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: timestamp.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 10:24:17 am
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import functools
+from datetime import datetime, timedelta, timezone, date as Date
+
+'''ISO 8601 decoder for the <time> tag, every timestamp is parsed just once.'''
+
+FORMAT = '%Y-%m-%dT%H:%M:%S.%f%z'
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+EPOCH_ORDINAL = EPOCH.toordinal()
+NAIVE_EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+MICROSECONDS_IN_SECOND = 10**6
+
+
+@functools.lru_cache(maxsize=4096)
+def _days_from_epoch(day):
+    """Days from 1970-01-01 of a 'YYYY-MM-DD' date, a track has few distinct days."""
+    return Date(int(day[0:4]), int(day[5:7]), int(day[8:10])).toordinal() - EPOCH_ORDINAL
+
+
+def decode(time):
+    """
+    Decode a timestamp and return a tuple (epoch_us, date, hour, time_zone):
+        -> epoch_us (int)     -- unix epoch in microseconds
+        -> date (string)      -- text before 'T', eg. 2013-02-08
+        -> hour (string)      -- text between 'T' and '.', eg. 00:12:03
+        -> time_zone (string) -- text after '.', eg. 000Z (fraction and zone as in version 1.0)
+
+    Fixed layout timestamps as YYYY-MM-DDTHH:MM:SS.fff(Z|+HH:MM) are decoded
+    from their slices (the digits after the microseconds are truncated),
+    everything else falls back to datetime.
+
+    time (string) -- text of <time> tag eg. 2013-02-08T00:12:03.000Z
+    """
+    try:
+        return _decode_fixed_layout(time)
+    except (ValueError, IndexError):
+        return _decode(time)
+
+
+def to_seconds(epoch_us):
+    """Convert epoch in microseconds to seconds, same value of datetime.timestamp()."""
+    return epoch_us / MICROSECONDS_IN_SECOND
+
+
+def _decode_fixed_layout(time):
+    if time[4] != '-' or time[7] != '-' or time[10] != 'T' or time[13] != ':' or time[16] != ':' or time[19] != '.':
+        raise ValueError(time)
+
+    if time[-1] == 'Z':
+        fraction = time[20:-1]
+        offset = 0
+    elif time[-6] in '+-' and time[-3] == ':':
+        fraction = time[20:-6]
+        offset = int(time[-5:-3]) * 60 + int(time[-2:])
+        if time[-6] == '-':
+            offset = -offset
+    else:
+        raise ValueError(time)
+
+    if not fraction or not fraction.isdigit():
+        raise ValueError(time)
+
+    hours, minutes, seconds = int(time[11:13]), int(time[14:16]), int(time[17:19])
+    if hours > 23 or minutes > 59 or seconds > 59:
+        raise ValueError(time)
+
+    seconds += _days_from_epoch(time[0:10]) * 86400 + hours * 3600 + minutes * 60 - offset * 60
+    epoch_us = seconds * MICROSECONDS_IN_SECOND + int(fraction[:6].ljust(6, '0'))
+
+    return epoch_us, time[0:10], time[11:19], time[20:]
+
+
+def _decode(time):
+    try:
+        format_date = datetime.strptime(time, FORMAT)
+    except ValueError:
+        format_date = datetime.fromisoformat(time)
+
+    if format_date.tzinfo is None:
+        format_date = format_date.replace(tzinfo=timezone.utc)
+
+    epoch_us = (format_date - EPOCH) // MICROSECOND
+
+    return (epoch_us,) + split(time)
+
+
+def split(time):
+    """Split timestamp in (date, hour, time_zone) as decode() does, hour and time_zone are empty without 'T'."""
+    date, separator, clock = time.rpartition('T')
+    if not separator: #date without time eg. 2013-02-08
+        return clock, '', ''
+    hour, separator, time_zone = clock.rpartition('.')
+    if not separator: #timestamp without fraction eg. 2013-02-08T00:12:03Z
+        hour, time_zone = clock[:8], clock[8:]
+
+    return date, hour, time_zone
+
+
+def zone_offset(zone):
+    """Return offset in microseconds of a zone designator ('Z', '+HH:MM' or '-HH:MM'), None if unknown."""
+    if zone == 'Z':
+        return 0
+    if len(zone) != 6 or zone[0] not in '+-' or zone[3] != ':' or not (zone[1:3] + zone[4:]).isdigit():
+        return None
+    offset = (int(zone[1:3]) * 3600 + int(zone[4:]) * 60) * MICROSECONDS_IN_SECOND
+    return -offset if zone[0] == '-' else offset
+
+
+def encode(epoch_us, fraction_digits, zone, offset):
+    """
+    Return the fixed layout timestamp of an epoch, inverse of decode().
+
+    epoch_us (int)        -- unix epoch in microseconds
+    fraction_digits (int) -- number of digits of the seconds fraction
+    zone (string)         -- zone designator eg. Z or +02:00
+    offset (int)          -- offset of the zone in microseconds, see zone_offset()
+    """
+    seconds, microseconds = divmod(epoch_us + offset, MICROSECONDS_IN_SECOND)
+    local = NAIVE_EPOCH + timedelta(seconds=seconds)
+    return f'{local:%Y-%m-%dT%H:%M:%S}.{microseconds:06d}'[:20 + fraction_digits] + zone
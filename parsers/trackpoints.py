@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: trackpoints.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 11:02:51 am
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import sys
+import json
+from array import array
+from . import timestamp
+
+'''Columnar store of track points.'''
+
+#position of the fields in the rows produced by the parser
+LATITUDE, LONGITUDE, TIME, DATE, HOUR, TIME_ZONE, SPEED, ELE, SAT, HDOP, EPOCH = range(11)
+
+FLOAT_COLUMNS = {'latitude': LATITUDE, 'longitude': LONGITUDE, 'ele': ELE, 'hdop': HDOP}
+INT_COLUMNS = {'speed': (SPEED, 'h'), 'sat': (SAT, 'h')}
+
+NO_LAYOUT = 255
+
+MAGIC = b'GPXTRACK1\n'
+ALIGNMENT = 8
+
+
+class TrackPoints:
+    """
+    Track points stored by column in typed arrays instead of a list of rows:
+        -> latitude, longitude, ele, hdop (float64)
+        -> epoch (int64, microseconds)
+        -> speed, sat (int16)
+
+    The text of the rows is rebuilt from the numbers (decimal places and time
+    layout are kept for each point), the few values that can't be rebuilt
+    exactly (eg. missing tags or uncommon notations) are stored as they are,
+    so iterating the points yields the same rows they were built from.
+    """
+
+    def __init__(self, rows=()):
+        """rows (iterable) -- rows produced by the parser, default columns followed by the epoch."""
+        self.columns = {name: array('d') for name in FLOAT_COLUMNS}
+        self.columns['epoch'] = array('q')
+        for name, (position, typecode) in INT_COLUMNS.items():
+            self.columns[name] = array(typecode)
+
+        self.decimals = {name: array('b') for name in FLOAT_COLUMNS}
+        self.layout = array('B')
+        self.layouts = []
+        self.exceptions = {name: {} for name in self.columns}
+        self.exceptions['time'] = {}
+
+        self.extend(rows)
+
+    def __len__(self):
+        return len(self.columns['epoch'])
+
+    def __iter__(self):
+        """Iterate the default rows: [latitude, longitude, time, date, hour, time_zone, speed, ele, sat, hdop]"""
+        return self.iter_rows()
+
+    def iter_rows(self, epoch=False, indexes=None):
+        """
+        Iterate the default rows, followed by the epoch (microseconds) if epoch is True.
+        With indexes (iterable) just the rows of the points at these indexes.
+        """
+        epochs = self.columns['epoch']
+        missing = self.exceptions['epoch'] #points without time
+        for index in range(len(self)) if indexes is None else indexes:
+            row = self.row(index)
+            if epoch:
+                row.append(epochs[index] if index not in missing else None)
+            yield row
+
+    def nbytes(self):
+        """Return the bytes of the arrays of the points, the exceptions aren't counted."""
+        arrays = list(self.columns.values()) + list(self.decimals.values()) + [self.layout]
+        return sum(len(values) * values.itemsize for values in arrays)
+
+    def column(self, name):
+        """Return the typed array of a column eg. track.column('speed')."""
+        return self.columns[name]
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def collect(self, rows):
+        """Store the rows while yielding them, so a streaming stage can consume them at the same time."""
+        for row in rows:
+            self.append(row)
+            yield row
+
+    def append(self, row):
+        """row (list) -- default columns followed by the epoch."""
+        index = len(self)
+
+        for name, position in FLOAT_COLUMNS.items():
+            value, decimals = _float(row[position])
+            self.columns[name].append(value)
+            self.decimals[name].append(decimals)
+            if decimals < 0:
+                self.exceptions[name][index] = row[position]
+
+        for name, (position, typecode) in INT_COLUMNS.items():
+            value = _int(row[position])
+            try:
+                self.columns[name].append(value)
+            except (TypeError, OverflowError):
+                value = None
+            if value is None or (row[position] != value and row[position] != str(value)):
+                if value is None:
+                    self.columns[name].append(0)
+                self.exceptions[name][index] = row[position]
+
+        if row[EPOCH] is None: #missing <time>
+            self.exceptions['epoch'][index] = None
+        self.columns['epoch'].append(row[EPOCH] if row[EPOCH] is not None else 0)
+        self.layout.append(self.__layout(row[TIME], row[EPOCH], index))
+
+    def save(self, file):
+        """
+        Write the track in a binary file object: a json header followed by the
+        arrays, aligned so that load() can use them from a memory map.
+        """
+        arrays = [('columns', name, values) for name, values in self.columns.items()]
+        arrays += [('decimals', name, values) for name, values in self.decimals.items()]
+        arrays += [('layout', None, self.layout)]
+
+        header = {
+            'byteorder': sys.byteorder, 'layouts': self.layouts, 'arrays': [],
+            'exceptions': {name: list(values.items()) for name, values in self.exceptions.items()}
+        }
+        offset = 0
+        for kind, name, values in arrays:
+            size = len(values) * values.itemsize
+            header['arrays'].append([kind, name, values.typecode if isinstance(values, array) else values.format, offset, size])
+            offset += _aligned(size)
+
+        header = json.dumps(header).encode()
+        header += b' ' * (_aligned(len(MAGIC) + 8 + len(header)) - len(MAGIC) - 8 - len(header))
+        file.write(MAGIC + len(header).to_bytes(8, 'little') + header)
+
+        for kind, name, values in arrays:
+            data = memoryview(values).cast('B')
+            file.write(data)
+            file.write(b'\0' * (_aligned(len(data)) - len(data)))
+
+    @classmethod
+    def load(cls, buffer):
+        """
+        Return the track saved in buffer (eg. a memory map) by save().
+        The columns are views on the buffer, nothing is copied: the track is read only.
+        """
+        if bytes(buffer[:len(MAGIC)]) != MAGIC:
+            raise ValueError('not a saved track')
+
+        size = int.from_bytes(buffer[len(MAGIC):len(MAGIC) + 8], 'little')
+        start = len(MAGIC) + 8
+        header = json.loads(bytes(buffer[start:start + size]))
+        if header['byteorder'] != sys.byteorder:
+            raise ValueError('track saved with another byte order')
+
+        track = cls.__new__(cls)
+        track.columns, track.decimals = {}, {}
+        data = memoryview(buffer)[start + size:]
+
+        for kind, name, typecode, offset, size in header['arrays']:
+            values = data[offset:offset + size].cast(typecode)
+            if kind == 'layout':
+                track.layout = values
+            else:
+                getattr(track, kind)[name] = values
+
+        track.layouts = [tuple(layout) for layout in header['layouts']]
+        track.exceptions = {name: dict(values) for name, values in header['exceptions'].items()}
+        return track
+
+    def row(self, index):
+        """Return the default row of point at index."""
+        time = self.time(index)
+        date, hour, time_zone = timestamp.split(time) if time is not None else (None, None, None)
+
+        return [
+            self.__float('latitude', index), self.__float('longitude', index),
+            time, date, hour, time_zone,
+            self.__int('speed', index), self.__float('ele', index),
+            self.__text('sat', index), self.__float('hdop', index)
+        ]
+
+    def time(self, index):
+        """Return the original text of <time> of point at index."""
+        layout = self.layout[index]
+        if layout == NO_LAYOUT:
+            return self.exceptions['time'][index]
+
+        fraction_digits, zone, offset = self.layouts[layout]
+        return timestamp.encode(self.columns['epoch'][index], fraction_digits, zone, offset)
+
+    def __float(self, name, index):
+        decimals = self.decimals[name][index]
+        if decimals < 0:
+            return self.exceptions[name][index]
+        return f'{self.columns[name][index]:.{decimals}f}'
+
+    def __int(self, name, index):
+        exceptions = self.exceptions[name]
+        return exceptions[index] if index in exceptions else self.columns[name][index]
+
+    def __text(self, name, index):
+        exceptions = self.exceptions[name]
+        return exceptions[index] if index in exceptions else str(self.columns[name][index])
+
+    def __layout(self, time, epoch, index):
+        """Return the index of the time layout (fraction digits and zone), NO_LAYOUT if the time has to be kept as text."""
+        fraction = time[20:] if isinstance(time, str) and len(time) > 20 and time[19] == '.' else ''
+        fraction_digits = len(fraction) - len(fraction.lstrip('0123456789'))
+        zone = fraction[fraction_digits:]
+        offset = timestamp.zone_offset(zone)
+
+        if fraction_digits and offset is not None and epoch is not None:
+            layout = (fraction_digits, zone, offset)
+            if layout not in self.layouts and len(self.layouts) < NO_LAYOUT:
+                self.layouts.append(layout)
+            if layout in self.layouts:
+                position = self.layouts.index(layout)
+                try:
+                    if timestamp.encode(epoch, fraction_digits, zone, offset) == time:
+                        return position
+                except (ValueError, OverflowError):
+                    pass
+
+        self.exceptions['time'][index] = time
+        return NO_LAYOUT
+
+
+def _aligned(size):
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+def _float(text):
+    """Return (value, decimals) of a decimal text, decimals is -1 if the text can't be rebuilt from the value."""
+    try:
+        value = float(text)
+    except (TypeError, ValueError):
+        return float('nan'), -1
+
+    integer, separator, fraction = text.partition('.')
+    decimals = len(fraction) if separator else 0
+    if (separator and not decimals) or decimals > 127 or f'{value:.{decimals}f}' != text:
+        return value, -1
+    return value, decimals
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
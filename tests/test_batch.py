@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: test_batch.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 6:02:15 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os
+import sys
+import gzip
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from jobs.batch import Batch, expand
+
+'''Batch mode: many files converted by a pool of processes, a failing file doesn't stop the others.'''
+
+SAMPLE = os.path.join(ROOT, 'sample.gpx')
+BROKEN = b'<?xml version="1.0"?><gpx><trk><trkseg><trkpt lat="1" lon="2"><time>2021-05-01T10:00:00Z</time></trkpt><trkpt lat="1"'
+
+
+def run(*args):
+    """Return the process of gpx2csv.py run with args."""
+    return subprocess.run([sys.executable, os.path.join(ROOT, 'gpx2csv.py')] + list(args), capture_output=True, text=True)
+
+
+class BatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.inputs = os.path.join(self.directory.name, 'inputs')
+        self.outputs = os.path.join(self.directory.name, 'outputs')
+        self.single = os.path.join(self.directory.name, 'single')
+        for directory in (self.inputs, self.outputs, self.single):
+            os.mkdir(directory)
+
+        #the sample, a part of it and the sample compressed
+        with open(SAMPLE, 'rb') as f:
+            content = f.read()
+        start, end = content.index(b'<trkpt'), content.index(b'<trkpt', content.index(b'<trkpt') + 1000)
+        self.write('first.gpx', content)
+        self.write('second.gpx', content[:start] + content[end:])
+        with gzip.open(os.path.join(self.inputs, 'third.gpx.gz'), 'wb') as f:
+            f.write(content)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, content):
+        with open(os.path.join(self.inputs, name), 'wb') as f:
+            f.write(content)
+
+    def read(self, file):
+        with open(file, 'rb') as f:
+            return f.read()
+
+    def assertSameOutput(self, names, *args):
+        """Assert the csv of the files converted in batch are the ones of the files converted one by one."""
+        for name in names:
+            process = run(os.path.join(self.inputs, name), '--output-path', self.single, *args)
+            self.assertEqual(process.returncode, 0, process.stderr)
+            output = name.split('.')[0] + '.csv'
+            with self.subTest(file=name, args=args):
+                self.assertEqual(self.read(os.path.join(self.outputs, output)), self.read(os.path.join(self.single, output)))
+
+    def test_directory(self):
+        process = run(self.inputs, '--output-path', self.outputs, '--jobs', '2')
+        self.assertEqual(process.returncode, 0, process.stderr)
+        self.assertEqual(process.stdout, '3 converted, 0 failed\n')
+        self.assertEqual(sorted(os.listdir(self.outputs)), ['first.csv', 'second.csv', 'third.csv'])
+        self.assertSameOutput(['first.gpx', 'second.gpx', 'third.gpx.gz'])
+
+    def test_filtered(self):
+        args = ['--stopping-time', '600', '--speed-range', '0', '5']
+        process = run(os.path.join(self.inputs, '*.gpx'), '--output-path', self.outputs, '--jobs', '2', *args)
+        self.assertEqual(process.returncode, 0, process.stderr)
+        self.assertEqual(sorted(os.listdir(self.outputs)), ['first.csv', 'second.csv'])
+        self.assertSameOutput(['first.gpx', 'second.gpx'], *args)
+
+    def test_failing_file(self):
+        self.write('broken.gpx', BROKEN)
+        missing = os.path.join(self.directory.name, 'missing.gpx')
+        process = run(self.inputs, missing, '--output-path', self.outputs, '--jobs', '2')
+
+        #the other files are converted, the failures are reported and the exit status is 1
+        self.assertEqual(process.returncode, 1)
+        self.assertEqual(process.stdout, '3 converted, 2 failed\n')
+        self.assertIn(f"failed: '{os.path.join(self.inputs, 'broken.gpx')}': ParseError: ", process.stderr)
+        self.assertIn(f"failed: '{missing}': file not exist", process.stderr)
+        self.assertEqual(sorted(os.listdir(self.outputs)), ['first.csv', 'second.csv', 'third.csv'])
+        self.assertSameOutput(['first.gpx', 'second.gpx', 'third.gpx.gz'])
+
+    def test_summary(self):
+        self.write('broken.gpx', BROKEN)
+        os.mkdir(os.path.join(self.inputs, 'other'))
+        shutil.copy(SAMPLE, os.path.join(self.inputs, 'other', 'first.gpx'))
+
+        files, missing = expand([self.inputs, os.path.join(self.inputs, 'other', '*.gpx'), os.path.join(self.inputs, 'none*')])
+        self.assertEqual([os.path.relpath(file, self.inputs) for file in files],
+                         ['broken.gpx', 'first.gpx', 'second.gpx', 'third.gpx.gz', os.path.join('other', 'first.gpx')])
+        self.assertEqual(missing, [os.path.join(self.inputs, 'none*')])
+
+        done = []
+        summary = Batch(files, self.outputs, {}, jobs=2).run(lambda inputfile, error, seconds: done.append((inputfile, error)))
+        self.assertEqual(sorted(summary['converted']), sorted(files[1:4]))
+        #a file with the output of a file before it fails instead of overwriting it
+        failed = dict(summary['failed'])
+        self.assertEqual(sorted(failed), sorted([files[0], files[4]]))
+        self.assertTrue(failed[files[0]].startswith('ParseError: '), failed[files[0]])
+        self.assertEqual(failed[files[4]], f"same output of '{files[1]}'")
+        self.assertEqual(sorted(done), sorted([(file, None) for file in files[1:4]] + list(failed.items())))
+        self.assertFalse(os.path.exists(os.path.join(self.outputs, 'broken.csv')))
+
+
+if __name__ == '__main__':
+    unittest.main()
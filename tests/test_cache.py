@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: test_cache.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 6:02:15 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os
+import sys
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from parsers import cache
+from parsers.cache import TrackCache
+from parsers.gpx import GPX
+
+'''Parsed tracks read from the cache: hits, keys and eviction.'''
+
+SAMPLE = os.path.join(ROOT, 'sample.gpx')
+
+
+def convert(file, output_path, *args):
+    """Return the csv of file converted by gpx2csv.py with args."""
+    subprocess.run([sys.executable, os.path.join(ROOT, 'gpx2csv.py'), file, '--output-path', output_path] + list(args),
+                   check=True, stdout=subprocess.DEVNULL)
+    with open(os.path.join(output_path, os.path.splitext(os.path.basename(file))[0] + '.csv'), 'rb') as f:
+        return f.read()
+
+
+class TrackCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.directory.name, 'cache')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def entries(self):
+        return sorted(name for name in os.listdir(self.cache_dir) if name.endswith(cache.EXTENSION))
+
+    def test_warm_hit(self):
+        for args in ([], ['--speed-range', '0', '5', '--stopping-time', '600'], ['--columns', 'time', 'speed']):
+            with self.subTest(args=args):
+                expected = convert(SAMPLE, self.directory.name, *args)
+                cold = convert(SAMPLE, self.directory.name, '--cache-dir', self.cache_dir, *args)
+                entries = self.entries()
+                warm = convert(SAMPLE, self.directory.name, '--cache-dir', self.cache_dir, *args)
+                self.assertEqual(cold, expected)
+                self.assertEqual(warm, expected)
+                self.assertEqual(self.entries(), entries)
+                self.assertEqual(len(entries), 1)
+
+    def test_hit_without_parsing(self):
+        GPX(SAMPLE, {'cache-dir': self.cache_dir})
+        with mock.patch.object(GPX, '_GPX__iter_points', side_effect=AssertionError('parsed again')):
+            result = GPX(SAMPLE, {'cache-dir': self.cache_dir}).get_result()
+            self.assertEqual(len(list(result['rows'])), 587)
+
+    def test_key(self):
+        track_cache = TrackCache(self.cache_dir)
+        file = os.path.join(self.directory.name, 'track.gpx')
+        with open(SAMPLE, 'rb') as f:
+            content = f.read()
+        with open(file, 'wb') as f:
+            f.write(content)
+
+        key = track_cache.key(file, 'gpx-1')
+        self.assertEqual(track_cache.key(file, 'gpx-1'), key)
+        self.assertEqual(track_cache.key(SAMPLE, 'gpx-1'), key) #the content, not the name
+        self.assertNotEqual(track_cache.key(file, 'gpx-2'), key) #another version or selection
+
+        with open(file, 'ab') as f:
+            f.write(b'\n')
+        self.assertNotEqual(track_cache.key(file, 'gpx-1'), key)
+
+    def test_changed_input(self):
+        file = os.path.join(self.directory.name, 'sample.gpx')
+        with open(SAMPLE, 'rb') as f:
+            content = f.read()
+        with open(file, 'wb') as f:
+            f.write(content)
+        convert(file, self.directory.name, '--cache-dir', self.cache_dir)
+
+        #the last point removed
+        end = content.rindex(b'<trkpt')
+        with open(file, 'wb') as f:
+            f.write(content[:end] + content[content.index(b'</trkseg>', end):])
+        self.assertEqual(convert(file, self.directory.name, '--cache-dir', self.cache_dir),
+                         convert(file, self.directory.name))
+        self.assertEqual(len(self.entries()), 2)
+
+    def test_selection_key(self):
+        options = {'cache-dir': self.cache_dir, 'bbox': (51.9, 15.5, 51.94, 15.56)}
+        expected = list(GPX(SAMPLE, {'bbox': options['bbox']}).get_result()['rows'])
+        GPX(SAMPLE, {'cache-dir': self.cache_dir})
+        self.assertEqual(list(GPX(SAMPLE, options).get_result()['rows']), expected)
+        self.assertEqual(len(self.entries()), 2)
+
+    def test_eviction(self):
+        track = GPX(SAMPLE, {'cache-dir': self.cache_dir}).get_result()['track']
+        for name in self.entries():
+            os.remove(os.path.join(self.cache_dir, name))
+
+        track_cache = TrackCache(self.cache_dir)
+        track_cache.put('a', track)
+        size = os.path.getsize(os.path.join(self.cache_dir, 'a' + cache.EXTENSION))
+        track_cache.max_size = 2 * size #two tracks
+
+        track_cache.put('b', track)
+        os.utime(os.path.join(self.cache_dir, 'a' + cache.EXTENSION), (1000, 1000))
+        os.utime(os.path.join(self.cache_dir, 'b' + cache.EXTENSION), (2000, 2000))
+        self.assertIsNotNone(track_cache.get('a')) #now a is the most recently used
+
+        track_cache.put('c', track)
+        self.assertEqual(self.entries(), ['a' + cache.EXTENSION, 'c' + cache.EXTENSION])
+        self.assertIsNone(track_cache.get('b'))
+        self.assertEqual(list(track_cache.get('c')), list(track))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: test_compression.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 6:02:15 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os
+import sys
+import bz2
+import gzip
+import lzma
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+'''Compressed csv output (--compress) and compressed gpx input, decompressed and compared with the plain csv.'''
+
+SAMPLE = os.path.join(ROOT, 'sample.gpx')
+#compression, extension and module of the output
+COMPRESSIONS = [('gzip', '.gz', gzip), ('bz2', '.bz2', bz2), ('xz', '.xz', lzma)]
+#options of the conversions compared, the plain rows, the lines copied by the fast scan and the stopovers
+OPTIONS = [[], ['--fast-scan'], ['--stopping-time', '600', '--speed-range', '0', '5']]
+
+
+def run(file, output_path, *args):
+    subprocess.run([sys.executable, os.path.join(ROOT, 'gpx2csv.py'), file, '--output-path', output_path] + list(args),
+                   check=True, stdout=subprocess.DEVNULL)
+
+
+class CompressionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.plain = os.path.join(self.directory.name, 'plain')
+        self.compressed = os.path.join(self.directory.name, 'compressed')
+        os.mkdir(self.plain)
+        os.mkdir(self.compressed)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read(self, file, module=None):
+        with (module.open(file, 'rb') if module is not None else open(file, 'rb')) as f:
+            return f.read()
+
+    def test_output(self):
+        for args in OPTIONS:
+            run(SAMPLE, self.plain, *args)
+            expected = self.read(os.path.join(self.plain, 'sample.csv'))
+            for name, extension, module in COMPRESSIONS:
+                with self.subTest(args=args, compression=name):
+                    run(SAMPLE, self.compressed, '--compress', name, *args)
+                    file = os.path.join(self.compressed, 'sample.csv' + extension)
+                    self.assertEqual(self.read(file, module), expected)
+                    self.assertFalse(os.path.exists(os.path.join(self.compressed, 'sample.csv')))
+
+    def test_input(self):
+        run(SAMPLE, self.plain)
+        expected = self.read(os.path.join(self.plain, 'sample.csv'))
+        for name, extension, module in COMPRESSIONS:
+            for args in OPTIONS[:2]:
+                with self.subTest(compression=name, args=args):
+                    file = os.path.join(self.directory.name, 'sample.gpx' + extension)
+                    with open(SAMPLE, 'rb') as source, module.open(file, 'wb') as target:
+                        shutil.copyfileobj(source, target)
+                    #the output is named after the file without the compression extension
+                    run(file, self.compressed, *args)
+                    self.assertEqual(self.read(os.path.join(self.compressed, 'sample.csv')), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: test_derived.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 6:02:15 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os
+import sys
+import math
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from parsers import derived, stopover
+from parsers.gpx import GPX
+
+'''Derived columns (--derived) of a small track checked by hand, with and without numpy.'''
+
+#reading modes of the points
+MODES = [{}, {'fast-scan': True}, {'pipeline': True}]
+#0.001 degrees along the equator or a meridian
+STEP = round(stopover.EARTH_RADIUS * 1000 * math.radians(0.001), 3)
+
+#latitude, longitude, seconds from the first point (None without them)
+POINTS = [
+    ('0', '0', 0),
+    ('0', '0.001', 10),         #east
+    ('0.001', '0.001', 20),     #north
+    ('0.001', '0.001', 30),     #still
+    ('0', '0.001', None),       #south, without time
+    ('0', '0', 50),             #west, after the point without time
+    (None, None, 60),           #without position
+    ('0', '0', 70),             #after the point without position
+    ('0', '0', 70),             #at the same time
+]
+NAN = None
+#distance, total_distance, computed_speed, bearing, time_delta of every point
+EXPECTED = [
+    (NAN, 0.0, NAN, NAN, NAN),
+    (STEP, STEP, round(STEP / 10 * 3.6, 3), 90.0, 10.0),
+    (STEP, 2 * STEP, round(STEP / 10 * 3.6, 3), 0.0, 10.0),
+    (0.0, 2 * STEP, 0.0, NAN, 10.0),
+    (STEP, 3 * STEP, NAN, 180.0, NAN),
+    (STEP, 4 * STEP, NAN, 270.0, NAN),
+    (NAN, 4 * STEP, NAN, NAN, 10.0),
+    (NAN, 4 * STEP, NAN, NAN, 10.0),
+    (0.0, 4 * STEP, NAN, NAN, 0.0),
+]
+
+
+def gpx(points):
+    """Return a gpx with points (latitude, longitude, seconds), latitude/longitude/seconds are left out if None."""
+    lines = []
+    for latitude, longitude, seconds in points:
+        position = f' lat="{latitude}" lon="{longitude}"' if latitude is not None else ''
+        time = f'<time>2021-05-01T10:{seconds // 60:02}:{seconds % 60:02}Z</time>' if seconds is not None else ''
+        lines.append(f'<trkpt{position}>{time}</trkpt>')
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n<gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1"><trk><trkseg>\n' +
+            '\n'.join(lines) + '\n</trkseg></trk></gpx>\n')
+
+
+class DerivedTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.directory.name, 'track.gpx')
+        with open(self.file, 'w') as f:
+            f.write(gpx(POINTS))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertDerived(self, rows, expected):
+        self.assertEqual(len(rows), len(expected))
+        for index, (row, values) in enumerate(zip(rows, expected)):
+            for name, value, expected_value in zip(derived.COLUMNS, row[-len(derived.COLUMNS):], values):
+                with self.subTest(point=index, column=name):
+                    if expected_value is None:
+                        self.assertIsNone(value)
+                    else:
+                        self.assertAlmostEqual(value, expected_value, places=3)
+
+    def test_rows(self):
+        for mode in MODES:
+            with self.subTest(mode=mode):
+                rows = list(GPX(self.file, dict(mode, derived=True)).get_result()['rows'])
+                self.assertDerived(rows, EXPECTED)
+
+    def test_without_numpy(self):
+        with_numpy = GPX(self.file, {'derived': True}).get_result()
+        with mock.patch.object(derived, 'numpy', None):
+            rows = list(GPX(self.file, {'derived': True}).get_result()['rows'])
+        self.assertDerived(rows, EXPECTED)
+        #the same text in the csv
+        self.assertEqual([row[-len(derived.COLUMNS):] for row in rows], [row[-len(derived.COLUMNS):] for row in with_numpy['rows']])
+
+    def test_short_tracks(self):
+        for points in (POINTS[:1], POINTS[6:7], POINTS[4:5]):
+            with self.subTest(points=points):
+                with open(self.file, 'w') as f:
+                    f.write(gpx(points))
+                rows = list(GPX(self.file, {'derived': True}).get_result()['rows'])
+                self.assertDerived(rows, [EXPECTED[0]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: test_follow.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 6:02:15 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os
+import sys
+import gzip
+import subprocess
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+'''Follow mode against a single run: the csv of a file converted while it grows must be the same of the whole file.'''
+
+SAMPLE = os.path.join(ROOT, 'sample.gpx')
+PIECES = 7 #runs while the file grows, the last one adds just the closing tags
+
+PARAMETERS = [
+    [],
+    ['--speed-range', '0', '5', '--stopping-time', '600'],
+    ['--distance-range', '0', '0.05', '--stopping-time', '60'],
+]
+
+
+def convert(file, output_path, *args):
+    """Return the csv of file converted by gpx2csv.py with args."""
+    subprocess.run([sys.executable, os.path.join(ROOT, 'gpx2csv.py'), file, '--output-path', output_path] + list(args),
+                   check=True, stdout=subprocess.DEVNULL)
+    with open(os.path.join(output_path, os.path.splitext(os.path.basename(file))[0] + '.csv'), 'rb') as f:
+        return f.read()
+
+
+class FollowTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        with open(SAMPLE, 'rb') as f:
+            self.content = f.read()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def pieces(self):
+        """Return the content of the file cut after some points (the last one too), then the whole file."""
+        ends = []
+        position = self.content.find(b'</trkpt>')
+        while position >= 0:
+            ends.append(position + len(b'</trkpt>'))
+            position = self.content.find(b'</trkpt>', position + 1)
+        step = len(ends) // PIECES
+        return [self.content[:end] for end in ends[step::step][:PIECES - 2] + ends[-1:]] + [self.content]
+
+    def test_growing(self):
+        for index, args in enumerate(PARAMETERS):
+            with self.subTest(args=args):
+                expected = convert(SAMPLE, self.directory.name, *args)
+
+                output_path = os.path.join(self.directory.name, 'follow%d' % index)
+                os.mkdir(output_path)
+                file = os.path.join(output_path, 'sample.gpx')
+                for content in self.pieces():
+                    with open(file, 'wb') as f:
+                        f.write(content)
+                    followed = convert(file, output_path, '--follow', *args)
+
+                self.assertEqual(followed, expected)
+                #a run on the complete file adds nothing
+                self.assertEqual(convert(file, output_path, '--follow', *args), expected)
+
+    def test_changed_options(self):
+        expected = convert(SAMPLE, self.directory.name, '--columns', 'time')
+
+        output_path = os.path.join(self.directory.name, 'follow')
+        os.mkdir(output_path)
+        file = os.path.join(output_path, 'sample.gpx')
+        with open(file, 'wb') as f:
+            f.write(self.pieces()[0])
+        convert(file, output_path, '--follow')
+
+        with open(file, 'wb') as f:
+            f.write(self.content)
+        #the output is written again from the beginning with the new options
+        self.assertEqual(convert(file, output_path, '--follow', '--columns', 'time'), expected)
+
+        subprocess.run([sys.executable, os.path.join(ROOT, 'gpx2csv.py'), file, '--output-path', output_path,
+                        '--follow', '--columns', 'time', '--compress', 'gzip'], check=True, stdout=subprocess.DEVNULL)
+        with gzip.open(os.path.join(output_path, 'sample.csv.gz')) as f:
+            self.assertEqual(f.read(), expected)
+
+    def test_commented_point(self):
+        output_path = os.path.join(self.directory.name, 'follow')
+        os.mkdir(output_path)
+        file = os.path.join(output_path, 'sample.gpx')
+        #a point commented out before the track isn't a point
+        with open(file, 'wb') as f:
+            f.write(self.content.replace(b'<trk>', b'<!-- <trkpt lat="9" lon="9"></trkpt> -->\n<trk>', 1))
+
+        self.assertEqual(convert(file, output_path, '--follow'), convert(file, self.directory.name))
+
+    def test_no_stopover(self):
+        args = ['--speed-range', '0', '5', '--stopping-time', '100000']
+        header = convert(SAMPLE, self.directory.name, *PARAMETERS[1]).splitlines(keepends=True)[0]
+        #a single run without stopovers writes all the points
+        self.assertEqual(len(convert(SAMPLE, self.directory.name, *args).splitlines()), 1 + 587)
+
+        output_path = os.path.join(self.directory.name, 'follow')
+        os.mkdir(output_path)
+        file = os.path.join(output_path, 'sample.gpx')
+        with open(file, 'wb') as f:
+            f.write(self.content)
+        #follow mode writes always the stopovers, just the header (see the --follow option)
+        self.assertEqual(convert(file, output_path, '--follow', *args), header)
+
+
+if __name__ == '__main__':
+    unittest.main()
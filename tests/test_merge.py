@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: test_merge.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 6:02:15 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os
+import re
+import sys
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from jobs import merge
+from jobs.merge import Merge
+
+'''Merged tracks against the conversion of the single file they are cut from (sample.gpx is sorted by time).'''
+
+SAMPLE = os.path.join(ROOT, 'sample.gpx')
+TRKPT = re.compile(rb'<trkpt.*?</trkpt>', re.S)
+FILTER = ['--speed-range', '0', '5', '--stopping-time', '600']
+
+
+def convert(file, output_path, *args):
+    """Return the csv of file converted by gpx2csv.py with args."""
+    subprocess.run([sys.executable, os.path.join(ROOT, 'gpx2csv.py'), file, '--output-path', output_path] + list(args),
+                   check=True, stdout=subprocess.DEVNULL)
+    with open(os.path.join(output_path, os.path.splitext(os.path.basename(file))[0] + '.csv'), 'rb') as f:
+        return f.read()
+
+
+class MergeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        with open(SAMPLE, 'rb') as f:
+            content = f.read()
+        self.points = TRKPT.findall(content)
+        first, last = TRKPT.search(content), list(TRKPT.finditer(content))[-1]
+        self.head, self.tail = content[:first.start()], content[last.end():]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def track(self, name, points):
+        """Return the path of a gpx file with points of sample.gpx."""
+        file = os.path.join(self.directory.name, name)
+        with open(file, 'wb') as f:
+            f.write(self.head + b'\n'.join(points) + self.tail)
+        return file
+
+    def merged(self, files, *args):
+        """Return the csv of files merged by gpx2csv.py with args."""
+        subprocess.run([sys.executable, os.path.join(ROOT, 'gpx2csv.py')] + files +
+                       ['--output-path', self.directory.name, '--merge', 'merged'] + list(args),
+                       check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        with open(os.path.join(self.directory.name, 'merged.csv'), 'rb') as f:
+            return f.read()
+
+    def test_overlapping(self):
+        files = [self.track('first.gpx', self.points[:400]), self.track('second.gpx', self.points[200:])]
+        for args in ([], FILTER):
+            with self.subTest(args=args):
+                self.assertEqual(self.merged(files, *args), convert(SAMPLE, self.directory.name, *args))
+
+        summary = Merge(files, os.path.join(self.directory.name, 'summary'), {}).run()
+        self.assertEqual((summary['points'], summary['duplicates'], summary['untimed']), (len(self.points), 200, 0))
+
+    def test_reversed(self):
+        #the files in reverse order, the points of the first one in reverse order too
+        files = [self.track('second.gpx', self.points[300:][::-1]), self.track('first.gpx', self.points[:300])]
+        for args in ([], FILTER):
+            with self.subTest(args=args):
+                self.assertEqual(self.merged(files, *args), convert(SAMPLE, self.directory.name, *args))
+
+    def test_spilled(self):
+        files = [self.track('first.gpx', self.points[:400]), self.track('second.gpx', self.points[150:])]
+        expected = convert(SAMPLE, self.directory.name)
+
+        outputfile = os.path.join(self.directory.name, 'spilled')
+        with mock.patch.object(merge, 'CHECK_EVERY', 16):
+            merger = Merge(files, outputfile, {}, memory_budget=1)
+            merger.memory_budget = 1024 #bytes, a run every few checks
+            summary = merger.run()
+        self.assertGreater(summary['spilled'], 2)
+        with open(outputfile + '.csv', 'rb') as f:
+            self.assertEqual(f.read(), expected)
+
+        #--memory-budget 1 (MB) gives the same output
+        self.assertEqual(self.merged(files, '--memory-budget', '1'), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
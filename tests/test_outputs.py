@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: test_outputs.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 6:02:15 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from outputs.csv import CSV
+from outputs import npz, arrow
+from jobs.convert import convert
+
+'''Files written by the outputs, also when writing fails.'''
+
+SAMPLE = os.path.join(ROOT, 'sample.gpx')
+ROWS = [['45.1', '9.1', '2021-05-01T10:00:00Z', '2021-05-01', '10:00:00', 'Z', 3, '120', '7', '1']]
+
+
+def result(rows):
+    return {'parser-type': 'gpx', 'output_type': 'default', 'rows': iter(rows)}
+
+
+def failing(rows):
+    """Yield rows, then fail as a parser on a broken file."""
+    yield from rows
+    raise ValueError('broken file')
+
+
+class CSVTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.directory.name, 'track')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_failed_parsing(self):
+        with self.assertRaises(ValueError):
+            CSV(result(failing(ROWS)), self.file, {}).save()
+        self.assertFalse(os.path.exists(self.file + '.csv'))
+
+    def test_failed_append(self):
+        CSV(result(ROWS), self.file, {}).save()
+        with open(self.file + '.csv', 'rb') as f:
+            content = f.read()
+
+        with self.assertRaises(ValueError):
+            CSV(result(failing(ROWS)), self.file, {'append': True}).save()
+        with open(self.file + '.csv', 'rb') as f:
+            self.assertEqual(f.read(), content)
+
+    def test_failed_open(self):
+        missing = os.path.join(self.directory.name, 'missing', 'track')
+        with self.assertRaises(FileNotFoundError) as context:
+            CSV(result(ROWS), missing, {}).save()
+        self.assertIsNone(context.exception.__context__)
+
+        #a file that can't be opened isn't removed
+        os.mkdir(self.file + '.csv')
+        with self.assertRaises(IsADirectoryError) as context:
+            CSV(result(ROWS), self.file, {}).save()
+        self.assertIsNone(context.exception.__context__)
+        self.assertTrue(os.path.isdir(self.file + '.csv'))
+
+
+class TypedOutputTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertFailedOpen(self, output_type):
+        missing = os.path.join(self.directory.name, 'missing', 'sample')
+        with self.assertRaises(OSError) as context:
+            convert(SAMPLE, missing, {'output-type': output_type})
+        self.assertIsNone(context.exception.__context__)
+
+        #a file that can't be opened isn't removed
+        file = os.path.join(self.directory.name, 'sample')
+        os.mkdir(file + '.' + output_type)
+        with self.assertRaises(OSError) as context:
+            convert(SAMPLE, file, {'output-type': output_type})
+        self.assertIsNone(context.exception.__context__)
+        self.assertTrue(os.path.isdir(file + '.' + output_type))
+
+    @unittest.skipUnless(npz.numpy is not None, 'numpy is not installed')
+    def test_npz_failed_open(self):
+        self.assertFailedOpen('npz')
+
+    @unittest.skipUnless(arrow.pyarrow is not None, 'pyarrow is not installed')
+    def test_arrow_failed_open(self):
+        self.assertFailedOpen('arrow')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: test_pipeline.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 6:02:15 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import io
+import os
+import sys
+import gzip
+import shutil
+import tempfile
+import threading
+import unittest
+import subprocess
+from xml.etree import ElementTree
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from parsers import pipeline
+from jobs.convert import convert
+
+'''Pipelined conversion (--pipeline): the same output of the sequential one, the errors of the threads reach the caller.'''
+
+SAMPLE = os.path.join(ROOT, 'sample.gpx')
+TIMEOUT = 60 #seconds, a pipeline waiting forever fails the test instead of hanging it
+#options of the conversions compared
+OPTIONS = [[], ['--fast-scan'], ['--stopping-time', '600', '--speed-range', '0', '5'], ['--derived'], ['--columns', 'time', 'speed']]
+BROKEN = b'<?xml version="1.0"?><gpx><trk><trkseg><trkpt lat="1" lon="2"><time>2021-05-01T10:00:00Z</time></trkpt><trkpt lat="1"'
+
+
+def run(file, output_path, *args):
+    """Return the csv of file converted by gpx2csv.py with args."""
+    subprocess.run([sys.executable, os.path.join(ROOT, 'gpx2csv.py'), file, '--output-path', output_path] + list(args),
+                   check=True, stdout=subprocess.DEVNULL, timeout=TIMEOUT)
+    with open(os.path.join(output_path, 'sample.csv'), 'rb') as f:
+        return f.read()
+
+
+def failing(items, error):
+    yield from items
+    raise error
+
+
+class PipelineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_same_output(self):
+        compressed = os.path.join(self.directory.name, 'sample.gpx.gz')
+        with open(SAMPLE, 'rb') as source, gzip.open(compressed, 'wb') as target:
+            shutil.copyfileobj(source, target)
+
+        for args in OPTIONS:
+            expected = run(SAMPLE, self.directory.name, *args)
+            for file in (SAMPLE, compressed):
+                with self.subTest(args=args, file=os.path.basename(file)):
+                    self.assertEqual(run(file, self.directory.name, '--pipeline', *args), expected)
+
+    def test_parse_error(self):
+        file = os.path.join(self.directory.name, 'broken.gpx')
+        with open(file, 'wb') as f:
+            f.write(BROKEN)
+        compressed = file + '.gz'
+        with gzip.open(compressed, 'wb') as f:
+            f.write(BROKEN)
+
+        for inputfile in (file, compressed):
+            with self.subTest(file=os.path.basename(inputfile)):
+                errors = []
+                def target():
+                    try:
+                        convert(inputfile, os.path.join(self.directory.name, 'broken'), {'pipeline': True})
+                    except Exception as e:
+                        errors.append(e)
+
+                thread = threading.Thread(target=target, daemon=True)
+                thread.start()
+                thread.join(TIMEOUT)
+                self.assertFalse(thread.is_alive(), 'the pipeline is hanging')
+                self.assertEqual([type(e) for e in errors], [ElementTree.ParseError])
+                self.assertFalse(os.path.exists(os.path.join(self.directory.name, 'broken.csv')))
+
+    def test_prefetch(self):
+        items = list(range(10000))
+        self.assertEqual(list(pipeline.prefetch(iter(items), batch_size=7, depth=2)), items)
+        self.assertEqual(list(pipeline.prefetch(iter([]))), [])
+
+        #the items before the error are yielded, then the error is raised by the consumer
+        consumed = []
+        with self.assertRaisesRegex(ValueError, 'broken'):
+            for item in pipeline.prefetch(failing(items[:10], ValueError('broken')), batch_size=3, depth=1):
+                consumed.append(item)
+        self.assertEqual(consumed, items[:9])
+
+    def test_prefetch_stop(self):
+        #a consumer stopping early stops the producer waiting on the full queue
+        produced = []
+        def items():
+            for item in range(10000):
+                produced.append(item)
+                yield item
+
+        threads = threading.active_count()
+        rows = pipeline.prefetch(items(), batch_size=1, depth=1)
+        self.assertEqual(next(rows), 0)
+        rows.close()
+        self.assertLess(len(produced), 10)
+        self.assertEqual(threading.active_count(), threads)
+
+    def test_read_ahead(self):
+        data = bytes(range(256)) * 1000
+        with pipeline.ReadAhead(io.BytesIO(data), block_size=1000, depth=2) as f:
+            self.assertEqual(f.read(10), data[:10])
+            self.assertEqual(f.read(), data[10:])
+            #read again at the end
+            self.assertEqual(f.read(), b'')
+            self.assertEqual(f.read(1), b'')
+
+        class Broken(io.RawIOBase):
+            def readable(self):
+                return True
+            def readinto(self, buffer):
+                raise OSError('disk error')
+
+        with pipeline.ReadAhead(Broken()) as f:
+            for attempt in range(2):
+                with self.assertRaisesRegex(OSError, 'disk error'):
+                    f.read()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: test_scanner.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 6:02:15 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os
+import sys
+import gzip
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from parsers import chunks
+from parsers.gpx import GPX, parse_chunk
+from parsers.metrics import Metrics
+from jobs.convert import convert as convert_file
+
+'''Conformance of the fast scanner with the xml parser: the csv must be the same byte for byte.'''
+
+SAMPLE = os.path.join(ROOT, 'sample.gpx')
+
+#self-closing points (first and last of the file too), empty tags (<speed> too), attributes in other order or quotes,
+#a point commented out before the track
+VARIANTS = b'''<?xml version="1.0" encoding="UTF-8"?>
+<gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1">
+<metadata><desc><!-- <trkpt lat="9" lon="9"></trkpt> --></desc></metadata>
+<trk><trkseg>
+<trkpt lat="45.1" lon="9.1"/>
+<trkpt lat="45.2" lon="9.2">
+  <ele>120</ele>
+  <time>2021-05-01T10:00:00Z</time>
+  <sat>7</sat>
+  <speed>3</speed>
+  <hdop>1</hdop>
+</trkpt>
+<trkpt lat="45.3" lon="9.3" />
+<trkpt lat="45.4" lon="9.4">
+  <ele>121</ele>
+  <time>2021-05-01T10:00:10Z</time>
+  <sat>7</sat>
+  <speed>4</speed>
+  <hdop>1</hdop>
+</trkpt>
+<trkpt lon="9.5" lat="45.5">
+  <ele/>
+  <time>2021-05-01T10:00:20Z</time>
+  <sat></sat>
+  <speed>5</speed>
+  <hdop>1</hdop>
+</trkpt>
+<trkpt lat="45.55" lon="9.55">
+  <ele>122</ele>
+  <time>2021-05-01T10:00:25Z</time>
+  <sat>7</sat>
+  <speed></speed>
+  <hdop>1</hdop>
+</trkpt>
+<trkpt lat='45.6' lon='9.6'><ele>123</ele><time>2021-05-01T10:00:30Z</time></trkpt>
+<trkpt
+    lat="45.7"
+    lon="9.7"/>
+<trkpt lat="45.8" lon="9.8">
+  <ele>124</ele>
+  <time>2021-05-01T10:00:40Z</time>
+  <sat>8</sat>
+  <speed>6</speed>
+  <hdop>2</hdop>
+</trkpt>
+</trkseg><trkseg>
+<trkpt lat="45.9" lon="9.9"/>
+</trkseg></trk>
+</gpx>
+'''
+
+#a point commented out before the track isn't a point
+COMMENTED = b'''<?xml version="1.0" encoding="UTF-8"?>
+<gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1">
+<metadata><desc><!-- <trkpt lat="9" lon="9"></trkpt> --></desc></metadata>
+<trk><trkseg>
+<trkpt lat="45.1" lon="9.1"><time>2021-05-01T10:00:00Z</time><speed>3</speed></trkpt>
+<trkpt lat="45.2" lon="9.2"><time>2021-05-01T10:00:10Z</time><speed>4</speed></trkpt>
+<trkpt lat="45.3" lon="9.3"><time>2021-05-01T10:00:20Z</time><speed>5</speed></trkpt>
+</trkseg></trk>
+</gpx>
+'''
+
+
+def convert(file, output_path, *args):
+    """Return the csv of file converted by gpx2csv.py with args."""
+    subprocess.run([sys.executable, os.path.join(ROOT, 'gpx2csv.py'), file, '--output-path', output_path] + list(args),
+                   check=True, stdout=subprocess.DEVNULL)
+    with open(os.path.join(output_path, os.path.splitext(os.path.basename(file))[0] + '.csv'), 'rb') as f:
+        return f.read()
+
+
+class FastScanTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.variants = os.path.join(self.directory.name, 'variants.gpx')
+        with open(self.variants, 'wb') as f:
+            f.write(VARIANTS)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertSameCsv(self, file, *args):
+        expected = convert(file, self.directory.name, *args)
+        for fast in (['--fast-scan'], ['--fast-scan', '--parse-workers', '2']):
+            with self.subTest(file=os.path.basename(file), args=args + tuple(fast)):
+                self.assertEqual(convert(file, self.directory.name, *(args + tuple(fast))), expected)
+
+    def test_sample(self):
+        self.assertSameCsv(SAMPLE)
+
+    def test_sample_filtered(self):
+        self.assertSameCsv(SAMPLE, '--speed-range', '0', '5', '--stopping-time', '600')
+
+    def test_sample_columns(self):
+        self.assertSameCsv(SAMPLE, '--columns', 'speed', 'time', 'latitude', 'hour')
+
+    def test_variants(self):
+        self.assertSameCsv(self.variants)
+
+    def test_variants_rows(self):
+        self.assertEqual(len(convert(self.variants, self.directory.name, '--fast-scan').splitlines()), 1 + 10)
+
+    def test_chunks(self):
+        with chunks.open_mmap(self.variants) as buffer:
+            prolog, ranges = chunks.split(buffer, chunk_size=64)
+            found = [point for start, end in ranges for point in chunks.points(buffer, start, end)]
+        self.assertGreater(len(ranges), 1)
+        self.assertEqual(len(found), 10)
+        self.assertEqual([point.count(b'<trkpt') for point in found], [1] * 10)
+
+    def test_commented_chunks(self):
+        file = os.path.join(self.directory.name, 'commented.gpx')
+        with open(file, 'wb') as f:
+            f.write(COMMENTED)
+        expected = list(GPX(file, {'keep-epoch': True}).get_result()['rows'])
+
+        with chunks.open_mmap(file) as buffer:
+            prolog, ranges = chunks.split(buffer, chunk_size=64)
+        self.assertGreater(len(ranges), 1)
+        for fast_scan in (False, True):
+            with self.subTest(fast_scan=fast_scan):
+                rows = [row for start, end in ranges for row in parse_chunk(file, prolog, start, end, fast_scan)[0]]
+                self.assertEqual(rows, expected)
+        self.assertEqual(len(expected), 3)
+
+    def test_metrics(self):
+        #the lines copied by the fast scan are counted as rows too, also when the scanner can't read the file
+        compressed = os.path.join(self.directory.name, 'compressed.gpx.gz')
+        with open(SAMPLE, 'rb') as source, gzip.open(compressed, 'wb') as target:
+            shutil.copyfileobj(source, target)
+
+        for file, points in ((SAMPLE, 587), (self.variants, 10), (compressed, 587)):
+            for options in ({}, {'fast-scan': True}):
+                with self.subTest(file=os.path.basename(file), options=options):
+                    metrics = Metrics()
+                    convert_file(file, os.path.join(self.directory.name, 'metrics'), dict(options, metrics=metrics))
+                    counters = metrics.report()['counters']
+                    self.assertEqual((counters.get('points'), counters.get('rows')), (points, points))
+
+
+if __name__ == '__main__':
+    unittest.main()
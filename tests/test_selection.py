@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: test_selection.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 6:02:15 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from parsers import chunks, timestamp
+from parsers.gpx import GPX, Selection, parse_chunk
+
+'''Points selected by --from/--to/--bbox/--assume-sorted in every reader of the points.'''
+
+POINT = '<trkpt lat="%s" lon="%s"><time>%s</time><speed>1</speed></trkpt>'
+#reading modes of the points
+MODES = [{}, {'fast-scan': True}, {'pipeline': True}]
+
+
+def gpx(points):
+    """Return a gpx with points (latitude, longitude, time)."""
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n<gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1"><trk><trkseg>\n' +
+            '\n'.join(POINT % point for point in points) + '\n</trkseg></trk></gpx>\n')
+
+
+def window(start, end):
+    return tuple(timestamp.decode(time)[0] if time is not None else None for time in (start, end))
+
+
+SORTED = [('45.0', '9.0', '2021-05-01T10:00:00Z'), ('45.1', '9.1', '2021-05-01T10:00:10Z'), ('45.2', '9.2', '2021-05-01T10:00:20Z'),
+          ('45.3', '9.3', '2021-05-01T10:00:30Z'), ('45.4', '9.4', '2021-05-01T10:00:40Z')]
+#the point after the window is before a point in it
+UNSORTED = [SORTED[0], SORTED[4], SORTED[1], SORTED[2]]
+
+
+class SelectionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def file(self, points):
+        file = os.path.join(self.directory.name, 'track%d.gpx' % len(os.listdir(self.directory.name)))
+        with open(file, 'w') as f:
+            f.write(gpx(points))
+        return file
+
+    def assertSelected(self, points, options, expected):
+        """Assert the latitudes of the points selected with options in every reading mode and in chunks."""
+        file = self.file(points)
+        for mode in MODES:
+            with self.subTest(options=options, mode=mode):
+                rows = GPX(file, dict(options, **mode)).get_result()['rows']
+                self.assertEqual([row[0] for row in rows], expected)
+
+        with chunks.open_mmap(file) as buffer:
+            prolog, ranges = chunks.split(buffer, chunk_size=64)
+        for fast_scan in (False, True):
+            with self.subTest(options=options, chunks=True, fast_scan=fast_scan):
+                #the chunks of a file share the selection, it's passed after the first point after --to
+                selection = Selection(options.get('time-window'), options.get('bbox'), bool(options.get('assume-sorted')))
+                rows = []
+                for start, end in ranges:
+                    chunk_rows, passed = parse_chunk(file, prolog, start, end, fast_scan, selection=selection)
+                    rows += chunk_rows
+                    if passed:
+                        break
+                self.assertEqual([row[0] for row in rows], expected)
+
+    def test_time_bounds(self):
+        #--from is included, --to isn't
+        self.assertSelected(SORTED, {'time-window': window('2021-05-01T10:00:10Z', '2021-05-01T10:00:30Z')}, ['45.1', '45.2'])
+        self.assertSelected(SORTED, {'time-window': window('2021-05-01T10:00:10.000001Z', None)}, ['45.2', '45.3', '45.4'])
+        self.assertSelected(SORTED, {'time-window': window(None, '2021-05-01T10:00:10Z')}, ['45.0'])
+        #another zone, the same instant
+        self.assertSelected(SORTED, {'time-window': window('2021-05-01T12:00:20+02:00', None)}, ['45.2', '45.3', '45.4'])
+
+    def test_bbox_edges(self):
+        #the edges are in the box
+        self.assertSelected(SORTED, {'bbox': (45.1, 9.1, 45.3, 9.3)}, ['45.1', '45.2', '45.3'])
+        self.assertSelected(SORTED, {'bbox': (45.1, 9.15, 45.3, 9.3)}, ['45.2', '45.3'])
+        self.assertSelected(SORTED, {'bbox': (46, 9, 47, 10)}, [])
+
+    def test_bbox_and_time(self):
+        options = {'bbox': (45.0, 9.0, 45.3, 9.3), 'time-window': window('2021-05-01T10:00:10Z', None)}
+        self.assertSelected(SORTED, options, ['45.1', '45.2', '45.3'])
+
+    def test_assume_sorted(self):
+        options = {'time-window': window(None, '2021-05-01T10:00:30Z')}
+        self.assertSelected(SORTED, dict(options, **{'assume-sorted': True}), ['45.0', '45.1', '45.2'])
+
+        #on unsorted points the file isn't read after the first point after --to, as documented
+        self.assertSelected(UNSORTED, dict(options, **{'assume-sorted': True}), ['45.0'])
+        self.assertSelected(UNSORTED, options, ['45.0', '45.1', '45.2'])
+
+    def test_accept(self):
+        selection = Selection(window('2021-05-01T10:00:10Z', '2021-05-01T10:00:30Z'), assume_sorted=True)
+        self.assertIs(selection.accept({'lat': '45', 'lon': '9', 'time': '2021-05-01T10:00:00Z'}), False)
+        self.assertIs(selection.accept({'lat': '45', 'lon': '9'}), False) #without time
+        self.assertIs(selection.accept({'lat': '45', 'lon': '9', 'time': 'yesterday'}), False)
+        self.assertIs(selection.accept({'lat': '45', 'lon': '9', 'time': '2021-05-01T10:00:10Z'}), True)
+        self.assertFalse(selection.passed)
+        self.assertIsNone(selection.accept({'lat': '45', 'lon': '9', 'time': '2021-05-01T10:00:30Z'}))
+        self.assertTrue(selection.passed)
+
+        selection = Selection(bbox=(45, 9, 46, 10))
+        self.assertIs(selection.accept({'lat': None, 'lon': '9'}), False) #without position
+        self.assertIs(selection.accept({'lat': '45', 'lon': '10'}), True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: test_simplify.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 6:02:15 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os
+import sys
+import tempfile
+import unittest
+from array import array
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from parsers import simplify
+from parsers.gpx import GPX
+from parsers.trackpoints import SAT
+
+'''Points kept by --simplify on small tracks checked by hand, <sat> is the index of the point.'''
+
+#reading modes of the points
+MODES = [{}, {'fast-scan': True}, {'pipeline': True}]
+
+#1e-4 degrees are about 11.1 meters on the equator
+#the path bends at 2 (55.6 meters from the line 0-4), 1 and 3 are on the lines 0-2 and 2-4
+BEND = [('0', '0'), ('0.00025', '0.001'), ('0.0005', '0.002'), ('0.00025', '0.003'), ('0', '0.004')]
+#about 55.6 meters between two points, 22.2 meters to the last one
+LINE = [('0', '0'), ('0', '0.0005'), ('0', '0.001'), ('0', '0.0015'), ('0', '0.002'), ('0', '0.0022')]
+#seconds from the first point, None without time
+TIMES = [0, 10, None, 30, 45, 50, 55]
+
+
+def gpx(points):
+    """Return a gpx with points (latitude, longitude, seconds), latitude/longitude/seconds are left out if None."""
+    lines = []
+    for index, (latitude, longitude, seconds) in enumerate(points):
+        position = f' lat="{latitude}" lon="{longitude}"' if latitude is not None else ''
+        time = f'<time>2021-05-01T10:{seconds // 60:02}:{seconds % 60:02}Z</time>' if seconds is not None else ''
+        lines.append(f'<trkpt{position}>{time}<sat>{index}</sat></trkpt>')
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n<gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1"><trk><trkseg>\n' +
+            '\n'.join(lines) + '\n</trkseg></trk></gpx>\n')
+
+
+class SimplifyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertKept(self, points, simplification, expected):
+        """Assert the indexes of the points kept by simplification (method, tolerance) in every reading mode."""
+        file = os.path.join(self.directory.name, 'track.gpx')
+        with open(file, 'w') as f:
+            f.write(gpx(points))
+
+        for mode in MODES:
+            with self.subTest(simplify=simplification, mode=mode):
+                result = GPX(file, dict(mode, simplify=simplification)).get_result()
+                self.assertEqual([int(row[SAT]) for row in result['rows']], expected)
+                self.assertEqual((result['simplification'].points, result['simplification'].kept), (len(points), len(expected)))
+
+    def test_douglas_peucker(self):
+        points = [(latitude, longitude, index) for index, (latitude, longitude) in enumerate(BEND)]
+        self.assertKept(points, ('douglas-peucker', 10), [0, 2, 4])
+        self.assertKept(points, ('douglas-peucker', 60), [0, 4])
+        #a point without position is kept, the others are simplified without it
+        self.assertKept(points[:3] + [(None, None, 3)] + points[3:], ('douglas-peucker', 60), [0, 3, 5])
+
+    def test_douglas_peucker_columns(self):
+        #with and without numpy
+        latitude = array('d', (float(point[0]) for point in BEND))
+        longitude = array('d', (float(point[1]) for point in BEND))
+        for numpy in ((simplify.numpy,) if simplify.numpy is not None else ()) + (None,):
+            with self.subTest(numpy=numpy is not None), mock.patch.object(simplify, 'numpy', numpy):
+                self.assertEqual(simplify.douglas_peucker(latitude, longitude, 10), [0, 2, 4])
+                self.assertEqual(simplify.douglas_peucker(latitude, longitude, 60), [0, 4])
+                self.assertEqual(simplify.douglas_peucker(latitude[:2] + array('d', [float('nan')]) + latitude[3:], longitude, 60), [0, 2, 4])
+                self.assertEqual(simplify.douglas_peucker(latitude[:1], longitude[:1], 10), [0])
+                self.assertEqual(simplify.douglas_peucker(array('d'), array('d'), 10), [])
+
+    def test_min_distance(self):
+        points = [(latitude, longitude, index) for index, (latitude, longitude) in enumerate(LINE)]
+        #0, 2 and 4 are 111 meters apart, the last point is kept even if it's near 4
+        self.assertKept(points, ('min-distance', 100), [0, 2, 4, 5])
+        self.assertKept(points, ('min-distance', 50), [0, 1, 2, 3, 4, 5])
+        self.assertKept(points, ('min-distance', 1000), [0, 5])
+        #a point without position is kept and doesn't move the anchor
+        self.assertKept(points[:1] + [(None, None, 1)] + points[2:], ('min-distance', 100), [0, 1, 2, 4, 5])
+
+    def test_min_interval(self):
+        points = [('45', '9', seconds) for seconds in TIMES]
+        #30 seconds after 0 is kept, the point without time is kept, 55 is the last one
+        self.assertKept(points, ('min-interval', 30), [0, 2, 3, 6])
+        self.assertKept(points, ('min-interval', 10), [0, 1, 2, 3, 4, 6])
+        self.assertKept(points[:2], ('min-interval', 30), [0, 1])
+        self.assertKept(points[:1], ('min-interval', 30), [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: test_sqlite.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 6:02:15 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os
+import sys
+import csv
+import shutil
+import sqlite3
+import tempfile
+import unittest
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from parsers import timestamp
+from jobs.convert import convert
+
+'''SQLite output (--output-type sqlite, --database) read back and compared with the csv.'''
+
+SAMPLE = os.path.join(ROOT, 'sample.gpx')
+FILTER = {'stopping-time': 600, 'speed-range': (0, 5)}
+
+
+def read_csv(file):
+    with open(file + '.csv', newline='') as f:
+        return list(csv.reader(f))[1:]
+
+
+def number(text, kind=float):
+    return kind(text) if text != '' else None
+
+
+class SQLiteTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.directory.name, 'sample')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def query(self, path, sql, *parameters):
+        connection = sqlite3.connect(path)
+        try:
+            return connection.execute(sql, parameters).fetchall()
+        finally:
+            connection.close()
+
+    def test_tables(self):
+        convert(SAMPLE, self.file, {'output-type': 'sqlite'})
+        path = self.file + '.sqlite'
+        names = {row[0] for row in self.query(path, "SELECT name FROM sqlite_master WHERE type IN ('table', 'index')")}
+        self.assertTrue({'tracks', 'points', 'stopovers', 'points_time', 'points_grid', 'stopovers_time'} <= names)
+        self.assertEqual(self.query(path, 'SELECT id, name FROM tracks'), [(1, 'sample')])
+
+    def test_points(self):
+        convert(SAMPLE, self.file, {})
+        convert(SAMPLE, self.file, {'output-type': 'sqlite'})
+        points = self.query(self.file + '.sqlite', 'SELECT latitude, longitude, time, time_zone, speed, ele, sat, hdop FROM points '
+                            'WHERE track_id = 1 ORDER BY rowid')
+
+        expected = [
+            (number(row[0]), number(row[1]), timestamp.decode(row[2])[0], row[5] or None,
+             number(row[6], int), number(row[7]), number(row[8], int), number(row[9]))
+            for row in read_csv(self.file)
+        ]
+        self.assertEqual(len(points), 587)
+        self.assertEqual(points, expected)
+
+    def test_stopovers(self):
+        convert(SAMPLE, self.file, FILTER)
+        convert(SAMPLE, self.file, dict(FILTER, **{'output-type': 'sqlite'}))
+        path = self.file + '.sqlite'
+        stopovers = self.query(path, 'SELECT stopping_time, min_speed, max_speed, min_distance, max_distance, start_latitude, '
+                               'start_longitude, end_latitude, end_longitude, stopping_duration FROM stopovers ORDER BY rowid')
+
+        expected = [(600, 0, 5, None, None, float(row[0]), float(row[1]), float(row[4]), float(row[5]), int(row[8]))
+                    for row in read_csv(self.file)]
+        self.assertTrue(expected)
+        self.assertEqual(stopovers, expected)
+        #the points of the track are saved with its stopovers
+        self.assertEqual(self.query(path, 'SELECT COUNT(*) FROM points'), [(587,)])
+
+    def test_database(self):
+        database = os.path.join(self.directory.name, 'tracks.db')
+        for name in ('first', 'second'):
+            shutil.copy(SAMPLE, os.path.join(self.directory.name, name + '.gpx'))
+
+        #--database implies the sqlite output, the tracks are added to the same database
+        for name in ('first', 'second', 'first'):
+            subprocess.run([sys.executable, os.path.join(ROOT, 'gpx2csv.py'), os.path.join(self.directory.name, name + '.gpx'),
+                            '--output-path', self.directory.name, '--database', database], check=True, stdout=subprocess.DEVNULL)
+
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, 'first.sqlite')))
+        self.assertEqual(self.query(database, 'SELECT id, name FROM tracks ORDER BY id'), [(1, 'first'), (2, 'second')])
+        #saving a track again replaces its points
+        self.assertEqual(self.query(database, 'SELECT track_id, COUNT(*) FROM points GROUP BY track_id'), [(1, 587), (2, 587)])
+
+    def test_append(self):
+        convert(SAMPLE, self.file, {'output-type': 'sqlite'})
+        convert(SAMPLE, self.file, {'output-type': 'sqlite', 'append': True})
+        path = self.file + '.sqlite'
+        self.assertEqual(self.query(path, 'SELECT track_id, COUNT(*) FROM points GROUP BY track_id'), [(1, 2 * 587)])
+        self.assertEqual(self.query(path, 'SELECT * FROM points WHERE rowid <= 587 ORDER BY rowid'),
+                         self.query(path, 'SELECT * FROM points WHERE rowid > 587 ORDER BY rowid'))
+
+
+if __name__ == '__main__':
+    unittest.main()
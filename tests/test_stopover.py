@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: test_stopover.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 6:31:47 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os
+import sys
+import random
+import datetime
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from parsers import stopover
+from parsers.gpx import GPX
+from parsers.trackpoints import TrackPoints
+
+'''Stopovers of the vectorized stopover.detect() against the row by row filter of GPX (without numpy).'''
+
+SAMPLE = os.path.join(ROOT, 'sample.gpx')
+TRACKS = 20 #randomized tracks
+POINTS = 400 #points of every randomized track
+
+PARAMETERS = [
+    {'stopping-time': 600, 'speed-range': (0, 5)},
+    {'stopping-time': 60, 'speed-range': (0, 5)},
+    {'stopping-time': 120, 'speed-range': (1, 3)},
+    {'stopping-time': 60, 'distance-range': (0, 0.05)},
+    {'stopping-time': 300, 'distance-range': (0.001, 0.2)},
+    {'stopping-time': 30, 'speed-range': (0, 2), 'distance-range': (0, 0.02)},
+    {'stopping-time': 100000, 'speed-range': (0, 2)},
+]
+
+
+def random_track(seed):
+    """
+    Return a gpx of POINTS points: slow runs and moves, gaps in time, points
+    without time, position or <speed>, speeds out of int16 (kept in the exceptions of the track).
+    """
+    generator = random.Random(seed)
+    time = datetime.datetime(2021, 5, 1, 8, 0, 0, tzinfo=datetime.timezone.utc)
+    latitude, longitude = 45 + generator.random(), 9 + generator.random()
+    slow = True
+    points = []
+
+    for index in range(POINTS):
+        if generator.random() < 0.05:
+            slow = not slow
+        step = 0.00002 if slow else 0.0005
+        latitude += generator.uniform(-step, step)
+        longitude += generator.uniform(-step, step)
+        if generator.random() < 0.02: #the device jumps away
+            latitude += generator.uniform(-0.01, 0.01)
+
+        seconds = generator.choice([1, 5, 10, 30]) if generator.random() > 0.03 else generator.randint(600, 7200)
+        time += datetime.timedelta(seconds=seconds)
+
+        tags = ['<ele>%d</ele>' % generator.randint(100, 200)]
+        if generator.random() > 0.05:
+            tags.append('<time>%s</time>' % time.strftime('%Y-%m-%dT%H:%M:%SZ'))
+        speed = generator.choice([generator.randint(0, 3), generator.randint(0, 8)]) if slow else generator.randint(4, 90)
+        if generator.random() < 0.02:
+            speed = generator.choice([-40000, 40000])
+        if generator.random() > 0.05:
+            tags.append('<speed>%s</speed>' % speed)
+
+        if generator.random() < 0.02:
+            points.append('<trkpt>%s</trkpt>' % ''.join(tags))
+        else:
+            points.append('<trkpt lat="%.9f" lon="%.9f">%s</trkpt>' % (latitude, longitude, ''.join(tags)))
+
+    return '<?xml version="1.0" encoding="UTF-8"?>\n<gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1"><trk><trkseg>\n' + \
+           '\n'.join(points) + '\n</trkseg></trk></gpx>\n'
+
+
+def rows(file, options):
+    result = GPX(file, dict(options)).get_result()
+    return result.get('output_type'), list(result['rows'])
+
+
+@unittest.skipUnless(stopover.available(), 'numpy is not installed')
+class DetectTest(unittest.TestCase):
+
+    def assertSameRows(self, file, options):
+        with self.subTest(file=os.path.basename(file), options=options):
+            vectorized = rows(file, options)
+            with mock.patch.object(stopover, 'numpy', None):
+                self.assertFalse(stopover.available())
+                self.assertEqual(vectorized, rows(file, options))
+
+    def test_sample(self):
+        for options in PARAMETERS:
+            self.assertSameRows(SAMPLE, options)
+
+    def assertSameStream(self, file, options):
+        points = list(GPX(file, {'keep-epoch': True}).get_result()['rows'])
+        arguments = options['stopping-time'], options.get('speed-range'), options.get('distance-range')
+        expected = stopover.detect(TrackPoints(points), *arguments)
+        for chunk_size in (1, 7, 50, len(points)):
+            with self.subTest(file=os.path.basename(file), options=options, chunk_size=chunk_size):
+                track = TrackPoints()
+                self.assertEqual(list(stopover.stream(track, iter(points), *arguments, chunk_size=chunk_size)), expected)
+                self.assertEqual(len(track), len(points))
+
+    def test_stream(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for seed in range(TRACKS // 4):
+                file = os.path.join(directory, 'track%d.gpx' % seed)
+                with open(file, 'w') as f:
+                    f.write(random_track(seed))
+                for options in PARAMETERS:
+                    self.assertSameStream(file, options)
+        for options in PARAMETERS:
+            self.assertSameStream(SAMPLE, options)
+
+    def test_random_tracks(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for seed in range(TRACKS):
+                file = os.path.join(directory, 'track%d.gpx' % seed)
+                with open(file, 'w') as f:
+                    f.write(random_track(seed))
+                for options in PARAMETERS:
+                    self.assertSameRows(file, options)
+
+
+if __name__ == '__main__':
+    unittest.main()
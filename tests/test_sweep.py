@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: test_sweep.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 6:02:15 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from jobs import sweep
+
+'''Parameter sets read from the json files of sweep mode.'''
+
+
+class LoadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def load(self, spec):
+        file = os.path.join(self.directory.name, 'sweep.json')
+        with open(file, 'w') as f:
+            json.dump(spec, f)
+        return sweep.load(file)
+
+    def test_grid(self):
+        parameter_sets = self.load({'stopping-time': [300, 600], 'speed-range': [[0, 5], [0, 10]]})
+        self.assertEqual([(parameters['stopping-time'], parameters['speed-range']) for parameters in parameter_sets],
+                         [(300, (0, 5)), (300, (0, 10)), (600, (0, 5)), (600, (0, 10))])
+
+    def test_grid_single_pair(self):
+        parameter_sets = self.load({'stopping-time': [300, 600], 'speed-range': [0, 5], 'distance-range': [0, 0.05]})
+        self.assertEqual([(parameters['stopping-time'], parameters['speed-range'], parameters['distance-range']) for parameters in parameter_sets],
+                         [(300, (0, 5), (0.0, 0.05)), (600, (0, 5), (0.0, 0.05))])
+
+    def test_invalid_range(self):
+        with self.assertRaises(ValueError):
+            self.load({'stopping-time': 600, 'speed-range': [[0, 5, 10]]})
+
+    def test_invalid_range_values(self):
+        #null, strings, booleans and infinities are rejected with a message, not a TypeError
+        for value in ([0, None], [None, 5], ['0', 5], [0, True], [0, float('inf')]):
+            for name in ('speed-range', 'distance-range'):
+                with self.subTest(name=name, value=value):
+                    with self.assertRaisesRegex(ValueError, f'{name} must be a pair of min and max numbers'):
+                        self.load([{'stopping-time': 600, name: value}])
+                    with self.assertRaisesRegex(ValueError, f'{name} must be a pair of min and max numbers'):
+                        self.load({'stopping-time': 600, name: [value]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: test_timestamp.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 6:02:15 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os
+import sys
+import unittest
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from parsers import timestamp
+
+'''Timestamps decoded from their slices and by datetime, split and encoded again.'''
+
+
+def epoch(*args, tzinfo=timezone.utc):
+    """Return the epoch in microseconds of a datetime."""
+    return (datetime(*args, tzinfo=tzinfo) - timestamp.EPOCH) // timestamp.MICROSECOND
+
+
+class TimestampTest(unittest.TestCase):
+
+    def assertDecoded(self, time, expected):
+        """Assert the decode() of time, and that datetime gives the same epoch (the fixed layout isn't another clock)."""
+        self.assertEqual(timestamp.decode(time), expected)
+        self.assertEqual(timestamp._decode(time), expected)
+
+    def test_zulu(self):
+        self.assertDecoded('2013-02-08T00:12:03.000Z', (epoch(2013, 2, 8, 0, 12, 3), '2013-02-08', '00:12:03', '000Z'))
+        self.assertDecoded('2013-02-08T00:12:03.5Z', (epoch(2013, 2, 8, 0, 12, 3, 500000), '2013-02-08', '00:12:03', '5Z'))
+        self.assertDecoded('2013-02-08T23:59:59.999999Z', (epoch(2013, 2, 8, 23, 59, 59, 999999), '2013-02-08', '23:59:59', '999999Z'))
+        #before the epoch and on a leap day
+        self.assertDecoded('1969-12-31T23:59:59.250Z', (epoch(1969, 12, 31, 23, 59, 59, 250000), '1969-12-31', '23:59:59', '250Z'))
+        self.assertDecoded('2020-02-29T12:00:00.000Z', (epoch(2020, 2, 29, 12), '2020-02-29', '12:00:00', '000Z'))
+
+    def test_offsets(self):
+        #the same instant in other zones, date and hour as they are in the file
+        self.assertDecoded('2013-02-08T02:12:03.000+02:00', (epoch(2013, 2, 8, 0, 12, 3), '2013-02-08', '02:12:03', '000+02:00'))
+        self.assertDecoded('2013-02-07T19:42:03.000-04:30', (epoch(2013, 2, 8, 0, 12, 3), '2013-02-07', '19:42:03', '000-04:30'))
+        self.assertDecoded('2013-02-08T00:12:03.000+00:00', (epoch(2013, 2, 8, 0, 12, 3), '2013-02-08', '00:12:03', '000+00:00'))
+
+    def test_without_fraction(self):
+        self.assertEqual(timestamp.decode('2013-02-08T00:12:03Z'), (epoch(2013, 2, 8, 0, 12, 3), '2013-02-08', '00:12:03', 'Z'))
+        self.assertEqual(timestamp.decode('2013-02-08T02:12:03+02:00'), (epoch(2013, 2, 8, 0, 12, 3), '2013-02-08', '02:12:03', '+02:00'))
+        #without zone it's UTC
+        self.assertEqual(timestamp.decode('2013-02-08T00:12:03'), (epoch(2013, 2, 8, 0, 12, 3), '2013-02-08', '00:12:03', ''))
+
+    def test_seven_digits(self):
+        #more digits than microseconds are truncated
+        self.assertEqual(timestamp.decode('2013-02-08T00:12:03.1234567Z'), (epoch(2013, 2, 8, 0, 12, 3, 123456), '2013-02-08', '00:12:03', '1234567Z'))
+        self.assertEqual(timestamp.decode('2013-02-08T02:12:03.9999999+02:00')[0], epoch(2013, 2, 8, 0, 12, 3, 999999))
+
+    def test_invalid(self):
+        for time in ('yesterday', '2013-02-30T00:12:03.000Z', '2013-02-08T24:12:03.000Z', '2013-02-08T00:12:03.000+2:00', ''):
+            with self.subTest(time=time):
+                with self.assertRaises(ValueError):
+                    timestamp.decode(time)
+
+    def test_split(self):
+        self.assertEqual(timestamp.split('2013-02-08T00:12:03.000Z'), ('2013-02-08', '00:12:03', '000Z'))
+        self.assertEqual(timestamp.split('2013-02-08T00:12:03Z'), ('2013-02-08', '00:12:03', 'Z'))
+        self.assertEqual(timestamp.split('2013-02-08T00:12:03+01:00'), ('2013-02-08', '00:12:03', '+01:00'))
+        self.assertEqual(timestamp.split('2013-02-08'), ('2013-02-08', '', ''))
+        self.assertEqual(timestamp.split(''), ('', '', ''))
+
+    def test_encode(self):
+        for time in ('2013-02-08T00:12:03.000Z', '2013-02-08T02:12:03.5+02:00', '2013-02-07T19:42:03.123456-04:30'):
+            with self.subTest(time=time):
+                epoch_us, date, hour, time_zone = timestamp.decode(time)
+                zone = time[-1:] if time.endswith('Z') else time[-6:]
+                digits = len(time_zone) - len(zone)
+                self.assertEqual(timestamp.encode(epoch_us, digits, zone, timestamp.zone_offset(zone)), time)
+        self.assertIsNone(timestamp.zone_offset('+0200'))
+        self.assertEqual(timestamp.zone_offset('-04:30'), -(4 * 3600 + 30 * 60) * timestamp.MICROSECONDS_IN_SECOND)
+
+
+if __name__ == '__main__':
+    unittest.main()
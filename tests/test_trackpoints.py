@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: test_trackpoints.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 6:02:15 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from parsers.gpx import GPX
+from parsers.trackpoints import TrackPoints, NO_LAYOUT
+
+'''Rows of the columnar store (TrackPoints) against the rows of the parser they are built from.'''
+
+SAMPLE = os.path.join(ROOT, 'sample.gpx')
+
+#missing optional tags and values that can't be rebuilt from the numbers (kept in the exceptions)
+POINTS = b'''<?xml version="1.0" encoding="UTF-8"?>
+<gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1"><trk><trkseg>
+<trkpt lat="45.1" lon="9.1"><ele>120</ele><time>2021-05-01T10:00:00.000Z</time><sat>7</sat><speed>3</speed><hdop>1.5</hdop></trkpt>
+<trkpt lat="45.10" lon="9.100"/>
+<trkpt lat="4.51e1" lon="+9.1"><ele>.5</ele><time>2021-05-01T10:00:10Z</time><speed>70000</speed></trkpt>
+<trkpt lat="45.2" lon="9.2"><ele></ele><time>2021-05-01T12:00:20.5+02:00</time><sat>x</sat><speed>007</speed><hdop>1.</hdop></trkpt>
+<trkpt lat="45.3" lon="9.3"><time>2021-05-01T10:00:30.1234567Z</time><speed>40000</speed><sat>-1</sat></trkpt>
+<trkpt lat="45.4" lon="9.4"><time>yesterday</time><speed>-3</speed><ele>-0.0</ele></trkpt>
+<trkpt lat="45.5" lon="9.5"><time>2021-05-01T10:00:40.000-00:00</time><speed></speed><ele>nan</ele></trkpt>
+<trkpt lat="45.6" lon="9.6"><time>2021-05-01T10:00:50.000+0200</time><hdop>2</hdop></trkpt>
+<trkpt><time>2021-05-01T10:01:00.000Z</time></trkpt>
+</trkseg></trk></gpx>
+'''
+
+
+class TrackPointsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def rows(self, content=None):
+        """Return the rows (with the epoch) of the parser."""
+        file = SAMPLE
+        if content is not None:
+            file = os.path.join(self.directory.name, 'track.gpx')
+            with open(file, 'wb') as f:
+                f.write(content)
+        return list(GPX(file, {'keep-epoch': True}).get_result()['rows'])
+
+    def assertSameRows(self, track, rows):
+        self.assertEqual(len(track), len(rows))
+        self.assertEqual(list(track.iter_rows(epoch=True)), rows)
+        self.assertEqual(list(track), [row[:-1] for row in rows])
+
+        #saved and loaded again, from the buffer
+        f = io.BytesIO()
+        track.save(f)
+        loaded = TrackPoints.load(f.getbuffer())
+        self.assertEqual(list(loaded.iter_rows(epoch=True)), rows)
+
+    def test_exceptions(self):
+        rows = self.rows(POINTS)
+        track = TrackPoints(rows)
+        self.assertSameRows(track, rows)
+
+        #the values that can't be rebuilt are the exceptions, just them
+        self.assertEqual(set(track.exceptions['latitude']), {2, 8})
+        self.assertEqual(set(track.exceptions['sat']), {1, 2, 3, 5, 6, 7, 8})
+        self.assertEqual(set(track.exceptions['speed']), {1, 2, 4, 6, 7, 8}) #missing or out of int16
+        self.assertEqual(set(track.exceptions['epoch']), {1, 5})
+        self.assertEqual([index for index in range(len(track)) if track.layout[index] == NO_LAYOUT], [1, 2, 4, 5, 7])
+        self.assertEqual(rows[4][-1] % 10**6, 123456)
+
+    def test_sample(self):
+        rows = self.rows()
+        track = TrackPoints(rows)
+        self.assertSameRows(track, rows)
+        self.assertFalse(any(track.exceptions[name] for name in ('latitude', 'longitude', 'epoch', 'time')))
+
+    def test_indexes(self):
+        rows = self.rows(POINTS)
+        track = TrackPoints()
+        self.assertEqual(list(track.collect(rows)), rows)
+        self.assertEqual(list(track.iter_rows(epoch=True, indexes=[8, 0, 3])), [rows[8], rows[0], rows[3]])
+        self.assertEqual([track.row(index) for index in range(len(track))], [row[:-1] for row in rows])
+
+
+if __name__ == '__main__':
+    unittest.main()
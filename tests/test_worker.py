@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+######
+# File: test_worker.py
+# Project: gpx2cvs
+# Created Date: Sunday, October 18th 2026, 6:02:15 pm
+# Author: Fabio Zito
+# -----
+# Last Modified: Sun Oct 18 2026
+# Modified By: Fabio Zito
+# -----
+# MIT License
+# 
+# Copyright (c) 2021 ZF zitelog@gmail.com
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----
+# HISTORY:
+# Date      	By	Comments
+# ----------	---	----------------------------------------------------------
+###### 
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from jobs.worker import Worker, job_options
+
+'''Worker mode (--serve): replies to the json lines of the jobs, valid or not.'''
+
+SAMPLE = os.path.join(ROOT, 'sample.gpx')
+
+
+class WorkerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.sample = os.path.join(self.directory.name, 'sample.gpx')
+        shutil.copy(SAMPLE, self.sample)
+        self.output_path = os.path.join(self.directory.name, 'out')
+        os.mkdir(self.output_path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def serve(self, lines, options=None):
+        """Return the replies to lines of a worker with options, by id (they are in order of completion)."""
+        replies = []
+        with Worker(1, options, self.output_path) as worker:
+            worker.serve(lines, replies.append)
+        self.assertTrue(all(reply.endswith('\n') for reply in replies))
+        replies = [json.loads(reply) for reply in replies]
+        self.assertEqual(len(replies), len([line for line in lines if line.strip()]))
+        return {reply['id']: reply for reply in replies}
+
+    def read(self, file):
+        with open(file, 'rb') as f:
+            return f.read()
+
+    def test_stdin(self):
+        jobs = [
+            {'id': 1, 'input': self.sample},
+            {'id': 2, 'input': self.sample, 'output': os.path.join(self.directory.name, 'filtered'),
+             'options': {'stopping-time': 600, 'speed-range': [0, 5]}}
+        ]
+        process = subprocess.run([sys.executable, os.path.join(ROOT, 'gpx2csv.py'), '--serve', '--jobs', '1', '--output-path', self.output_path],
+                                 input=''.join(json.dumps(job) + '\n' for job in jobs) + '\n', capture_output=True, text=True, check=True)
+        replies = {reply['id']: reply for reply in map(json.loads, process.stdout.splitlines())}
+
+        self.assertEqual(replies[1]['status'], 'ok')
+        self.assertIsNone(replies[1]['error'])
+        self.assertEqual(replies[1]['output'], self.output_path + '/sample')
+        self.assertEqual(replies[2]['output'], os.path.join(self.directory.name, 'filtered'))
+        self.assertGreaterEqual(replies[1]['total_seconds'], replies[1]['seconds'])
+
+        #the same files of the command line
+        subprocess.run([sys.executable, os.path.join(ROOT, 'gpx2csv.py'), self.sample, '--output-path', self.directory.name],
+                       check=True, stdout=subprocess.DEVNULL)
+        self.assertEqual(self.read(os.path.join(self.output_path, 'sample.csv')), self.read(os.path.join(self.directory.name, 'sample.csv')))
+        subprocess.run([sys.executable, os.path.join(ROOT, 'gpx2csv.py'), self.sample, '--output-path', self.directory.name,
+                        '--stopping-time', '600', '--speed-range', '0', '5'], check=True, stdout=subprocess.DEVNULL)
+        self.assertEqual(self.read(os.path.join(self.directory.name, 'filtered.csv')), self.read(os.path.join(self.directory.name, 'sample.csv')))
+
+    def test_invalid_jobs(self):
+        lines = [
+            'not json\n',
+            '[1, 2]\n',
+            json.dumps({'id': 3, 'options': {}}),
+            json.dumps({'id': 4, 'input': self.sample, 'options': {'bogus': 1}}),
+            json.dumps({'id': 5, 'input': self.sample, 'options': {'stopping-time': 600}}),
+            json.dumps({'id': 6, 'input': self.sample, 'options': {'speed-range': [0], 'stopping-time': 600}}),
+            json.dumps({'id': 7, 'input': self.sample, 'options': {'fast-scan': 'false'}}),
+            json.dumps({'id': 8, 'input': self.sample, 'output': 8}),
+            '   \n', #blank lines are skipped
+            json.dumps({'id': 9, 'input': self.sample})
+        ]
+        replies = self.serve(lines)
+
+        #the lines that aren't a job object have no id
+        self.assertEqual(replies[None]['status'], 'error')
+        for id, error in [(3, 'invalid job: a job must be an object'), (4, 'invalid job: unknown option bogus'),
+                          (5, 'invalid job: stopping-time must be used together'), (6, 'invalid job: invalid option speed-range: 2 values expected'),
+                          (7, "invalid job: invalid option fast-scan: 'false' is not true or false"), (8, 'invalid job: output must be a string')]:
+            with self.subTest(id=id):
+                self.assertEqual(replies[id]['status'], 'error')
+                self.assertTrue(replies[id]['error'].startswith(error), replies[id]['error'])
+                self.assertNotIn('seconds', replies[id])
+
+        #the worker goes on after them
+        self.assertEqual(replies[9]['status'], 'ok')
+        self.assertTrue(os.path.isfile(os.path.join(self.output_path, 'sample.csv')))
+
+    def test_failed_jobs(self):
+        broken = os.path.join(self.directory.name, 'broken.gpx')
+        with open(broken, 'w') as f:
+            f.write('<gpx><trk><trkseg><trkpt lat="1" lon="2"><time>')
+        replies = self.serve([
+            json.dumps({'id': 'missing', 'input': os.path.join(self.directory.name, 'missing.gpx')}),
+            json.dumps({'id': 'broken', 'input': broken}),
+            json.dumps({'id': 'ok', 'input': self.sample, 'options': {'profile': True}})
+        ])
+
+        #the exception is the type and its message
+        self.assertEqual(replies['missing']['status'], 'error')
+        self.assertTrue(replies['missing']['error'].startswith('FileNotFoundError: '), replies['missing']['error'])
+        self.assertEqual(replies['broken']['status'], 'error')
+        self.assertRegex(replies['broken']['error'], r'^\w+: ')
+        self.assertFalse(os.path.exists(os.path.join(self.output_path, 'broken.csv')))
+        self.assertIsNone(replies['missing']['metrics'])
+
+        self.assertEqual(replies['ok']['status'], 'ok')
+        self.assertIsInstance(replies['ok']['metrics'], dict)
+
+    def test_job_options(self):
+        defaults = {'fast-scan': True}
+        options = job_options({'stopping-time': 600, 'speed-range': [0, 5], 'time-window': ['2021-05-01T10:00:00Z', None]}, defaults)
+        self.assertEqual(options['speed-range'], (0, 5))
+        self.assertEqual(options['time-window'][1], None)
+        self.assertTrue(options['fast-scan'])
+        self.assertEqual(defaults, {'fast-scan': True})
+        self.assertEqual(job_options({'database': 'tracks.db'})['output-type'], 'sqlite')
+        with self.assertRaisesRegex(ValueError, 'just the csv output'):
+            job_options({'database': 'tracks.db', 'columns': ['latitude']})
+
+
+if __name__ == '__main__':
+    unittest.main()